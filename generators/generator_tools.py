@@ -1,10 +1,11 @@
 from __future__ import annotations
 from typing import Dict, Iterator, List, NewType, Union, NamedTuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from collections import defaultdict
 from abc import ABC, abstractmethod
 import json
+import hashlib
 
 # Loading data from source files
 def load_filters(data: Optional[Dict]) -> Optional[FiltersDef]:
@@ -133,38 +134,37 @@ def load_properties(data: Dict, parent_path: List[str]) -> List[PropertyDef]:
         )
     return result
 
+def load_model(model: Path) -> RootDef:
+    source = model.read_bytes()
+    data = json.loads(source)
+    identifier = data['identifier']
+    if "file-path" in identifier:
+        identifier = identifier["file-path"]
+        identifier = FilePathIdentifierDef(
+            processing=load_processing(identifier.get('processing')))
+    elif "json-path-key" in identifier:
+        identifier = identifier["json-path-key"]
+        identifier = JpathKeyIdentifierDef(
+            processing=load_processing(identifier.get('processing')),
+            path=identifier['path'])
+    elif "json-path-value" in identifier:
+        identifier = identifier["json-path-value"]
+        identifier = JpathValueIdentifierDef(
+            processing=load_processing(identifier.get('processing')),
+            path=identifier['path'])
+    else:
+        raise Exception("Invalid identifier")
+    return RootDef(
+        name=model.stem,
+        multi=data['multi'], type=data['type'], pack_type=data['pack_type'],
+        path=data['path'], json_path=data['json_path'],
+        identifier=identifier,
+        properties=load_properties(data['properties'], [model.stem]),
+        source_hash=hashlib.sha256(source).hexdigest()
+    )
+
 def load_models(p: Path) -> List[RootDef]:
-    result = []
-    for model in p.glob('*.json'):
-        with model.open('r') as f:
-            data = json.load(f)
-        identifier = data['identifier']
-        if "file-path" in identifier:
-            identifier = identifier["file-path"]
-            identifier = FilePathIdentifierDef(
-                processing=load_processing(identifier.get('processing')))
-        elif "json-path-key" in identifier:
-            identifier = identifier["json-path-key"]
-            identifier = JpathKeyIdentifierDef(
-                processing=load_processing(identifier.get('processing')),
-                path=identifier['path'])
-        elif "json-path-value" in identifier:
-            identifier = identifier["json-path-value"]
-            identifier = JpathValueIdentifierDef(
-                processing=load_processing(identifier.get('processing')),
-                path=identifier['path'])
-        else:
-            raise Exception("Invalid identifier")
-        result.append(
-            RootDef(
-                name=model.stem,
-                multi=data['multi'], type=data['type'], pack_type=data['pack_type'],
-                path=data['path'], json_path=data['json_path'],
-                identifier=identifier,
-                properties=load_properties(data['properties'], [model.stem])
-            )
-        )
-    return result
+    return [load_model(model) for model in p.glob('*.json')]
 
 # Data classes created with load functions
 @dataclass
@@ -307,6 +307,40 @@ class RootDef:
     json_path: JsonPath
     identifier: IdentifierDef
     properties: List[PropertyDef]
+    source_hash: str = ''  # SHA-256 of the file with the definition
+
+@dataclass
+class FlatPropertyDef:
+    '''
+    Property with the access paths relative to the root object of the model
+    (the paths of subproperties are prefixed with the paths of their
+    parents).
+    '''
+    property: PropertyDef
+    access_paths: List[Union[
+        AccessPathKeyDef, AccessPathValueDef, AccessPathKeyValuePairDef]]
+
+def flatten_properties(
+        properties: List[PropertyDef],
+        parent_paths: Optional[List[JsonPath]] = None) -> List[FlatPropertyDef]:
+    '''
+    Lists the properties and their subproperties (recursively) with the
+    access paths relative to the root object of the model.
+    '''
+    if parent_paths is None:
+        parent_paths = [[]]
+    result: List[FlatPropertyDef] = []
+    for property in properties:
+        access_paths: List = []
+        for parent_path in parent_paths:
+            for ap in property.value.access_paths:
+                access_paths.append(replace(ap, path=parent_path + ap.path))
+        result.append(FlatPropertyDef(property, access_paths))
+        if isinstance(property.value, CustomValueDef):
+            result.extend(flatten_properties(
+                property.value.subproperties,
+                [ap.path for ap in access_paths]))
+    return result
 
 # Generator class
 class CodeGenerator(ABC):
@@ -342,6 +376,10 @@ class CodeGenerator(ABC):
     def make_identifier_search(
         self, model: RootDef, target_path: str): ...
 
+    @abstractmethod
+    def make_extract(
+        self, model: RootDef, target_path: str): ...
+
     def make_properties_search(
             self, properties: List[PropertyDef],  model: RootDef,
             target_path: str):
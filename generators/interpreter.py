@@ -0,0 +1,464 @@
+'''
+Runtime interpreter of the models. Executes the definitions from
+models/*.json without generating the code. Every model is compiled once
+into an execution plan (ModelPlan) with precompiled JSON paths and
+processing functions (compiled from the same code as the processing of the
+generated modules, see processing.py). The plan has the same functions as
+the generated modules:
+
+    plans = load_plans(Path('../models'))
+    entity = plans['client_entity']
+    for file in entity.iter_files([Path('RP')]):
+        for object_path, data in entity.extract_file(file):
+            print(data.identifier, data.animations)
+
+The plans are cached by the path and the signature (size and modification
+time) of the file of the model and by the hash of its content, so loading
+the same models again reuses the compiled plans.
+
+The interpreter uses the runtime of the generated package, so bedrock_example
+must be importable (pip install -e python).
+'''
+from __future__ import annotations
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional,
+    Tuple, Union)
+from pathlib import Path
+import re
+
+from generator_tools import *
+from processing import (
+    access_attr, compile_pair_processing, compile_processing)
+from bedrock_example.jpath import (
+    Json, Jpath, JpathMatcher, JpathMode, JpathTrie, ObjectPath, compile_jpath,
+    compile_jpath_trie, load_json_file)
+from bedrock_example.references import PropertyInfo
+from bedrock_example.scanner import compile_globs
+
+# Compiling the definitions
+def compile_path(keys: JsonPath) -> List[Any]:
+    '''
+    Returns the path of the definition with the special keys replaced with
+    the objects used by the JSON path matchers (the runtime equivalent of
+    to_jpath() from python.py).
+    '''
+    result: List[Any] = []
+    for k in keys:
+        if not isinstance(k, str):
+            result.append(k)
+        elif k == "@INT":
+            result.append(Jpath.INT)
+        elif k == "@STR":
+            result.append(Jpath.STR)
+        elif k == "@ANY":
+            result.append(Jpath.ANY)
+        elif k == "@SKIP_LIST":
+            result.append(Jpath.SKIP_LIST)
+        elif k.startswith('@'):
+            result.append(re.compile(k[1:]))
+        else:
+            result.append(k)
+    return result
+
+ACCESS_MODES = {
+    'key': JpathMode.KEY, 'value': JpathMode.VALUE, None: JpathMode.JSON}
+
+# Execution plans
+class AccessStep(NamedTuple):
+    '''
+    A compiled access path of a property.
+
+    - field - the index of the field of the extracted data
+    - matcher - the JSON path relative to the object
+    - multi - whether the path can match more than one value
+    - attr - the part of the matches used by the property ("key", "value"
+      or None for the pairs)
+    - process - the processing of the matches (None if they aren't
+      processed)
+    '''
+    field: int
+    matcher: JpathMatcher
+    multi: bool
+    attr: Optional[str]
+    process: Optional[Callable]
+
+def compile_search(step: AccessStep) -> Callable[[Iterable[Json]], Iterator[Any]]:
+    '''
+    Returns the generator function that yields the processed strings (or
+    pairs of strings) found with the access path in the objects. The
+    function is specialized for the kind of the access path, so the
+    matches go through the same checks as in the generated code.
+    '''
+    process = step.process
+    if step.attr is None:
+        if step.multi:
+            find_all = step.matcher.find_all
+
+            def search_pairs(objects: Iterable[Json]) -> Iterator[Any]:
+                for obj in objects:
+                    for key, value in find_all(obj):
+                        if isinstance(key, str) and isinstance(value, str):
+                            if process is None:
+                                yield key, value
+                            else:
+                                pair = process(key, value)
+                                if pair is not None:
+                                    yield pair
+            return search_pairs
+        find = step.matcher.find
+
+        def search_pair(objects: Iterable[Json]) -> Iterator[Any]:
+            for obj in objects:
+                ref = find(obj)
+                if ref is None:
+                    continue
+                key, value = ref
+                if isinstance(key, str) and isinstance(value, str):
+                    if process is None:
+                        yield key, value
+                    else:
+                        pair = process(key, value)
+                        if pair is not None:
+                            yield pair
+        return search_pair
+    if step.multi:
+        if step.attr == 'key':
+            find_all = step.matcher.find_all_keys
+        else:
+            find_all = step.matcher.find_all_values
+
+        def search_strings(objects: Iterable[Json]) -> Iterator[str]:
+            for obj in objects:
+                for result in find_all(obj):
+                    if isinstance(result, str):
+                        if process is None:
+                            yield result
+                        else:
+                            result = process(result)
+                            if result is not None:
+                                yield result
+        return search_strings
+    find = step.matcher.find
+    index = 0 if step.attr == 'key' else 1
+
+    def search_string(objects: Iterable[Json]) -> Iterator[str]:
+        for obj in objects:
+            ref = find(obj)
+            if ref is None:
+                continue
+            result = ref[index]
+            if isinstance(result, str):
+                if process is None:
+                    yield result
+                else:
+                    result = process(result)
+                    if result is not None:
+                        yield result
+    return search_string
+
+def chain_searches(
+        searches: List[Callable[[Iterable[Json]], Iterator[Any]]]
+        ) -> Callable[[Iterable[Json]], Iterator[Any]]:
+    '''
+    Returns the generator function that yields the results of all of the
+    searches. Every object goes through all of the searches before the next
+    object is taken from the iterable.
+    '''
+    if len(searches) == 1:
+        return searches[0]
+
+    def search(objects: Iterable[Json]) -> Iterator[Any]:
+        for obj in objects:
+            one = (obj,)
+            for s in searches:
+                yield from s(one)
+    return search
+
+class ModelPlan:
+    '''
+    The compiled model. Has the same constants (NAME, PACK_TYPE,
+    MODEL_HASH, PATHS, PROPERTIES) and functions (iter_files(),
+    iter_objects(), iter_identifiers(), the iter_<property>() functions,
+    extract(), extract_file() and extract_document()) as the module
+    generated from the model, so it can be used in their place.
+    '''
+    def __init__(self, model: RootDef):
+        self.model = model
+        self.NAME = model.name
+        self.PACK_TYPE = model.pack_type
+        self.MODEL_HASH = model.source_hash
+        self.PATHS = list(model.path)
+        self.PROPERTIES: Dict[str, PropertyInfo] = {}
+        self.FILES_GLOB = compile_globs({model.name: self.PATHS})
+        self.OBJECTS_JPATH = compile_jpath(compile_path(model.json_path))
+
+        identifier = model.identifier
+        self.file_path_identifier = isinstance(
+            identifier, FilePathIdentifierDef)
+        self._process_identifier = compile_processing(identifier.processing)
+        self._identifier_search: Optional[Callable] = None
+        # The paths and modes of the extract trie and the steps of their
+        # matches (the identifier is always the first path if it isn't the
+        # file path)
+        paths: List[List[Any]] = []
+        modes: List[JpathMode] = []
+        extract_steps: List[Tuple[int, Optional[str], Optional[Callable]]] = []
+        if not self.file_path_identifier:
+            attr = access_attr(identifier)
+            path = compile_path(identifier.path)
+            self._identifier_search = compile_search(AccessStep(
+                0, compile_jpath(path), False, attr, self._process_identifier))
+            paths.append(path)
+            modes.append(ACCESS_MODES[attr])
+
+        # Properties
+        self._searches: Dict[str, Callable] = {}
+        field_names: List[str] = ['identifier']
+        for flat_property in flatten_properties(model.properties):
+            property = flat_property.property
+            value = property.value
+            field_name = '__'.join(property.parent_path[1:] + [property.name])
+            field = len(field_names)
+            field_names.append(field_name)
+            if isinstance(value, ReferenceDef):
+                info = PropertyInfo('reference', value.referenced_object, None)
+            elif isinstance(value, AliasReferenceDef):
+                info = PropertyInfo(
+                    'alias_reference', value.map_provider,
+                    '__'.join(value.map_path))
+            elif isinstance(value, AliasMappingDef):
+                info = PropertyInfo(
+                    'alias_mapping', value.referenced_object, None)
+            else:
+                info = PropertyInfo('custom_value', None, None)
+            self.PROPERTIES[field_name] = info
+
+            processing: List[Optional[Callable]] = []
+            steps: List[AccessStep] = []
+            for access_path in value.access_paths:
+                attr = access_attr(access_path)
+                if attr is None:
+                    process = compile_pair_processing(access_path)
+                else:
+                    process = compile_processing(access_path.processing)
+                processing.append(process)
+                steps.append(AccessStep(
+                    field, compile_jpath(compile_path(access_path.path)),
+                    access_path.multi, attr, process))
+            self._searches[field_name] = chain_searches(
+                [compile_search(step) for step in steps])
+            # The flat access paths are repeated for every path of the
+            # parent property
+            for i, access_path in enumerate(flat_property.access_paths):
+                attr = access_attr(access_path)
+                paths.append(compile_path(access_path.path))
+                modes.append(ACCESS_MODES[attr])
+                extract_steps.append(
+                    (field, attr, processing[i % len(value.access_paths)]))
+
+        self.EXTRACT_JPATHS: JpathTrie = compile_jpath_trie(paths, modes)
+        self.field_names = field_names
+        self.data_type = NamedTuple(  # type: ignore
+            upper_camel_case(model.name),
+            [('identifier', Optional[str])] + [
+                (name, List[Tuple[str, str]]
+                    if info.kind == 'alias_mapping' else List[str])
+                for name, info in self.PROPERTIES.items()])
+        for name, search in self._searches.items():
+            setattr(self, f'iter_{name}', search)
+        self.extract = self._compile_extract(extract_steps)
+
+    def iter_files(self, pack_paths: Iterable[Path]) -> Iterator[Path]:
+        for pack_path in pack_paths:
+            for file, _ in self.FILES_GLOB.iter_files(pack_path):
+                yield file
+
+    def iter_objects(
+            self, paths: Iterable[Path]) -> Iterator[Optional[Json]]:
+        '''
+        Yields the objects of the model from the files (or None for the
+        files that can't be loaded if the model isn't "multi").
+        '''
+        matcher = self.OBJECTS_JPATH
+        multi = self.model.multi
+        for item_path in paths:
+            try:
+                data = load_json_file(item_path)
+            except:
+                if not multi:
+                    yield None
+                continue
+            if multi:
+                yield from matcher.iterate(data)
+            else:
+                yield matcher.find(Json(None, data))
+
+    def iter_identifiers(self, items: Iterable[Any]) -> Iterator[str]:
+        '''
+        Yields the identifiers of the objects (or of the files if the
+        identifier of the model is the file path).
+        '''
+        process = self._process_identifier
+        if self.file_path_identifier:
+            for item_path in items:
+                result = item_path.as_posix()
+                if process is not None:
+                    result = process(result)
+                    if result is None:
+                        continue
+                yield result
+            return
+        yield from self._identifier_search(items)
+
+    def iter_property(
+            self, name: str, objects: Iterable[Json]) -> Iterator[Any]:
+        '''
+        Yields the values of the property (the name of a field of the
+        extracted data) of the objects.
+        '''
+        if name not in self._searches:
+            raise KeyError(f'Unknown property of {self.NAME}: {name}')
+        return self._searches[name](objects)
+
+    def _compile_extract(
+            self, extract_steps: List[Tuple[int, Optional[str], Optional[Callable]]]
+            ) -> Callable[..., Any]:
+        '''
+        Returns the extract() function of the plan. The steps are the
+        fields, the used parts and the processing of the matches of the
+        paths of the extract trie (after the identifier).
+        '''
+        find_all = self.EXTRACT_JPATHS.find_all
+        make = self.data_type._make
+        process_identifier = self._process_identifier
+        file_path_identifier = self.file_path_identifier
+        start = 0 if file_path_identifier else 1
+        n_properties = len(self.PROPERTIES)
+        # (the index of the matches, field, pairs, processing)
+        steps = [
+            (start + i, field, attr is None, process)
+            for i, (field, attr, process) in enumerate(extract_steps)]
+
+        def extract(obj: Json, item_path: Optional[Path] = None) -> Any:
+            '''
+            Returns the identifier and all of the properties of the object
+            using a single traversal of its JSON paths.
+            '''
+            found = find_all(obj)
+            identifier: Optional[str] = None
+            if file_path_identifier:
+                if item_path is not None:
+                    identifier = item_path.as_posix()
+                    if process_identifier is not None:
+                        identifier = process_identifier(identifier)
+            else:
+                for result in found[0]:
+                    if isinstance(result, str):
+                        if process_identifier is not None:
+                            result = process_identifier(result)
+                            if result is None:
+                                continue
+                        identifier = result
+                        break
+            values: List[Any] = [identifier]
+            for _ in range(n_properties):
+                values.append([])
+            for index, field, pairs, process in steps:
+                results = found[index]
+                if not results:
+                    continue
+                out = values[field]
+                if pairs:
+                    for key, value in results:
+                        if isinstance(key, str) and isinstance(value, str):
+                            if process is None:
+                                out.append((key, value))
+                            else:
+                                pair = process(key, value)
+                                if pair is not None:
+                                    out.append(pair)
+                elif process is None:
+                    for result in results:
+                        if isinstance(result, str):
+                            out.append(result)
+                else:
+                    for result in results:
+                        if isinstance(result, str):
+                            result = process(result)
+                            if result is not None:
+                                out.append(result)
+            return make(values)
+        extract.__annotations__['return'] = self.data_type
+        return extract
+
+    def extract_file(self, item_path: Path) -> List[Tuple[ObjectPath, Any]]:
+        '''
+        Returns the paths and the extracted data of all objects from the
+        file.
+        '''
+        try:
+            data = load_json_file(item_path)
+        except:
+            return []
+        return self.extract_document(data, item_path)
+
+    def extract_document(
+            self, data: Any, item_path: Optional[Path] = None
+            ) -> List[Tuple[ObjectPath, Any]]:
+        '''
+        Returns the paths and the extracted data of all objects from the
+        parsed content of a file.
+        '''
+        extract = self.extract
+        return [
+            (object_path, extract(obj, item_path))
+            for object_path, obj in self.OBJECTS_JPATH.find_all_paths(
+                Json(None, data))]
+
+    def __repr__(self) -> str:
+        return f'<ModelPlan {self.NAME}>'
+
+# Cache of the compiled plans
+# (name, hash of the definition) -> plan
+_PLANS: Dict[Tuple[str, str], ModelPlan] = {}
+# path of the model -> ((size, modification time), plan)
+_FILES: Dict[Path, Tuple[Tuple[int, int], ModelPlan]] = {}
+
+def compile_model(model: RootDef) -> ModelPlan:
+    '''
+    Returns the execution plan of the model (compiled only once for every
+    version of the definition).
+    '''
+    key = (model.name, model.source_hash)
+    plan = _PLANS.get(key)
+    if plan is None:
+        plan = _PLANS[key] = ModelPlan(model)
+    return plan
+
+def load_plan(path: Path) -> ModelPlan:
+    '''
+    Returns the execution plan of the model from the file. The file is
+    loaded again only if its size or modification time changed.
+    '''
+    path = path.resolve()
+    stat = path.stat()
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _FILES.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    plan = compile_model(load_model(path))
+    _FILES[path] = (signature, plan)
+    return plan
+
+def load_plans(models_path: Path) -> Dict[str, ModelPlan]:
+    '''
+    Returns the execution plans of all models from the directory (the
+    runtime equivalent of the MODELS of the generated package).
+    '''
+    return {
+        path.stem: load_plan(path)
+        for path in sorted(models_path.glob('*.json'))}
+
+def clear_cache():
+    _PLANS.clear()
+    _FILES.clear()
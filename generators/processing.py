@@ -0,0 +1,206 @@
+'''
+The processing of the values found with the access paths (the filters and
+the postprocessing) shared by the code generator (python.py) and the runtime
+interpreter (interpreter.py). The make_*() functions return the fused code
+of the processing. The generator writes the code into the generated modules
+and the compile_*() functions execute the same code to create the
+processing functions at runtime.
+'''
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import re
+
+from generator_tools import *
+
+ValueProcessing = Callable[[str], Optional[str]]
+PairProcessing = Callable[[str, str], Optional[Tuple[str, str]]]
+
+def join_code(*parts: str) -> str:
+    '''
+    Joins the non-empty parts of generated code with new lines.
+    '''
+    return '\n'.join(p for p in parts if p != '')
+
+def make_filter(
+        filters: Optional[FiltersDef], value: str, prefix: str,
+        constants: List[str]) -> str:
+    '''
+    Returns the code that rejects the value (returns None) if it doesn't
+    pass the filters. All of the filter items are fused into a single
+    condition, the value matches the filters if it matches any of the items
+    (a whitelist accepts it and a blacklist rejects it). The regular
+    expressions and the sets of literals are added to the module-level
+    constants.
+    '''
+    if filters is None:
+        return ''
+    conditions: List[str] = []
+    literals = [i for i in filters.items if isinstance(i, str)]
+    if len(literals) == 1:
+        conditions.append(f'{value} == {json.dumps(literals[0])}')
+    elif len(literals) > 1:
+        name = f'{prefix}_LITERALS'
+        constants.append(f'{name} = frozenset({json.dumps(literals)})')
+        conditions.append(f'{value} in {name}')
+    for method, item_type in (
+            ('startswith', FilterItemStartsWith),
+            ('endswith', FilterItemEndsWith)):
+        affixes = [
+            json.dumps(i.value) for i in filters.items
+            if isinstance(i, item_type)]
+        if len(affixes) == 1:
+            conditions.append(f'{value}.{method}({affixes[0]})')
+        elif len(affixes) > 1:
+            conditions.append(f'{value}.{method}(({", ".join(affixes)}))')
+    regexes = [i.value for i in filters.items if isinstance(i, FilterItemRegex)]
+    for i, regex in enumerate(regexes):
+        name = f'{prefix}_REGEX_{i}'
+        constants.append(f'{name} = re.compile({json.dumps(regex)})')
+        conditions.append(f'{name}.fullmatch({value}) is not None')
+    if len(conditions) == 0:
+        return ''
+    condition = ' or '.join(conditions)
+    if filters.exclude:
+        return f'if {condition}:\n    return None'
+    if len(conditions) > 1:
+        condition = f'({condition})'
+    return f'if not {condition}:\n    return None'
+
+def make_postprocessing(
+        postprocessing: PostprocessingDef, value: str, prefix: str,
+        constants: List[str]) -> str:
+    '''
+    Returns the code that transforms the value in place. The regular
+    expressions are added to the module-level constants.
+    '''
+    results: List[str] = []
+    for i, p in enumerate(postprocessing):
+        if isinstance(p, PostprocessingChangeCaseDef):
+            results.append(
+                f'{value} = {value}.{"lower" if p.lower else "upper"}()')
+        elif isinstance(p, PostprocessingFilePathDef):
+            # Path(value).with_suffix("").as_posix() without creating the
+            # Path object
+            results.append(unindent(12, f'''\
+            name_start = {value}.rfind("/") + 1
+            suffix_start = {value}.rfind(".", name_start)
+            if name_start < suffix_start < len({value}) - 1:
+                {value} = {value}[:suffix_start]'''))
+        elif isinstance(p, PostprocessingPruneDef):
+            if p.front:
+                results.append(
+                    f'{value} = {value}.lstrip({json.dumps(p.front)})')
+            if p.end is not None:
+                results.append(
+                    f'{value} = {value}.rstrip({json.dumps(p.end)})')
+        elif isinstance(p, PostprocessingSubstringDef):
+            if p.front:
+                results.append(f'{value} = {value}[{p.front}:]')
+            if p.end is not None:
+                results.append(f'{value} = {value}[:{p.end}]')
+        elif isinstance(p, PostprocessingRegexReplace):
+            name = f'{prefix}_REPLACE_{i}'
+            flags = '' if p.case_sensitive else ', re.IGNORECASE'
+            constants.append(
+                f'{name} = re.compile({json.dumps(p.match)}{flags})')
+            results.append(
+                f'{value} = {name}.sub({json.dumps(p.out)}, {value})')
+    return '\n'.join(results)
+
+def make_value_processing(
+        processing: Optional[ProcessingDef], value: str, prefix: str,
+        constants: List[str]) -> str:
+    '''
+    Returns the fused code of the filters, postprocessing and postprocessing
+    filters of the value. The code returns None if the value is rejected.
+    '''
+    if processing is None:
+        return ''
+    return join_code(
+        make_filter(processing.filters, value, prefix, constants),
+        make_postprocessing(
+            processing.postprocessing, value, prefix, constants),
+        make_filter(
+            processing.postprocessing_filters, value, f'{prefix}_POST',
+            constants))
+
+def make_processing_function(
+        name: str, processing: Optional[ProcessingDef], prefix: str,
+        constants: List[str]) -> str:
+    '''
+    Returns the definition of the function that processes a value (or an
+    empty string if the value isn't processed).
+    '''
+    code = make_value_processing(processing, 'value', prefix, constants)
+    if code == '':
+        return ''
+    return (
+        f'def {name}(value: str) -> Optional[str]:\n' +
+        indent(4, join_code(code, 'return value')))
+
+def make_pair_processing_function(
+        name: str, access_path: AccessPathKeyValuePairDef, prefix: str,
+        constants: List[str]) -> str:
+    '''
+    Returns the definition of the function that processes a (key, value)
+    pair (or an empty string if the pair isn't processed).
+    '''
+    key_code = make_value_processing(
+        access_path.key_processing, 'key', f'{prefix}_KEY', constants)
+    value_code = make_value_processing(
+        access_path.value_processing, 'value', f'{prefix}_VALUE', constants)
+    if key_code == '' and value_code == '':
+        return ''
+    return (
+        f'def {name}(key: str, value: str) -> Optional[Tuple[str, str]]:\n' +
+        indent(4, join_code(key_code, value_code, 'return key, value')))
+
+def access_attr(access_path: Any) -> Optional[str]:
+    '''
+    Returns the part of the matches of the access path used by the property
+    ("key" or "value") or None for the (key, value) pairs.
+    '''
+    if isinstance(access_path, AccessPathKeyValuePairDef):
+        return None
+    if isinstance(access_path, (AccessPathKeyDef, JpathKeyIdentifierDef)):
+        return 'key'
+    return 'value'
+
+def _exec_function(function: str, constants: List[str]) -> Callable:
+    '''
+    Executes the definition of the processing function with its constants
+    and returns the function.
+    '''
+    namespace: Dict[str, Any] = {
+        're': re, 'Optional': Optional, 'Tuple': Tuple}
+    exec(join_code(*constants, function), namespace)
+    return namespace['process']
+
+def compile_processing(
+        processing: Optional[ProcessingDef]) -> Optional[ValueProcessing]:
+    '''
+    Returns the function that applies the filters, postprocessing and
+    postprocessing filters to the value (and returns None if the value is
+    rejected) or None if the value isn't processed.
+    '''
+    constants: List[str] = []
+    function = make_processing_function(
+        'process', processing, 'PROCESS', constants)
+    if function == '':
+        return None
+    return _exec_function(function, constants)
+
+def compile_pair_processing(
+        access_path: AccessPathKeyValuePairDef) -> Optional[PairProcessing]:
+    '''
+    Returns the function that processes the key and the value of the pair
+    (and returns None if the pair is rejected) or None if the pairs of the
+    access path aren't processed.
+    '''
+    constants: List[str] = []
+    function = make_pair_processing_function(
+        'process', access_path, 'PROCESS', constants)
+    if function == '':
+        return None
+    return _exec_function(function, constants)
@@ -3,6 +3,16 @@ Example python code generator.
 '''
 from __future__ import annotations
 from generator_tools import *
+from processing import (
+    access_attr, join_code, make_pair_processing_function,
+    make_processing_function)
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
 
 # Helper functions for the generator
 def to_jpath(keys: List[Union[str, int]]) -> str:
@@ -24,6 +34,23 @@ def to_jpath(keys: List[Union[str, int]]) -> str:
             result.append(f'"{k}"')
     return f'[{", ".join(result)}]'
 
+def jpath_constant(
+        constants: List[str], name: str, keys: List[Union[str, int]]) -> str:
+    '''
+    Adds a definition of a module-level compiled JSON path to constants and
+    returns its name.
+    '''
+    constants.append(f'{name} = compile_jpath({to_jpath(keys)})')
+    return name
+
+def join_chunk(constants: List[str], code: List[str]) -> str:
+    '''
+    Joins the module-level constants with the code that uses them.
+    '''
+    if len(constants) == 0:
+        return '\n'.join(code)
+    return '\n'.join(constants + ['', ''] + code)
+
 def to_type(string: str) -> str:
     return {
         "array": "List",
@@ -35,383 +62,680 @@ def to_type(string: str) -> str:
         "string": "str"
     }[string]
 
-def make_value_filter(filters: FiltersDef, value: str, results: List[str]):
-    exclude = filters.exclude
-    literal_filters = []
-    for processing_fileter in filters.items:
-        if isinstance(processing_fileter, str):
-            literal_filters.append(processing_fileter)
-        elif isinstance(processing_fileter, FilterItemRegex):
-            results.append(unindent(12, f'''\
-            if {"" if exclude else "not "}bool(re.fullmatch("{processing_fileter.value}", {value})):
-                continue'''))
-        elif isinstance(processing_fileter, FilterItemStartsWith):
-            results.append(unindent(12, f'''\
-            if {"" if exclude else "not "}{value}.startswith("{processing_fileter.value}"):
-                continue'''))
-        elif isinstance(processing_fileter, FilterItemEndsWith):
-            results.append(unindent(12, f'''\
-            if {"" if exclude else "not "}{value}.startswith("{processing_fileter.value}"):
-                continue'''))
-    if len(literal_filters) > 0:
-        results.append(unindent(8, f'''\
-        if {value} {"" if exclude else "not "}in {literal_filters}:
-            continue'''))
-
-def make_value_processing(value: str, processing: Optional[ProcessingDef]) -> str:
-    if processing is None:
-        return ''
-    results: List[str] = []
-    if processing.filters is not None:
-        make_value_filter(processing.filters, value, results)
-    if len(processing.postprocessing) > 0:
-        for p in processing.postprocessing:
-            if isinstance(p, PostprocessingChangeCaseDef):
-                results.append(
-                    f'    {value} = {value}{"lower" if p.lower else "upper"}()')
-            elif isinstance(p, PostprocessingFilePathDef):
-                results.append(
-                    f'    {value} = Path({value}).with_suffix("").as_posix()')
-            elif isinstance(p, PostprocessingPruneDef):
-                if p.front:
-                    results.append(
-                        f'    {value} = {value}.lstrip("{p.front}")')
-                if p.end is not None:
-                    results.append(
-                        f'    {value} = {value}.rstrip("{p.end}")')
-            elif isinstance(p, PostprocessingSubstringDef):
-                if p.front:
-                    results.append(
-                        f'    {value} = {value}[{p.front}:]')
-                if p.end is not None:
-                    results.append(
-                        f'    {value} = {value}[:{p.end}]')
-            elif isinstance(p, PostprocessingRegexReplace):
-                if p.case_sensitive:
-                    results.append(
-                        f'    {value} = re.sub("{p.match}", "{p.out}", {value})'
-                    )
-                else:
-                    results.append(
-                        f'    {value} = re.sub("{p.match}", "{p.out}", {value}, re.IGNORECASE)'
-                    )
-    if processing.postprocessing_filters is not None:
-        make_value_filter(processing.postprocessing_filters, value, results)
-    return '\n'.join(results)
+def make_string_access(value: str, process: Optional[str], emit: str) -> str:
+    '''
+    Returns the code that checks if the value (an expression) is a string,
+    processes it and emits the result.
+    '''
+    lines: List[str] = []
+    if value != 'result':
+        lines.append(f'result = {value}')
+    lines.append('if isinstance(result, str):')
+    if process is None:
+        lines.append(indent(4, emit.format('result')))
+    else:
+        lines.extend([
+            f'    result = {process}(result)',
+            '    if result is not None:',
+            indent(8, emit.format('result'))])
+    return '\n'.join(lines)
+
+def make_pair_access(process: Optional[str], emit: str) -> str:
+    '''
+    Returns the code that checks the key and the value of the JSON reference,
+    processes them and emits the pair.
+    '''
+    lines = ['if isinstance(key, str) and isinstance(value, str):']
+    if process is None:
+        lines.append(indent(4, emit.format('(key, value)')))
+    else:
+        lines.extend([
+            f'    pair = {process}(key, value)',
+            '    if pair is not None:',
+            indent(8, emit.format('pair'))])
+    return '\n'.join(lines)
+
+def access_mode(attr: Optional[str]) -> str:
+    '''
+    Returns the JpathMode that returns only the part of the matches used by
+    the property.
+    '''
+    return {
+        'key': 'JpathMode.KEY', 'value': 'JpathMode.VALUE', None: 'JpathMode.JSON'
+    }[attr]
+
+def make_access(
+        jpath: str, multi: bool, attr: Optional[str], process: Optional[str],
+        emit: str) -> str:
+    '''
+    Returns the code that emits the processed strings (or pairs of strings
+    if the attr is None) found in the object (obj) with the JSON path. The
+    multi paths yield only the keys or values if the pairs aren't needed.
+    The code doesn't skip the rest of the enclosing loop so the access paths
+    can be chained in a single pass.
+    '''
+    if attr is None:
+        body = make_pair_access(process, emit)
+        if multi:
+            return f'for key, value in {jpath}.find_all(obj):\n' + indent(4, body)
+        return (
+            f'ref = {jpath}.find(obj)\nif ref is not None:\n'
+            f'    key, value = ref\n' + indent(4, body))
+    if multi:
+        return (
+            f'for result in {jpath}.find_all_{attr}s(obj):\n' +
+            indent(4, make_string_access('result', process, emit)))
+    return (
+        f'ref = {jpath}.find(obj)\nif ref is not None:\n' +
+        indent(4, make_string_access(f'ref.{attr}', process, emit)))
 
 class PyIteratorsGenerator(CodeGenerator):
     def __init__(self):
         self.files: Dict[str, list] = defaultdict(list)  # The files to generate
+        # The names of the processing functions of the current model by the
+        # name of the property and the index of the access path
+        self.processing: Dict[Tuple[str, int], str] = {}
 
     def generate(self, models: List[RootDef]):
         for model in models:
             target_path = f"{model.name}.py"
+            self.files[target_path].append(unindent(12, f'''\
+            NAME = "{model.name}"
+            PACK_TYPE = "{model.pack_type}"
+            MODEL_HASH = "{model.source_hash}"
+            '''))
+            self.make_properties_metadata(model, target_path)
             self.make_file_search(model, target_path)
             self.make_object_search(model, target_path)
+            self.make_processing(model, target_path)
             self.make_identifier_search(model, target_path)
             self.make_properties_search(model.properties, model, target_path)
+            self.make_extract(model, target_path)
+            self.make_profiling(target_path)
+
+    def make_properties_metadata(self, model: RootDef, target_path: str):
+        '''
+        Describes the properties (the fields of the extracted data) and the
+        models they refer to.
+        '''
+        result: List[str] = ['PROPERTIES: Dict[str, PropertyInfo] = {']
+        for flat_property in flatten_properties(model.properties):
+            property = flat_property.property
+            field_name = '__'.join(property.parent_path[1:] + [property.name])
+            value = property.value
+            if isinstance(value, ReferenceDef):
+                info = f'"reference", "{value.referenced_object}", None'
+            elif isinstance(value, AliasReferenceDef):
+                info = (
+                    f'"alias_reference", "{value.map_provider}", '
+                    f'"{"__".join(value.map_path)}"')
+            elif isinstance(value, AliasMappingDef):
+                info = f'"alias_mapping", "{value.referenced_object}", None'
+            else:
+                info = '"custom_value", None, None'
+            result.append(f'    "{field_name}": PropertyInfo({info}),')
+        result.append('}')
+        self.files[target_path].append('\n'.join(result) + '\n')
 
     def make_file_search(self, model: RootDef, target_path: str):
-        name = model.name
-        pack_type = model.pack_type
-        glob_patterns = model.path
-        if len(glob_patterns) > 1:
-            pack_name = pack_type.replace('-', '_')
-            pack_paths = f'{pack_name}_paths'
-            self.files[target_path].append(unindent(12, f'''\
-            def files(*{pack_paths}: Path) -> Iterator[Path]:
-                for pattern in {glob_patterns}:
-                    for pack_path in {pack_paths}:
-                        for file in pack_path.glob(pattern):
-                            yield file
-            '''))
-        else:
-            pack_name = pack_type.replace('-', '_')
-            pack_paths = f'{pack_name}_paths'
-            glob_pattern = f'"{glob_patterns[0]}"'
-            self.files[target_path].append(unindent(12, f'''\
-            def files(*{pack_paths}: Path) -> Iterator[Path]:
-                for pack_path in {pack_paths}:
-                    for file in pack_path.glob({glob_pattern}):
-                        yield file
-            '''))
+        pack_name = model.pack_type.replace('-', '_')
+        pack_paths = f'{pack_name}_paths'
+        constants = [
+            f'PATHS = {json.dumps(model.path)}',
+            'FILES_GLOB = compile_globs({NAME: PATHS})']
+        self.files[target_path].append(join_chunk(constants, [unindent(8, f'''\
+        def iter_files({pack_paths}: Iterable[Path]) -> Iterator[Path]:
+            for pack_path in {pack_paths}:
+                for file, _ in FILES_GLOB.iter_files(pack_path):
+                    yield file
+
+
+        def files(*{pack_paths}: Path) -> Iterator[Path]:
+            return iter_files({pack_paths})
+
+
+        def aiter_files({pack_paths}: Iterable[Path]) -> AsyncIterator[Path]:
+            from .aio import iterate_in_thread
+            return iterate_in_thread(iter_files({pack_paths}))
+        ''', ignore_errors=True)]))
 
     def make_object_search(self, model: RootDef, target_path: str):
         name = model.name
-        json_path = to_jpath(model.json_path)
+        constants: List[str] = []
+        jpath = jpath_constant(constants, 'OBJECTS_JPATH', model.json_path)
         if model.multi:
-            self.files[target_path].append(unindent(12, f'''\
-            def objects(*paths: Path) -> Iterator[Json]:
+            code = unindent(12, f'''\
+            def iter_objects(paths: Iterable[Path]) -> Iterator[Json]:
                 for item_path in paths:
                     try:
-                        with item_path.open('r') as f:
-                            yield from get_jpath_multi(Json(None, json.load(f)), {json_path})
+                        data = load_json_file(item_path)
                     except:
                         continue
-            '''))
+                    yield from {jpath}.iterate(data)
+
+
+            def iter_stream_objects(paths: Iterable[Path]) -> Iterator[Json]:
+                \'\'\'
+                The equivalent of iter_objects() that parses the files incrementally
+                and builds only the matching objects (one at a time).
+                \'\'\'
+                from .jstream import stream_file
+                for item_path in paths:
+                    try:
+                        for _, obj in stream_file(item_path, {jpath}):
+                            yield obj
+                    except (OSError, ValueError):
+                        continue
+
+
+            def objects(*paths: Path) -> Iterator[Json]:
+                return iter_objects(paths)
+
+
+            def stream_objects(*paths: Path) -> Iterator[Json]:
+                return iter_stream_objects(paths)
+
+
+            async def aiter_objects(
+                    paths: PathSource, max_in_flight: int = 16) -> AsyncIterator[Json]:
+                \'\'\'
+                The asynchronous equivalent of iter_objects(). The files are read in
+                worker threads (at most max_in_flight at a time) and parsed as soon
+                as the consumer asks for their objects.
+                \'\'\'
+                from .aio import read_files
+                async for item_path, content in read_files(paths, max_in_flight):
+                    if content is None:
+                        continue
+                    try:
+                        data = loads_json(content)
+                    except:
+                        continue
+                    for obj in {jpath}.iterate(data):
+                        yield obj
+            ''', ignore_errors=True)
         else:
-            self.files[target_path].append(unindent(12, f'''\
-            def objects(*paths: Path) -> Iterator[Optional[Json]]:
+            code = unindent(12, f'''\
+            def iter_objects(paths: Iterable[Path]) -> Iterator[Optional[Json]]:
                 for item_path in paths:
                     try:
-                        with item_path.open('r') as f:
-                            yield get_jpath_single(Json(None, json.load(f)), {json_path})
+                        data = load_json_file(item_path)
                     except:
                         yield None
-            '''))
+                        continue
+                    yield {jpath}.find(Json(None, data))
+
+
+            def objects(*paths: Path) -> Iterator[Optional[Json]]:
+                return iter_objects(paths)
+
+
+            async def aiter_objects(
+                    paths: PathSource, max_in_flight: int = 16
+                    ) -> AsyncIterator[Optional[Json]]:
+                \'\'\'
+                The asynchronous equivalent of iter_objects(). The files are read in
+                worker threads (at most max_in_flight at a time) and parsed as soon
+                as the consumer asks for their objects.
+                \'\'\'
+                from .aio import read_files
+                async for item_path, content in read_files(paths, max_in_flight):
+                    if content is None:
+                        yield None
+                        continue
+                    try:
+                        data = loads_json(content)
+                    except:
+                        yield None
+                        continue
+                    yield {jpath}.find(Json(None, data))
+            ''', ignore_errors=True)
+        self.files[target_path].append(join_chunk(constants, [code]))
+
+    def make_processing(self, model: RootDef, target_path: str):
+        '''
+        The optimization stage of the generator. Fuses the filters and
+        postprocessing of every access path into a single module-level
+        function (with the regular expressions compiled once as module-level
+        constants) that is called by the identifier and property searches.
+        '''
+        self.processing = {}
+        constants: List[str] = []
+        functions: List[str] = []
+        function = make_processing_function(
+            'process_identifier', model.identifier.processing, 'IDENTIFIER',
+            constants)
+        if function != '':
+            self.processing[('identifier', 0)] = 'process_identifier'
+            functions.append(function)
+        for flat_property in flatten_properties(model.properties):
+            property = flat_property.property
+            field_name = '__'.join(property.parent_path[1:] + [property.name])
+            for i, access_path in enumerate(property.value.access_paths):
+                prefix = f'{field_name.upper()}_{i}'
+                func_name = f'process_{field_name}_{i}'
+                if isinstance(access_path, AccessPathKeyValuePairDef):
+                    function = make_pair_processing_function(
+                        func_name, access_path, prefix, constants)
+                else:
+                    function = make_processing_function(
+                        func_name, access_path.processing, prefix, constants)
+                if function == '':
+                    continue
+                functions.append(function)
+                self.processing[(field_name, i)] = func_name
+        if len(functions) == 0:
+            return
+        code = []
+        for function in functions:
+            code.extend([function, '', ''])
+        self.files[target_path].append(join_chunk(constants, code[:-1]))
 
     def make_identifier_search(self, model: RootDef, target_path: str):
         result: List[str] = []
+        constants: List[str] = []
+        process = self.processing.get(('identifier', 0))
         if isinstance(model.identifier, FilePathIdentifierDef):
-            result.append(unindent(12, f'''\
-            def identifiers(*paths: Path) -> Iterator[str]:
+            result.append(unindent(12, '''\
+            def iter_identifiers(paths: Iterable[Path]) -> Iterator[str]:
                 for item_path in paths:
                     result = item_path.as_posix()'''))
-            result.append(indent(8,
-                make_value_processing('result', model.identifier.processing) +
-                '\nyield result\n'
-            ))
-        elif isinstance(model.identifier, JpathKeyIdentifierDef):
-            json_path = to_jpath(model.identifier.path)
-            result.append(unindent(12, f'''\
-            def identifiers(*objects: Json) -> Iterator[str]:
-                for obj in objects:
-                    identifier = get_jpath_single(obj, {json_path})
-                    if identifier is not None and isinstance(identifier.key, str):
-                        result = identifier.key'''))
-            result.append(indent(12,
-                make_value_processing('result', model.identifier.processing) +
-                '\nyield result\n'
-            ))
-        elif isinstance(model.identifier, JpathValueIdentifierDef):
-            json_path = to_jpath(model.identifier.path)
-            result.append(unindent(12, f'''\
-            def identifiers(*objects: Json) -> Iterator[str]:
-                for obj in objects:
-                    identifier = get_jpath_single(obj, {json_path})
-                    if identifier is not None and isinstance(identifier.value, str):
-                        result = identifier.value'''))
-            result.append(indent(12,
-                make_value_processing('result', model.identifier.processing) +
-                '\nyield result\n'
-            ))
-        self.files[target_path].append('\n'.join(result))
+            if process is None:
+                result.append('        yield result')
+            else:
+                result.append(unindent(12, f'''\
+                    result = {process}(result)
+                    if result is not None:
+                        yield result'''))
+            result.append(unindent(12, '''\
+
+
+            def identifiers(*paths: Path) -> Iterator[str]:
+                return iter_identifiers(paths)
+            ''', ignore_errors=True))
+        else:
+            jpath = jpath_constant(
+                constants, 'IDENTIFIER_JPATH', model.identifier.path)
+            result.append(unindent(12, '''\
+            def iter_identifiers(
+                    objects: Iterable[Optional[Json]]) -> Iterator[str]:
+                for obj in objects:'''))
+            result.append(indent(8, make_access(
+                jpath, False, access_attr(model.identifier), process,
+                'yield {}')))
+            result.append(unindent(12, '''\
+
+
+            def identifiers(*objects: Optional[Json]) -> Iterator[str]:
+                return iter_identifiers(objects)
+            ''', ignore_errors=True))
+        self.files[target_path].append(join_chunk(constants, result))
+
+    def make_access_paths_search(
+            self, access_paths: List, parent_names: List[str],
+            return_type: str, target_path: str):
+        '''
+        Generates the functions that yield the values of a property found
+        with all of its access paths. Every object goes through all of the
+        access paths before the next object is taken from the iterable.
+        '''
+        func_name = '__'.join(parent_names[1:])
+        result: List[str] = []
+        result.append(unindent(8, f'''\
+        def iter_{func_name}(
+                objects: Iterable[Optional[Json]]) -> {return_type}:
+            for obj in objects:'''))
+        constants: List[str] = []
+        for i, access_path in enumerate(access_paths):
+            jpath = jpath_constant(
+                constants, f'{func_name.upper()}_JPATH_{i}', access_path.path)
+            result.append(indent(8, make_access(
+                jpath, access_path.multi, access_attr(access_path),
+                self.processing.get((func_name, i)), 'yield {}')))
+        result.append(unindent(8, f'''\
+
+
+        def {func_name}(*objects: Optional[Json]) -> {return_type}:
+            return iter_{func_name}(objects)
+        ''', ignore_errors=True))
+        self.files[target_path].append(join_chunk(constants, result))
 
     def properties_search__reference(
             self, property: ReferenceDef,  parent_names: List[str],
             model: RootDef, target_path: str):
-        func_name = '__'.join(parent_names[1:])
-        result: List[str] = []
-        result.append(f'def {func_name}(*objects: Json) -> Iterator[str]:')
-        for access_path in property.access_paths:
-            if isinstance(access_path, AccessPathKeyDef):
-                if access_path.multi:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        for ref in get_jpath_multi(obj, {to_jpath(access_path.path)}):
-                            if isinstance(ref.key, str):
-                                result = ref.key
-                    '''))
-                    result.append(indent(16,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
-                else:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        ref = get_jpath_single(obj, {to_jpath(access_path.path)})
-                        if ref is not None and isinstance(ref.key, str):
-                            result = ref.key
-                    '''))
-                    result.append(indent(12,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
-            elif isinstance(access_path, AccessPathValueDef):
-                if access_path.multi:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        for ref in get_jpath_multi(obj, {to_jpath(access_path.path)}):
-                            if isinstance(ref.value, str):
-                                result = ref.value
-                    '''))
-                    result.append(indent(16,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
-                else:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        ref = get_jpath_single(obj, {to_jpath(access_path.path)})
-                        if ref is not None and isinstance(ref.value, str):
-                            result = ref.value
-                    '''))
-                    result.append(indent(12,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
-        self.files[target_path].append('\n'.join(result))
+        self.make_access_paths_search(
+            property.access_paths, parent_names, 'Iterator[str]', target_path)
 
     def properties_search__alias_reference(
             self, property: AliasReferenceDef,  parent_names: List[str],
             model: RootDef, target_path: str):
-        func_name = '__'.join(parent_names[1:])
-        result: List[str] = []
-        result.append(f'def {func_name}(*objects: Json) -> Iterator[str]:')
-        for access_path in property.access_paths:
-            if isinstance(access_path, AccessPathKeyDef):
-                if access_path.multi:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        for ref in get_jpath_multi(obj, {to_jpath(access_path.path)}):
-                            if isinstance(ref.key, str):
-                                result = ref.key'''))
-                    result.append(indent(16,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
-                else:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        ref = get_jpath_single(obj, {to_jpath(access_path.path)})
-                        if ref is not None and isinstance(ref.key, str):
-                            result = ref.key'''))
-                    result.append(indent(12,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
-            elif isinstance(access_path, AccessPathValueDef):
-                if access_path.multi:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        for ref in get_jpath_multi(obj, {to_jpath(access_path.path)}):
-                            if isinstance(ref.value, str):
-                                result = ref.value'''))
-                    result.append(indent(16,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
-                else:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        ref = get_jpath_single(obj, {to_jpath(access_path.path)})
-                        if isinstance(ref.value, str):
-                            result = ref.value'''))
-                    result.append(indent(12,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
-        self.files[target_path].append('\n'.join(result))
+        self.make_access_paths_search(
+            property.access_paths, parent_names, 'Iterator[str]', target_path)
 
     def properties_search__alias_mapping(
             self, property: AliasMappingDef,  parent_names: List[str],
             model: RootDef, target_path: str):
-        func_name = '__'.join(parent_names[1:])
-        result: List[str] = []
-        result.append(
-            f'def {func_name}(*objects: Json) -> Iterator[Tuple[str, str]]:')
-        for access_path in property.access_paths:
-            if access_path.multi:
-                result.append(unindent(12, f'''\
-                for obj in objects:
-                    for ref in get_jpath_multi(obj, {to_jpath(access_path.path)}):
-                        if isinstance(ref.key, str) and isinstance(ref.value, str):'''))
-                result.append(indent(16,
-                    make_value_processing('ref.key', access_path.key_processing)
-                ))
-                result.append(indent(16,
-                    make_value_processing('ref.value', access_path.value_processing) +
-                    '\nyield ref.key, ref.value\n'
-                ))
-            else:
-                result.append(unindent(12, f'''\
-                for obj in objects:
-                    ref = get_jpath_single(obj, {to_jpath(access_path.path)})
-                    if ref is not None and isinstance(ref.key, str) and isinstance(ref.value, str):'''))
-                result.append(indent(16,
-                    make_value_processing('ref.key', access_path.key_processing)
-                ))
-                result.append(indent(16,
-                    make_value_processing('ref.value', access_path.value_processing) +
-                    '\nyield ref.key, ref.value\n'
-                ))
-        self.files[target_path].append('\n'.join(result))
+        self.make_access_paths_search(
+            property.access_paths, parent_names, 'Iterator[Tuple[str, str]]',
+            target_path)
 
     def properties_search__custom_value(
             self, property: CustomValueDef,  parent_names: List[str],
             model: RootDef, target_path: str):
-        func_name = '__'.join(parent_names[1:])
-        result: List[str] = []
-        result.append(f'def {func_name}(*objects: Json):')
-        for access_path in property.access_paths:
-            if isinstance(access_path, AccessPathKeyDef):
-                if access_path.multi:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        for ref in get_jpath_multi(obj, {to_jpath(access_path.path)}):
-                            if isinstance(ref.key, str):
-                                result = ref.key'''))
-                    result.append(indent(16,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
-                else:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        ref = get_jpath_single(obj, {to_jpath(access_path.path)})
-                        if ref is not None and isinstance(ref.key, str):
-                            result = ref.key'''))
-                    result.append(indent(12,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
-            elif isinstance(access_path, AccessPathValueDef):
-                if access_path.multi:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        for ref in get_jpath_multi(obj, {to_jpath(access_path.path)}):
-                            if isinstance(ref.value, str):
-                                result = ref.value'''))
-                    result.append(indent(16,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
+        self.make_access_paths_search(
+            property.access_paths, parent_names, 'Iterator[str]', target_path)
+
+    def make_extract(self, model: RootDef, target_path: str):
+        class_name = upper_camel_case(model.name)
+        paths: List[List[Union[str, int]]] = []
+        modes: List[str] = []  # Only the used parts of the matches
+        fields: List[str] = []
+        body: List[str] = []
+
+        # Identifier
+        fields.append('identifier: Optional[str]')
+        body.append('identifier: Optional[str] = None')
+        process = self.processing.get(('identifier', 0))
+        if isinstance(model.identifier, FilePathIdentifierDef):
+            body.append(unindent(12, '''\
+            for result in (
+                    (item_path.as_posix(),) if item_path is not None else ()):'''))
+            if process is not None:
+                body.append(unindent(12, f'''\
+                result = {process}(result)
+                if result is None:
+                    continue'''))
+            body.append('    identifier = result\n    break')
+        else:
+            body.append(f'for result in found[{len(paths)}]:')
+            body.append(indent(4, make_string_access(
+                'result', process, 'identifier = {}\nbreak')))
+            paths.append(model.identifier.path)
+            modes.append(access_mode(access_attr(model.identifier)))
+
+        # Properties
+        for flat_property in flatten_properties(model.properties):
+            property = flat_property.property
+            field_name = '__'.join(property.parent_path[1:] + [property.name])
+            if isinstance(property.value, AliasMappingDef):
+                field_type = 'List[Tuple[str, str]]'
+            else:
+                field_type = 'List[str]'
+            fields.append(f'{field_name}: {field_type}')
+            body.append(f'{field_name}: {field_type} = []')
+            n_access_paths = len(property.value.access_paths)
+            for i, access_path in enumerate(flat_property.access_paths):
+                # The flat access paths are repeated for every path of the
+                # parent property
+                process = self.processing.get((field_name, i % n_access_paths))
+                emit = f'{field_name}.append({{}})'
+                attr = access_attr(access_path)
+                if attr is None:
+                    body.append(f'for key, value in found[{len(paths)}]:')
+                    body.append(indent(4, make_pair_access(process, emit)))
                 else:
-                    result.append(unindent(16, f'''\
-                    for obj in objects:
-                        ref = get_jpath_single(obj, {to_jpath(access_path.path)})
-                        if isinstance(ref.value, str):
-                            result = ref.value'''))
-                    result.append(indent(12,
-                        make_value_processing('result', access_path.processing) +
-                        '\nyield result\n'
-                    ))
+                    body.append(f'for result in found[{len(paths)}]:')
+                    body.append(indent(4, make_string_access(
+                        'result', process, emit)))
+                paths.append(access_path.path)
+                modes.append(access_mode(attr))
+
+        field_names = [f.split(':')[0] for f in fields]
+        constants = [
+            'EXTRACT_JPATHS = compile_jpath_trie([' +
+            ''.join(f'\n    {to_jpath(p)},' for p in paths) + '\n], [' +
+            ''.join(f'\n    {m},' for m in modes) + '\n])']
+        result: List[str] = []
+        result.append(f'class {class_name}(NamedTuple):')
+        result.append(indent(4, '\n'.join(fields)))
+        result.append('\n')
+        result.append(unindent(8, f'''\
+        def extract(obj: Json, item_path: Optional[Path] = None) -> {class_name}:
+            \'\'\'
+            Returns the identifier and all of the properties of the object
+            using a single traversal of its JSON paths.
+            \'\'\'
+            found = EXTRACT_JPATHS.find_all(obj)'''))
+        result.append(indent(4, '\n'.join(body)))
+        result.append(f'    return {class_name}(')
+        result.append(indent(8, ',\n'.join(field_names) + ')\n'))
+        result.append('')
+        result.append(unindent(8, f'''\
+        def extract_file(item_path: Path) -> List[Tuple[ObjectPath, {class_name}]]:
+            \'\'\'
+            Returns the paths and the extracted data of all objects from the
+            file.
+            \'\'\'
+            try:
+                data = load_json_file(item_path)
+            except:
+                return []
+            return extract_document(data, item_path)
+        '''))
+        result.append('')
+        result.append(unindent(8, f'''\
+        def extract_document(
+                data: Any, item_path: Optional[Path] = None
+                ) -> List[Tuple[ObjectPath, {class_name}]]:
+            \'\'\'
+            Returns the paths and the extracted data of all objects from the
+            parsed content of a file.
+            \'\'\'
+            return [
+                (object_path, extract(obj, item_path))
+                for object_path, obj in OBJECTS_JPATH.find_all_paths(Json(None, data))]
+        '''))
+        result.append('')
+        result.append(unindent(8, f'''\
+        async def aiter_extract_files(
+                paths: PathSource, max_in_flight: int = 16
+                ) -> AsyncIterator[Tuple[Path, List[Tuple[ObjectPath, {class_name}]]]]:
+            \'\'\'
+            The asynchronous equivalent of calling extract_file() for every path.
+            The files are read in worker threads (at most max_in_flight at a time)
+            and parsed as soon as the consumer asks for their results.
+            \'\'\'
+            from .aio import read_files
+            async for item_path, content in read_files(paths, max_in_flight):
+                if content is None:
+                    yield item_path, []
+                    continue
+                try:
+                    data = loads_json(content)
+                except:
+                    yield item_path, []
+                    continue
+                yield item_path, extract_document(data, item_path)
+        '''))
+        if model.multi:
+            result.append('')
+            result.append(unindent(12, f'''\
+            def stream_extract_file(
+                    item_path: Path) -> Iterator[Tuple[ObjectPath, {class_name}]]:
+                \'\'\'
+                The equivalent of extract_file() that parses the file
+                incrementally and keeps only one object in memory at a time.
+                \'\'\'
+                from .jstream import stream_file
+                try:
+                    for object_path, obj in stream_file(item_path, OBJECTS_JPATH):
+                        yield object_path, extract(obj, item_path)
+                except (OSError, ValueError):
+                    return
+            '''))
+        self.files[target_path].append(join_chunk(constants, result))
+
+    def make_profiling(self, target_path: str):
+        self.files[target_path].append(unindent(8, '''\
+        def enable_profiling(collector: Optional[Collector] = None) -> Collector:
+            \'\'\'
+            Replaces the functions of this module with the instrumented ones
+            that record their statistics in the collector (see profiling.py).
+            \'\'\'
+            from .profiling import instrument_namespace
+            return instrument_namespace(globals(), collector)
+
+
+        def disable_profiling():
+            \'\'\'
+            Restores the original (not instrumented) functions of this module.
+            \'\'\'
+            from .profiling import restore_namespace
+            restore_namespace(globals())
+        ''', ignore_errors=True))
+
+    def make_registry(self, names: List[str], target_path: str):
+        '''
+        Generates the registry of the modules of the models (imported on
+        the first use).
+        '''
+        names = sorted(names)
+        result: List[str] = []
+        result.append('from .registry import ModelRegistry\n\n')
+        result.append('MODELS = ModelRegistry(__package__, [')
+        for name in names:
+            result.append(f'    "{name}",')
+        result.append('])\n')
         self.files[target_path].append('\n'.join(result))
 
 # MAIN
+OUTPUT_PATH = Path('python/src/bedrock_example')
+MODELS_PATH = Path('../models')
+# The hashes of the inputs and the outputs of the last generation (not
+# committed, removing it regenerates all of the modules)
+MANIFEST_PATH = Path('python/.codegen.json')
+# Trailing whitespace of the generated lines
+TRAILING_WHITESPACE = re.compile(r'[ \t\r\f\v]+$', re.MULTILINE)
+
+def generator_hash() -> str:
+    '''
+    Returns the hash of the source code of the generator (any change in the
+    generator invalidates all of the generated modules).
+    '''
+    h = hashlib.sha256()
+    for name in ('python.py', 'generator_tools.py', 'processing.py'):
+        h.update(Path(__file__).with_name(name).read_bytes())
+    return h.hexdigest()
+
+def file_hash(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+def write_atomic(path: Path, text: str) -> bool:
+    '''
+    Writes the text to the file if its content is different and returns
+    whether the file has been written. The text is written to a temporary
+    file first and then moved in place, so the file is never incomplete.
+    '''
+    data = text.encode('utf-8')
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(exist_ok=True, parents=True)
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return True
+
 def main():
+    parser = argparse.ArgumentParser(
+        description='Generates the Python modules from the models. Only the '
+        'modules of the changed models are generated.')
+    parser.add_argument(
+        '--check', action='store_true',
+        help='report the outputs that are out of date without writing them '
+        '(exits with status 1 if there are any)')
+    parser.add_argument(
+        '--force', action='store_true',
+        help='generate all of the modules')
+    args = parser.parse_args()
+
+    # The modules used only by some of the functions (streaming, asyncio
+    # and profiling) are imported by the functions that use them
     file_header = unindent(4, '''\
     # AUTOGENERATED! DON'T EDIT!
+    from __future__ import annotations
+    from typing import TYPE_CHECKING
     from .jpath import *
-    ''')
+    from .registry import PropertyInfo
+    from .scanner import compile_globs
 
-    models_path = Path('../models')
-    models: List[RootDef] = load_models(models_path)
+    if TYPE_CHECKING:
+        from .aio import AsyncIterator, PathSource
+        from .profiling import Collector
+    ''', ignore_errors=True)
+    # The registry doesn't use any of the functions of the generated modules
+    headers = {'models.py': "# AUTOGENERATED! DON'T EDIT!"}
+
+    try:
+        manifest = json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    generator_key = generator_hash()
+    model_paths = sorted(MODELS_PATH.glob('*.json'))
+
+    # The models whose definitions, generator or generated modules changed
+    # since the last generation
+    input_hashes: Dict[str, str] = {}
+    models: List[RootDef] = []
+    for model_path in model_paths:
+        input_hash = hashlib.sha256(
+            generator_key.encode() + model_path.read_bytes()).hexdigest()
+        input_hashes[model_path.stem] = input_hash
+        previous = manifest.get(model_path.stem)
+        if (
+                not args.force and previous is not None and
+                previous['input'] == input_hash and
+                previous['output'] == file_hash(
+                    OUTPUT_PATH / f'{model_path.stem}.py')):
+            continue
+        models.append(load_model(model_path))
 
     generator = PyIteratorsGenerator()
     generator.generate(models)
+    generator.make_registry([p.stem for p in model_paths], 'models.py')
+    changed: List[Path] = []
+    new_manifest = {
+        name: entry for name, entry in manifest.items()
+        if name in input_hashes}
     for k, v in generator.files.items():
-        k = Path('python/src/bedrock_example') / k
-        k.parent.mkdir(exist_ok=True, parents=True)
-        text = '\n\n'.join([file_header] + v)
-
-        # Very inefficient way of removing trailing spaces
-        striptext = []
-        for i in text.split('\n'):
-            striptext.append(i.rstrip())
-        text = '\n'.join(striptext)
-        with k.open('w') as f:
-            f.write(text)
+        path = OUTPUT_PATH / k
+        text = TRAILING_WHITESPACE.sub('', '\n\n'.join(
+            [headers.get(k, file_header)] + v))
+        if args.check:
+            if file_hash(path) != hashlib.sha256(text.encode('utf-8')).hexdigest():
+                changed.append(path)
+            continue
+        if write_atomic(path, text):
+            changed.append(path)
+        name = Path(k).stem
+        if name in input_hashes:
+            new_manifest[name] = {
+                'input': input_hashes[name],
+                'output': hashlib.sha256(text.encode('utf-8')).hexdigest()}
+
+    if args.check:
+        for path in changed:
+            print(f'Out of date: {path}')
+        if len(changed) > 0:
+            sys.exit(1)
+        return
+    write_atomic(MANIFEST_PATH, json.dumps(new_manifest, indent=4, sort_keys=True))
+    print(
+        f'Generated {len(models)} of {len(model_paths)} models, '
+        f'{len(changed)} file(s) changed')
+    for path in changed:
+        print(f'    {path}')
 
 if __name__ == '__main__':
     main()
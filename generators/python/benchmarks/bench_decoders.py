@@ -0,0 +1,66 @@
+'''
+Benchmark of the JSON decoders registered in jpath on the local corpus
+(all of the *.json files in the given directories). Reports which decoder
+is the fastest and compares reading the files in text mode with
+load_json_file.
+
+Usage:
+    python bench_decoders.py PACK_PATH [PACK_PATH ...] [--repeat N]
+'''
+from typing import Callable, List
+from pathlib import Path
+import argparse
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+from bedrock_example.jpath import (
+    benchmark_decoders, get_decoder, load_json_file)
+
+def text_load(path: Path):
+    '''
+    Reading the file in text mode (the way the files were read before).
+    '''
+    with path.open('r', encoding='utf-8-sig') as f:
+        return json.load(f)
+
+def measure(f: Callable, paths: List[Path], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for p in paths:
+            try:
+                f(p)
+            except ValueError:
+                pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('paths', type=Path, nargs='+')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    paths = sorted(p for root in args.paths for p in root.glob('**/*.json'))
+    size = sum(p.stat().st_size for p in paths)
+    print(f'{len(paths)} files, {size / (1 << 20):.2f} MiB')
+
+    print('Decoders (parsing files already loaded into the memory):')
+    results = benchmark_decoders(paths, args.repeat)
+    for name, t in results:
+        print(f'    {name:30} {t * 1000:9.2f} ms {t / results[0][1]:6.2f}x')
+    if len(results) > 0:
+        print(f'The fastest decoder: {results[0][0]}')
+
+    print(f'Reading and parsing (decoder: {get_decoder()}):')
+    baseline = measure(text_load, paths, args.repeat)
+    for name, f in (
+            ('text mode + json.load', text_load),
+            ('load_json_file', load_json_file)):
+        t = baseline if f is text_load else measure(f, paths, args.repeat)
+        print(f'    {name:30} {t * 1000:9.2f} ms {t / baseline:6.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+'''
+Benchmark of the runtime interpreter of the models (generators/interpreter.py)
+compared with the generated modules on a synthetic resource pack (see
+corpus.py). The files are parsed once, so the times include only the work
+done by the models (extracting the data, searching for the identifiers and
+the properties). Checks that the interpreter returns the same results
+before measuring.
+
+Exits with status 1 if the interpreter is slower than max_slowdown times
+the generated modules (in total).
+
+Usage:
+    python bench_interpreter.py [--size N] [--seed N] [--corpus PATH]
+        [--repeat N] [--max-slowdown X]
+'''
+from typing import Any, Callable, Dict, List, Tuple
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+
+GENERATORS_PATH = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(GENERATORS_PATH / 'python' / 'src'))
+sys.path.insert(0, str(GENERATORS_PATH))
+from bedrock_example.jpath import load_json_file
+from bedrock_example.models import MODELS
+from interpreter import load_plans
+from corpus import generate_corpus
+
+def measure(f: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def consume(iterator) -> None:
+    for _ in iterator:
+        pass
+
+def workloads(
+        model, objects: List[Any], identifier_items: List[Any],
+        documents: List[Tuple[Path, Any]]) -> Dict[str, Callable[[], object]]:
+    '''
+    Returns the measured functions of the model (a generated module or an
+    interpreted plan).
+    '''
+    result: Dict[str, Callable[[], object]] = {
+        'extract_document': lambda: [
+            model.extract_document(data, path) for path, data in documents],
+        'iter_identifiers': lambda: consume(
+            model.iter_identifiers(identifier_items)),
+    }
+    for name in model.PROPERTIES:
+        result[f'iter_{name}'] = (
+            lambda f=getattr(model, f'iter_{name}'): consume(f(objects)))
+    return result
+
+def verify(module, plan, documents: List[Tuple[Path, Any]]):
+    for path, data in documents:
+        expected = [
+            (p, tuple(d)) for p, d in module.extract_document(data, path)]
+        actual = [(p, tuple(d)) for p, d in plan.extract_document(data, path)]
+        if expected != actual:
+            raise AssertionError(
+                f'Different results of {module.NAME} for {path}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--corpus', type=Path, default=None,
+        help='the directory of the corpus (generated if it doesn\'t exist)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-slowdown', type=float, default=1.15)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    plans = load_plans(GENERATORS_PATH.parent / 'models')
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    load_plans(GENERATORS_PATH.parent / 'models')
+    cached_time = time.perf_counter() - start
+    print(
+        f'Compiling the plans: {compile_time * 1000:.2f} ms '
+        f'(cached: {cached_time * 1000:.2f} ms)')
+
+    generated_total = 0.0
+    interpreted_total = 0.0
+    with tempfile.TemporaryDirectory() as temp_path:
+        pack_path = args.corpus
+        if pack_path is None:
+            pack_path = Path(temp_path)
+        if not pack_path.exists() or not any(pack_path.iterdir()):
+            print(f'Generating the corpus: {pack_path}')
+            counts = generate_corpus(pack_path, args.size, args.seed)
+            print(f'    {counts}')
+        print(f'{"":60} {"generated":>12} {"interpreted":>12}')
+        for model_name, module in MODELS.items():
+            plan = plans[model_name]
+            paths = list(module.iter_files([pack_path]))
+            documents = []
+            for path in paths:
+                try:
+                    documents.append((path, load_json_file(path)))
+                except:
+                    continue
+            verify(module, plan, documents)
+            objects = [o for o in module.iter_objects(paths) if o is not None]
+            # The identifiers of some models are the paths of the files
+            identifier_items = (
+                paths if plan.file_path_identifier else objects)
+            generated = workloads(module, objects, identifier_items, documents)
+            interpreted = workloads(plan, objects, identifier_items, documents)
+            for name, f in generated.items():
+                generated_time = measure(f, args.repeat)
+                interpreted_time = measure(interpreted[name], args.repeat)
+                generated_total += generated_time
+                interpreted_total += interpreted_time
+                print(
+                    f'{model_name + "." + name:60} '
+                    f'{generated_time * 1000:9.2f} ms '
+                    f'{interpreted_time * 1000:9.2f} ms')
+
+    ratio = interpreted_total / generated_total if generated_total > 0 else 1.0
+    print(
+        f'{"total":60} {generated_total * 1000:9.2f} ms '
+        f'{interpreted_total * 1000:9.2f} ms ({ratio:.2f}x)')
+    if ratio > args.max_slowdown:
+        print(f'The interpreter is slower than {args.max_slowdown:.2f}x')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
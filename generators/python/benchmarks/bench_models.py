@@ -0,0 +1,149 @@
+'''
+Benchmark of the generated modules on a synthetic resource pack (see
+corpus.py). Measures searching for the files, loading the objects and
+every identifier and property function of every model. The results are
+saved as JSON and can be compared with the results of a previous run.
+
+Usage:
+    python bench_models.py [--size N] [--seed N] [--corpus PATH]
+        [--repeat N] [--output FILE] [--baseline FILE] [--max-slowdown X]
+'''
+from typing import Callable, Dict, List
+from pathlib import Path
+import argparse
+import inspect
+import json
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+from bedrock_example import VERSION
+from bedrock_example.jpath import get_decoder, set_document_cache_size
+from bedrock_example.models import MODELS
+from corpus import generate_corpus
+
+# The functions that aren't the property functions of the models
+_NOT_PROPERTIES = {'iter_files', 'iter_objects', 'iter_stream_objects'}
+
+def measure(f: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def consume(iterator) -> None:
+    for _ in iterator:
+        pass
+
+def benchmark_model(module, pack_path: Path, repeat: int) -> Dict[str, float]:
+    '''
+    Returns the times of the functions of the generated module. The
+    objects and the paths are loaded once and reused by the functions that
+    work on them, so the times don't include loading the files.
+    '''
+    results = {}
+    paths = list(module.iter_files([pack_path]))
+    results['iter_files'] = measure(
+        lambda: consume(module.iter_files([pack_path])), repeat)
+    results['iter_objects'] = measure(
+        lambda: consume(module.iter_objects(paths)), repeat)
+    objects = [o for o in module.iter_objects(paths) if o is not None]
+    for name, f in sorted(vars(module).items()):
+        if not name.startswith('iter_') or name in _NOT_PROPERTIES:
+            continue
+        if not inspect.isfunction(f):
+            continue
+        parameters = list(inspect.signature(f).parameters)
+        if parameters[:1] == ['objects']:
+            results[name] = measure(
+                lambda f=f: consume(f(objects)), repeat)
+        elif parameters[:1] == ['paths']:
+            results[name] = measure(lambda f=f: consume(f(paths)), repeat)
+    results['extract_file'] = measure(
+        lambda: [module.extract_file(p) for p in paths], repeat)
+    return results
+
+def compare(
+        results: Dict[str, float], baseline: Dict[str, float],
+        max_slowdown: float) -> List[str]:
+    '''
+    Prints the results compared with the baseline and returns the names of
+    the measurements that are slower than max_slowdown times the baseline.
+    '''
+    regressions = []
+    for name, t in results.items():
+        if name not in baseline:
+            print(f'{name:60} {t * 1000:9.2f} ms (new)')
+            continue
+        ratio = t / baseline[name] if baseline[name] > 0 else 1.0
+        flag = ''
+        if ratio > max_slowdown:
+            regressions.append(name)
+            flag = ' REGRESSION'
+        print(f'{name:60} {t * 1000:9.2f} ms {ratio:6.2f}x{flag}')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--corpus', type=Path, default=None,
+        help='the directory of the corpus (generated if it doesn\'t exist)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', type=Path, default=None)
+    parser.add_argument('--baseline', type=Path, default=None)
+    parser.add_argument('--max-slowdown', type=float, default=1.25)
+    args = parser.parse_args()
+
+    # Every repeat must parse the files again
+    set_document_cache_size(0)
+    with tempfile.TemporaryDirectory() as temp_path:
+        pack_path = args.corpus
+        if pack_path is None:
+            pack_path = Path(temp_path)
+        if not pack_path.exists() or not any(pack_path.iterdir()):
+            print(f'Generating the corpus: {pack_path}')
+            counts = generate_corpus(pack_path, args.size, args.seed)
+            print(f'    {counts}')
+        results = {}
+        for model_name, module in MODELS.items():
+            for name, t in benchmark_model(
+                    module, pack_path, args.repeat).items():
+                results[f'{model_name}.{name}'] = t
+
+    report = {
+        'metadata': {
+            'size': args.size,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'version': VERSION,
+            'decoder': get_decoder(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+    if args.baseline is None:
+        for name, t in results.items():
+            print(f'{name:60} {t * 1000:9.2f} ms')
+        return
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    for key in ('size', 'seed'):
+        if baseline['metadata'].get(key) != report['metadata'][key]:
+            print(f'Warning: different {key} than in the baseline')
+    regressions = compare(results, baseline['results'], args.max_slowdown)
+    if len(regressions) > 0:
+        print(f'{len(regressions)} regression(s)')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
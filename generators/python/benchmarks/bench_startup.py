@@ -0,0 +1,126 @@
+'''
+Benchmark of the import time of the package (python -X importtime). Every
+scenario imports a part of the package in a new interpreter. The time of a
+scenario is the best cumulative import time of the imported modules from
+the repeated runs. The slowest modules (by their own import time) are
+listed for every scenario.
+
+Exits with status 1 if any scenario is slower than its budget (in
+milliseconds, scaled with --budget-scale for slower machines).
+
+Usage:
+    python bench_startup.py [--repeat N] [--top N] [--budget-scale X]
+        [--output FILE]
+'''
+from typing import Dict, List, Tuple
+from pathlib import Path
+import argparse
+import compileall
+import json
+import os
+import platform
+import subprocess
+import sys
+
+SRC_PATH = Path(__file__).resolve().parents[1] / 'src'
+
+# The imported code and the budget of its import time (in milliseconds)
+SCENARIOS: Dict[str, Tuple[str, float]] = {
+    'package': ('import bedrock_example', 5.0),
+    'registry': ('from bedrock_example.models import MODELS', 45.0),
+    'one model': ('from bedrock_example import client_entity', 45.0),
+    'all models': (
+        'from bedrock_example.models import MODELS\n'
+        'for name in MODELS: MODELS[name]', 50.0),
+    'pack index': ('import bedrock_example.pack_index', 60.0),
+}
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    '''
+    Returns the names, the own and the cumulative import times (in
+    microseconds) of the top-level imports from the output of
+    python -X importtime.
+    '''
+    result: List[Tuple[str, int, int]] = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        if not self_time.strip().isdigit():
+            continue  # The header
+        result.append((name.rstrip(), int(self_time), int(cumulative)))
+    return result
+
+def run(code: str) -> List[Tuple[str, int, int]]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [str(SRC_PATH)] + env.get('PYTHONPATH', '').split(os.pathsep))
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], env=env,
+        capture_output=True, text=True, check=True)
+    return parse_importtime(process.stderr)
+
+def measure(code: str, repeat: int) -> Tuple[float, List[Tuple[str, int]]]:
+    '''
+    Returns the best total import time of the modules imported by the code
+    (in milliseconds, without the modules imported at the startup of the
+    interpreter) and the own times of the modules from the best run.
+    '''
+    baseline = {name.strip() for name, _, _ in run('pass')}
+    best = float('inf')
+    best_modules: List[Tuple[str, int]] = []
+    for _ in range(repeat):
+        imports = [
+            i for i in run(code) if i[0].strip() not in baseline]
+        # The top-level imports include the time of their dependencies
+        total = sum(
+            cumulative for name, _, cumulative in imports
+            if not name.startswith(' ' * 3)) / 1000
+        if total < best:
+            best = total
+            best_modules = [(name.strip(), t) for name, t, _ in imports]
+    return best, best_modules
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--budget-scale', type=float, default=1.0)
+    parser.add_argument('--output', type=Path, default=None)
+    args = parser.parse_args()
+
+    # Compile the bytecode first, so it isn't measured (also if writing
+    # of the bytecode is disabled with PYTHONDONTWRITEBYTECODE)
+    compileall.compile_dir(
+        str(SRC_PATH / 'bedrock_example'), quiet=1, force=False)
+    results: Dict[str, float] = {}
+    over_budget: List[str] = []
+    for name, (code, budget) in SCENARIOS.items():
+        total, modules = measure(code, args.repeat)
+        budget *= args.budget_scale
+        results[name] = total
+        flag = ''
+        if total > budget:
+            over_budget.append(name)
+            flag = ' OVER BUDGET'
+        print(f'{name:20} {total:8.2f} ms (budget {budget:.0f} ms){flag}')
+        modules.sort(key=lambda m: m[1], reverse=True)
+        for module, t in modules[:args.top]:
+            print(f'    {module:40} {t / 1000:8.2f} ms')
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({
+            'metadata': {
+                'repeat': args.repeat,
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'platform': platform.platform(),
+            },
+            'results': results,
+        }, indent=2), encoding='utf-8')
+    if len(over_budget) > 0:
+        print(f'{len(over_budget)} scenario(s) over the budget')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+'''
+Benchmark of the parser of Bedrock JSON files (loads_json) on vanilla-style
+client entity files with comments and trailing commas (in many places or
+only in the header of the file).
+
+Usage:
+    python bench_tolerant_json.py [--files N] [--repeat N]
+'''
+from typing import Callable, List
+from pathlib import Path
+import argparse
+import json
+import re
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+from bedrock_example.jpath import loads_json
+
+def make_entity(i: int, comments: bool) -> str:
+    c = (lambda text: f'// {text}') if comments else (lambda text: '')
+    trailing = ',' if comments else ''
+    animations = '\n'.join(
+        f'        "anim_{j}": "animation.mob_{i}.anim_{j}"'
+        f'{"," if j < 11 else trailing} {c("animation")}'
+        for j in range(12))
+    return f'''{{
+    {c("Generated entity")}
+    "format_version": "1.10.0",
+    "minecraft:client_entity": {{
+        "description": {{
+            "identifier": "minecraft:mob_{i}",
+            {"/* materials */" if comments else ""}
+            "materials": {{"default": "mob"}},
+            "textures": {{"default": "textures/entity/mob_{i}"}},
+            "geometry": {{"default": "geometry.mob_{i}"}},
+            "animations": {{
+{animations}
+            }},
+            "scripts": {{
+                "animate": ["anim_0", {{"anim_1": "q.is_moving"}}]{trailing}
+            }},
+            "render_controllers": ["controller.render.mob"]{trailing}
+        }}
+    }}
+}}'''
+
+_COMMENTS = re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL)
+_TRAILING_COMMAS = re.compile(r',(\s*[\]}])')
+
+def naive_loads(data: str):
+    '''
+    The usual workaround: a failed strict parse, regex stripping in two
+    passes (that doesn't respect strings) and parsing again.
+    '''
+    try:
+        return json.loads(data)
+    except json.JSONDecodeError:
+        pass
+    data = _COMMENTS.sub('', data)
+    data = _TRAILING_COMMAS.sub(r'\1', data)
+    return json.loads(data)
+
+def measure(f: Callable, documents: List[str], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for d in documents:
+            f(d)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    strict = [make_entity(i, False) for i in range(args.files)]
+    commented = [make_entity(i, True) for i in range(args.files)]
+    headed = [f'// Entity {i}\n{d}' for i, d in enumerate(strict)]
+    expected = [json.loads(d) for d in strict]
+    assert [loads_json(d) for d in commented] == expected
+    assert [loads_json(d) for d in headed] == expected
+
+    baseline = measure(json.loads, strict, args.repeat)
+    results = {
+        'json.loads (strict files)': baseline,
+        'loads_json (strict files)': measure(loads_json, strict, args.repeat),
+        'loads_json (commented files)': measure(
+            loads_json, commented, args.repeat),
+        'naive regex stripping (commented files)': measure(
+            naive_loads, commented, args.repeat),
+        'loads_json (header comment)': measure(
+            loads_json, headed, args.repeat),
+        'naive regex stripping (header comment)': measure(
+            naive_loads, headed, args.repeat),
+    }
+    for name, t in results.items():
+        print(f'{name:42} {t * 1000:9.2f} ms {t / baseline:6.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+'''
+Generator of synthetic resource packs for the benchmarks. The packs have
+the same structure as the vanilla resource pack (the directories, nesting of
+the JSON files and references between the objects) and are fully
+determined by the size and the seed.
+
+Usage:
+    python corpus.py OUTPUT_PATH [--size N] [--seed N]
+'''
+from typing import Any, Dict, List
+from pathlib import Path
+import argparse
+import json
+import random
+
+# The share of the files of every type in the pack (the sound definitions
+# are stored in a single file)
+_SHARES = {
+    'entity': 0.3,
+    'animations': 0.3,
+    'animation_controllers': 0.2,
+    'particles': 0.2,
+}
+
+# The share of the files with comments and trailing commas
+COMMENTED_FILES = 0.05
+
+def _dump(rng: random.Random, data: Any) -> str:
+    text = json.dumps(data, indent='\t')
+    if rng.random() >= COMMENTED_FILES:
+        return text
+    # Add the syntax that Bedrock accepts but json.loads doesn't
+    lines = text.split('\n')
+    lines.insert(1, '\t// Generated for the benchmarks')
+    return '\n'.join(
+        line + ',' if line.endswith(('"', ']', '}')) and
+        next_line.strip() in ('}', ']') else line
+        for line, next_line in zip(lines, lines[1:] + ['']))
+
+def _groups(rng: random.Random, count: int, max_depth: int) -> List[str]:
+    '''
+    Returns the directories for the files (some of them nested).
+    '''
+    groups = ['']
+    for i in range(max(1, count // 50)):
+        depth = rng.randint(1, max_depth)
+        groups.append('/'.join(f'group_{i}_{d}' for d in range(depth)) + '/')
+    return groups
+
+class CorpusGenerator:
+    '''
+    Builds the objects of a synthetic resource pack. The identifiers are
+    generated first so that the objects can reference each other.
+    '''
+    def __init__(self, size: int, seed: int):
+        self.rng = random.Random(seed)
+        self.counts = {
+            name: max(1, round(size * share))
+            for name, share in _SHARES.items()}
+        n_entities = self.counts['entity']
+        self.particles = [
+            f'minecraft:particle_{i}' for i in range(self.counts['particles'])]
+        self.sounds = [f'mob.mob_{i}.{s}' for i in range(n_entities) for s in (
+            'say', 'hurt', 'death', 'step')]
+        # Animations and controllers are grouped by entity
+        self.animations: List[List[str]] = [[] for _ in range(n_entities)]
+        self.controllers: List[List[str]] = [[] for _ in range(n_entities)]
+
+    def particle(self, i: int) -> Dict:
+        rng = self.rng
+        return {
+            'format_version': '1.10.0',
+            'particle_effect': {
+                'description': {
+                    'identifier': self.particles[i],
+                    'basic_render_parameters': {
+                        'material': 'particles_alpha',
+                        'texture': f'textures/particle/particle_{i}'}},
+                'components': {
+                    'minecraft:emitter_rate_instant': {
+                        'num_particles': rng.randint(1, 20)},
+                    'minecraft:emitter_lifetime_once': {
+                        'active_time': rng.random()},
+                    'minecraft:particle_appearance_billboard': {
+                        'size': [rng.random(), rng.random()],
+                        'facing_camera_mode': 'rotate_xyz',
+                        'uv': {
+                            'texture_width': 128, 'texture_height': 128,
+                            'uv': [rng.randint(0, 64), rng.randint(0, 64)],
+                            'uv_size': [8, 8]}}}}}
+
+    def animation_file(self, i: int) -> Dict:
+        rng = self.rng
+        entity = i % len(self.animations)
+        animations: Dict[str, Any] = {}
+        for j in range(rng.randint(1, 4)):
+            identifier = f'animation.mob_{entity}.anim_{i}_{j}'
+            self.animations[entity].append(identifier)
+            bones = {
+                f'bone_{b}': {
+                    'rotation': [
+                        f'math.cos(q.anim_time * {rng.randint(1, 400)}) * 20',
+                        0, 0]}
+                for b in range(rng.randint(1, 6))}
+            animation: Dict[str, Any] = {
+                'loop': rng.random() < 0.5,
+                'animation_length': round(rng.random() * 4, 2),
+                'bones': bones}
+            if rng.random() < 0.3:
+                animation['particle_effects'] = {
+                    str(round(rng.random(), 2)): {
+                        'effect': f'effect_{rng.randrange(4)}',
+                        'locator': 'head'}
+                    for _ in range(rng.randint(1, 3))}
+            if rng.random() < 0.3:
+                animation['sound_effects'] = {
+                    str(round(rng.random(), 2)): (
+                        [{'effect': f'sound_{rng.randrange(4)}'}]
+                        if rng.random() < 0.5
+                        else {'effect': f'sound_{rng.randrange(4)}'})
+                    for _ in range(rng.randint(1, 3))}
+            animations[identifier] = animation
+        return {'format_version': '1.8.0', 'animations': animations}
+
+    def controller_file(self, i: int) -> Dict:
+        rng = self.rng
+        entity = i % len(self.controllers)
+        controllers: Dict[str, Any] = {}
+        for j in range(rng.randint(1, 2)):
+            identifier = f'controller.animation.mob_{entity}.controller_{i}_{j}'
+            self.controllers[entity].append(identifier)
+            n_states = rng.randint(2, 4)
+            states: Dict[str, Any] = {}
+            for s in range(n_states):
+                state: Dict[str, Any] = {
+                    'animations': [
+                        f'anim_{a}' if rng.random() < 0.5
+                        else {f'anim_{a}': 'q.is_moving'}
+                        for a in range(rng.randint(1, 3))],
+                    'transitions': [
+                        {f'state_{(s + 1) % n_states}': 'q.is_on_ground'}]}
+                if rng.random() < 0.3:
+                    state['particle_effects'] = [
+                        {'effect': f'effect_{rng.randrange(4)}'}]
+                if rng.random() < 0.3:
+                    state['sound_effects'] = [
+                        {'effect': f'sound_{rng.randrange(4)}'}]
+                states[f'state_{s}'] = state
+            controllers[identifier] = {
+                'initial_state': 'state_0', 'states': states}
+        return {'format_version': '1.10.0', 'animation_controllers': controllers}
+
+    def entity(self, i: int) -> Dict:
+        rng = self.rng
+        references = self.animations[i] + self.controllers[i]
+        animations = {f'anim_{a}': r for a, r in enumerate(references)}
+        description: Dict[str, Any] = {
+            'identifier': f'minecraft:mob_{i}',
+            'materials': {'default': 'entity_alphatest'},
+            'textures': {'default': f'textures/entity/mob_{i}'},
+            'geometry': {'default': f'geometry.mob_{i}'},
+            'animations': animations,
+            'scripts': {
+                'animate': [
+                    name if rng.random() < 0.5 else {name: 'q.is_moving'}
+                    for name in animations]},
+            'render_controllers': ['controller.render.default']}
+        if rng.random() < 0.5:
+            description['particle_effects'] = {
+                f'effect_{e}': rng.choice(self.particles) for e in range(4)}
+        description['sound_effects'] = {
+            f'sound_{s}': rng.choice(self.sounds) for s in range(4)}
+        return {
+            'format_version': '1.10.0',
+            'minecraft:client_entity': {'description': description}}
+
+    def sound_definitions(self) -> Dict:
+        rng = self.rng
+        return {
+            'format_version': '1.14.0',
+            'sound_definitions': {
+                sound: {
+                    'category': 'neutral',
+                    'sounds': [
+                        {'name': f'sounds/{sound.replace(".", "/")}{k}',
+                         'volume': round(rng.random(), 2)}
+                        for k in range(rng.randint(1, 4))]}
+                for sound in self.sounds}}
+
+    def write(self, pack_path: Path) -> Dict[str, int]:
+        '''
+        Writes the pack and returns the number of files of every type.
+        '''
+        rng = self.rng
+        files: Dict[str, Any] = {}
+        # The animations and controllers must be generated before the
+        # entities that reference them
+        for directory, count, make in (
+                ('particles', self.counts['particles'], self.particle),
+                ('animations', self.counts['animations'], self.animation_file),
+                (
+                    'animation_controllers',
+                    self.counts['animation_controllers'],
+                    self.controller_file),
+                ('entity', self.counts['entity'], self.entity)):
+            groups = _groups(rng, count, 3)
+            for i in range(count):
+                path = f'{directory}/{rng.choice(groups)}{directory}_{i}.json'
+                files[path] = make(i)
+        files['sounds/sound_definitions.json'] = self.sound_definitions()
+        for path, data in files.items():
+            full_path = pack_path / path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            full_path.write_text(_dump(rng, data), encoding='utf-8')
+        return dict(self.counts, sound_definitions=len(self.sounds))
+
+def generate_corpus(pack_path: Path, size: int, seed: int) -> Dict[str, int]:
+    '''
+    Writes a synthetic resource pack with the given number of files (not
+    counting the sound definitions file) and returns the number of files of
+    every type.
+    '''
+    return CorpusGenerator(size, seed).write(pack_path)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('output', type=Path)
+    parser.add_argument('--size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(generate_corpus(args.output, args.size, args.seed))
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,29 @@
 # This is the fil is NOT autogenerated
 VERSION = (1, 0)
-__version__ = '.'.join([str(x) for x in VERSION])
\ No newline at end of file
+__version__ = '.'.join([str(x) for x in VERSION])
+
+def __getattr__(name: str):
+    '''
+    Imports the submodules (for example the modules of the models) and
+    MODELS when they're used for the first time, so importing the package
+    doesn't import any of them:
+
+        import bedrock_example
+        bedrock_example.client_entity.files(...)
+    '''
+    if name == 'MODELS':
+        from .models import MODELS
+        return MODELS
+    if name.startswith('__'):
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    import importlib
+    try:
+        return importlib.import_module(f'{__name__}.{name}')
+    except ModuleNotFoundError as e:
+        if e.name != f'{__name__}.{name}':
+            raise
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    from .models import MODELS
+    return sorted(set(globals()) | {'MODELS'} | set(MODELS))
@@ -0,0 +1,92 @@
+# This file is NOT autogenerated
+from typing import (
+    Tuple, List, Deque, Iterator, Iterable, AsyncIterator, AsyncIterable,
+    Optional, Union, TypeVar)
+from pathlib import Path
+from collections import deque
+# asyncio and concurrent.futures are imported by the functions that use
+# them (importing them takes longer than importing the rest of the package)
+
+T = TypeVar('T')
+PathSource = Union[Iterable[Path], AsyncIterable[Path]]
+
+def _read_file(path: Path) -> Optional[bytes]:
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+def _next_batch(iterator: Iterator[T], batch_size: int) -> List[T]:
+    batch: List[T] = []
+    for item in iterator:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            break
+    return batch
+
+async def iterate_in_thread(
+        iterable: Iterable[T], batch_size: int = 64) -> AsyncIterator[T]:
+    '''
+    Runs the blocking iterable (for example a directory walk) in a worker
+    thread and yields its items without blocking the event loop. The items
+    are produced in batches, only when the consumer asks for them.
+    '''
+    import asyncio
+    iterator = iter(iterable)
+    while True:
+        batch = await asyncio.to_thread(_next_batch, iterator, batch_size)
+        if len(batch) == 0:
+            return
+        for item in batch:
+            yield item
+
+async def read_files(
+        paths: PathSource, max_in_flight: int = 16
+        ) -> AsyncIterator[Tuple[Path, Optional[bytes]]]:
+    '''
+    Reads the files in worker threads and yields their paths and contents
+    in the same order as the input paths (None if the file can't be read).
+
+    At most max_in_flight files are being read or waiting for the consumer
+    at a time. A new read starts only after the consumer takes a file, so a
+    slow consumer doesn't make the unparsed files pile up in memory.
+    '''
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    loop = asyncio.get_running_loop()
+    # Own pool of threads because the default executor of the event loop
+    # might be smaller than the number of the reads in flight
+    executor = ThreadPoolExecutor(max_in_flight, 'read_files')
+    pending: Deque[Tuple[Path, 'asyncio.Future[Optional[bytes]]']] = deque()
+    if isinstance(paths, AsyncIterable):
+        async_paths: Optional[AsyncIterator[Path]] = paths.__aiter__()
+        sync_paths: Optional[Iterator[Path]] = None
+    else:
+        async_paths = None
+        sync_paths = iter(paths)
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                if async_paths is not None:
+                    try:
+                        path = await async_paths.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                else:
+                    try:
+                        path = next(sync_paths)  # type: ignore
+                    except StopIteration:
+                        exhausted = True
+                        break
+                pending.append(
+                    (path, loop.run_in_executor(executor, _read_file, path)))
+            if len(pending) == 0:
+                return
+            path, future = pending.popleft()
+            yield path, await future
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
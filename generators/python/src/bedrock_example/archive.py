@@ -0,0 +1,188 @@
+# This file is NOT autogenerated
+'''
+Reading of the packs from the zip archives (.mcpack, .mcaddon and .zip)
+without extracting them. The files of the archives are represented by
+ArchivePath objects that can be used in place of the paths of the files
+(by the generated modules, the caches and the indexes). The archives
+inside of other archives (the .mcpack files in .mcaddon) are read into the
+memory.
+'''
+from typing import (
+    NamedTuple, Tuple, List, Dict, Iterator, Optional, BinaryIO, IO)
+from pathlib import Path
+import io
+import os
+import posixpath
+import zipfile
+from .scanner import ARCHIVE_SUFFIXES
+
+class ArchiveStat(NamedTuple):
+    '''
+    The part of os.stat_result used by the caches. The modification time
+    is the time of the archive file and the inode is the CRC of the file.
+    '''
+    st_size: int
+    st_mtime_ns: int
+    st_ino: int
+
+class Archive:
+    '''
+    An opened zip archive. The path is the path of the archive file and the
+    nested are the names of the members with the archives inside of it (if
+    the archive is inside of other archives).
+    '''
+    def __init__(
+            self, path: Path, nested: Tuple[str, ...] = (),
+            file: Optional[BinaryIO] = None):
+        self.path = path
+        self.nested = nested
+        self.mtime_ns = path.stat().st_mtime_ns
+        self.zip = zipfile.ZipFile(path if file is None else file)
+        self.name = '/'.join((path.as_posix(),) + nested)
+        self._infos: Dict[str, zipfile.ZipInfo] = {
+            info.filename: info for info in self.zip.infolist()}
+
+    @staticmethod
+    def open(path: Path, nested: Tuple[str, ...] = ()) -> 'Archive':
+        archive = Archive(path)
+        for name in nested:
+            archive = archive.open_nested(name)
+        return archive
+
+    def open_nested(self, name: str) -> 'Archive':
+        '''
+        Opens the archive stored in the member of this archive (read into
+        the memory).
+        '''
+        return Archive(
+            self.path, self.nested + (name,), io.BytesIO(self.zip.read(name)))
+
+    def names(self) -> List[str]:
+        '''
+        Returns the names of the files (from the central directory).
+        '''
+        return [name for name in self._infos if not name.endswith('/')]
+
+    def info(self, name: str) -> zipfile.ZipInfo:
+        return self._infos[name]
+
+    def pack_roots(self) -> Iterator[Tuple['Archive', str]]:
+        '''
+        Yields the archives and the prefixes of the names of the packs in
+        this archive. The packs are the directories with the manifest.json
+        files and the nested archives. The whole archive is a pack if it has
+        none of them.
+        '''
+        names = self.names()
+        roots = sorted(
+            name[:-len('manifest.json')] for name in names
+            if posixpath.basename(name) == 'manifest.json')
+        # Only the outermost packs
+        prefixes: List[str] = []
+        for root in roots:
+            if not any(root.startswith(p) for p in prefixes):
+                prefixes.append(root)
+        nested = [
+            name for name in names
+            if os.path.splitext(name)[1].lower() in ARCHIVE_SUFFIXES and
+            not any(name.startswith(p) for p in prefixes)]
+        if len(prefixes) == 0 and len(nested) == 0:
+            prefixes.append('')
+        for prefix in prefixes:
+            yield self, prefix
+        for name in nested:
+            try:
+                archive = self.open_nested(name)
+            except (zipfile.BadZipFile, OSError):
+                continue
+            yield from archive.pack_roots()
+
+    def __reduce__(self):
+        # The archives are opened again (for example in the worker processes)
+        return Archive.open, (self.path, self.nested)
+
+    def __repr__(self) -> str:
+        return f'Archive({self.name!r})'
+
+def open_archive(path: Path) -> Optional[Archive]:
+    '''
+    Opens the archive or returns None if it isn't a valid zip file.
+    '''
+    try:
+        return Archive(path)
+    except (zipfile.BadZipFile, OSError):
+        return None
+
+class ArchivePath:
+    '''
+    The path of a file in an archive. Has the methods of pathlib.Path used
+    for reading the files of the packs. The members are decompressed only
+    when they're read.
+    '''
+    __slots__ = ('archive', 'member')
+
+    def __init__(self, archive: Archive, member: str):
+        self.archive = archive
+        self.member = member
+
+    def open(self, mode: str = 'r', encoding: str = 'utf-8') -> IO:
+        if mode not in ('r', 'rb'):
+            raise ValueError(f"Archive members can't be opened with mode {mode!r}")
+        f = self.archive.zip.open(self.member)
+        if mode == 'rb':
+            return f
+        return io.TextIOWrapper(f, encoding=encoding)
+
+    def read_bytes(self) -> bytes:
+        return self.archive.zip.read(self.member)
+
+    def read_text(self, encoding: str = 'utf-8') -> str:
+        return self.read_bytes().decode(encoding)
+
+    def stat(self) -> ArchiveStat:
+        info = self.archive.info(self.member)
+        return ArchiveStat(info.file_size, self.archive.mtime_ns, info.CRC)
+
+    def exists(self) -> bool:
+        return True
+
+    def is_file(self) -> bool:
+        return True
+
+    def is_dir(self) -> bool:
+        return False
+
+    def absolute(self) -> 'ArchivePath':
+        return self
+
+    @property
+    def name(self) -> str:
+        return posixpath.basename(self.member)
+
+    @property
+    def suffix(self) -> str:
+        return posixpath.splitext(self.member)[1]
+
+    @property
+    def stem(self) -> str:
+        return posixpath.splitext(self.name)[0]
+
+    def as_posix(self) -> str:
+        return f'{self.archive.name}/{self.member}'
+
+    def __str__(self) -> str:
+        return self.as_posix()
+
+    def __repr__(self) -> str:
+        return f'ArchivePath({self.as_posix()!r})'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ArchivePath):
+            return NotImplemented
+        return self.as_posix() == other.as_posix()
+
+    def __lt__(self, other: 'ArchivePath') -> bool:
+        return self.as_posix() < other.as_posix()
+
+    def __hash__(self) -> int:
+        return hash(self.as_posix())
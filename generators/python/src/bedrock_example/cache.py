@@ -0,0 +1,163 @@
+# This file is NOT autogenerated
+from typing import Optional, Dict, Tuple, Any
+from types import ModuleType
+from pathlib import Path
+import hashlib
+import pickle
+import sqlite3
+from .jpath import ExtractedObjects, loads_json
+
+# The modules whose code decides what is extracted from the files (besides
+# the module of the model)
+_EXTRACTION_MODULES = ('jpath.py',)
+
+# (model, model hash, file of the module) -> the key of the extraction code
+_EXTRACTION_KEYS: Dict[Tuple[str, str, Optional[str]], str] = {}
+
+def extraction_key(module: Any) -> str:
+    '''
+    Returns the key of the version of the code that extracts the data of the
+    model: the hash of the definition of the model (MODEL_HASH), the version
+    of the package and the sources of the module of the model and of the
+    JSON parser. Any change of the generator, the parser or the model
+    changes the key.
+    '''
+    module_file: Optional[str] = getattr(module, '__file__', None)
+    key = (module.NAME, module.MODEL_HASH, module_file)
+    result = _EXTRACTION_KEYS.get(key)
+    if result is None:
+        from . import __version__
+        h = hashlib.sha256()
+        h.update(f'{module.MODEL_HASH}\0{__version__}\0'.encode())
+        sources = [
+            Path(__file__).with_name(name) for name in _EXTRACTION_MODULES]
+        if module_file is not None:
+            sources.append(Path(module_file))
+        for source in sources:
+            h.update(source.read_bytes())
+        result = _EXTRACTION_KEYS[key] = h.hexdigest()
+    return result
+
+class ExtractionCache:
+    '''
+    Persistent cache of the results of the extract_file() functions of the
+    model modules stored in a SQLite file.
+
+    The cached results of a file are valid if the size and the modification
+    time of the file didn't change. Otherwise the content of the file is
+    hashed and compared with the hash of the cached version. The results are
+    invalidated when the definition of the model, the generated module, the
+    JSON parser or the version of the package change (see
+    extraction_key()).
+
+    The results are stored with pickle and loaded with pickle.loads(), so
+    the cache file must not be shared or come from an untrusted source.
+    '''
+    def __init__(self, path: Path):
+        self.path = path
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS extracted (
+                model TEXT NOT NULL,
+                path TEXT NOT NULL,
+                model_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (model, path)
+            )''')
+        self.hits = 0  # Valid stat signature
+        self.rehashed = 0  # Changed stat signature but the same content
+        self.misses = 0
+
+    def extract_file(
+            self, module: ModuleType, item_path: Path) -> ExtractedObjects:
+        '''
+        Returns the result of module.extract_file(item_path) from the cache
+        or extracts the data and saves it in the cache.
+        '''
+        try:
+            stat = item_path.stat()
+        except OSError:
+            return module.extract_file(item_path)
+        key = (module.NAME, item_path.absolute().as_posix())
+        model_hash = extraction_key(module)
+        row = self.connection.execute(
+            'SELECT model_hash, size, mtime_ns, content_hash, data '
+            'FROM extracted WHERE model = ? AND path = ?', key).fetchone()
+        if row is not None and row[0] != model_hash:
+            row = None
+        if (
+                row is not None and row[1] == stat.st_size and
+                row[2] == stat.st_mtime_ns):
+            result = self._load(row[4])
+            if result is not None:
+                self.hits += 1
+                return result
+            row = None
+        try:
+            content = item_path.read_bytes()
+        except OSError:
+            return []
+        content_hash = hashlib.sha256(content).hexdigest()
+        if row is not None and row[3] == content_hash:
+            result = self._load(row[4])
+            if result is not None:
+                self.rehashed += 1
+                self.connection.execute(
+                    'UPDATE extracted SET size = ?, mtime_ns = ? '
+                    'WHERE model = ? AND path = ?',
+                    (stat.st_size, stat.st_mtime_ns) + key)
+                return result
+        self.misses += 1
+        try:
+            result: ExtractedObjects = module.extract_document(
+                loads_json(content), item_path)
+        except:
+            result = []
+        self.connection.execute(
+            'INSERT OR REPLACE INTO extracted VALUES (?, ?, ?, ?, ?, ?, ?)',
+            key + (
+                model_hash, stat.st_size, stat.st_mtime_ns,
+                content_hash,
+                pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)))
+        return result
+
+    @staticmethod
+    def _load(data: bytes) -> Optional[ExtractedObjects]:
+        '''
+        Returns the unpickled results or None if they can't be loaded (the
+        results are extracted again).
+        '''
+        try:
+            return pickle.loads(data)
+        except Exception:
+            return None
+
+    def forget(self, item_path: Path, model: Optional[str] = None):
+        '''
+        Removes the cached results of the file (of all models if the model
+        isn't specified).
+        '''
+        path = item_path.absolute().as_posix()
+        if model is None:
+            self.connection.execute(
+                'DELETE FROM extracted WHERE path = ?', (path,))
+        else:
+            self.connection.execute(
+                'DELETE FROM extracted WHERE model = ? AND path = ?',
+                (model, path))
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def __enter__(self) -> 'ExtractionCache':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -1,45 +1,268 @@
 # AUTOGENERATED! DON'T EDIT!
+from __future__ import annotations
+from typing import TYPE_CHECKING
 from .jpath import *
+from .registry import PropertyInfo
+from .scanner import compile_globs
 
+if TYPE_CHECKING:
+    from .aio import AsyncIterator, PathSource
+    from .profiling import Collector
 
-def files(*resource_pack_paths: Path) -> Iterator[Path]:
+
+NAME = "client_animation"
+PACK_TYPE = "resource-pack"
+MODEL_HASH = "50923aab2e7954040ada3d77c00d6e81805bcc77b385134695cc87444f027d24"
+
+
+PROPERTIES: Dict[str, PropertyInfo] = {
+    "particle_effect": PropertyInfo("alias_reference", "client_entity", "particle_effects"),
+    "sound_effect": PropertyInfo("alias_reference", "client_entity", "sound_effects"),
+}
+
+
+PATHS = ["animations/**/*.json"]
+FILES_GLOB = compile_globs({NAME: PATHS})
+
+
+def iter_files(resource_pack_paths: Iterable[Path]) -> Iterator[Path]:
     for pack_path in resource_pack_paths:
-        for file in pack_path.glob("animations/**/*.json"):
+        for file, _ in FILES_GLOB.iter_files(pack_path):
             yield file
 
 
-def objects(*paths: Path) -> Iterator[Json]:
+def files(*resource_pack_paths: Path) -> Iterator[Path]:
+    return iter_files(resource_pack_paths)
+
+
+def aiter_files(resource_pack_paths: Iterable[Path]) -> AsyncIterator[Path]:
+    from .aio import iterate_in_thread
+    return iterate_in_thread(iter_files(resource_pack_paths))
+
+
+OBJECTS_JPATH = compile_jpath(["animations", Jpath.STR])
+
+
+def iter_objects(paths: Iterable[Path]) -> Iterator[Json]:
     for item_path in paths:
         try:
-            with item_path.open('r') as f:
-                yield from get_jpath_multi(Json(None, json.load(f)), ["animations", Jpath.STR])
+            data = load_json_file(item_path)
         except:
             continue
+        yield from OBJECTS_JPATH.iterate(data)
 
 
-def identifiers(*objects: Json) -> Iterator[str]:
-    for obj in objects:
-        identifier = get_jpath_single(obj, [])
-        if identifier is not None and isinstance(identifier.key, str):
-            result = identifier.key
-            if not result.startswith("animation."):
-                continue
-            yield result
+def iter_stream_objects(paths: Iterable[Path]) -> Iterator[Json]:
+    '''
+    The equivalent of iter_objects() that parses the files incrementally
+    and builds only the matching objects (one at a time).
+    '''
+    from .jstream import stream_file
+    for item_path in paths:
+        try:
+            for _, obj in stream_file(item_path, OBJECTS_JPATH):
+                yield obj
+        except (OSError, ValueError):
+            continue
+
+
+def objects(*paths: Path) -> Iterator[Json]:
+    return iter_objects(paths)
+
+
+def stream_objects(*paths: Path) -> Iterator[Json]:
+    return iter_stream_objects(paths)
+
+
+async def aiter_objects(
+        paths: PathSource, max_in_flight: int = 16) -> AsyncIterator[Json]:
+    '''
+    The asynchronous equivalent of iter_objects(). The files are read in
+    worker threads (at most max_in_flight at a time) and parsed as soon
+    as the consumer asks for their objects.
+    '''
+    from .aio import read_files
+    async for item_path, content in read_files(paths, max_in_flight):
+        if content is None:
+            continue
+        try:
+            data = loads_json(content)
+        except:
+            continue
+        for obj in OBJECTS_JPATH.iterate(data):
+            yield obj
+
+
+def process_identifier(value: str) -> Optional[str]:
+    if not value.startswith("animation."):
+        return None
+    return value
+
+
+IDENTIFIER_JPATH = compile_jpath([])
 
 
-def particle_effect(*objects: Json) -> Iterator[str]:
+def iter_identifiers(
+        objects: Iterable[Optional[Json]]) -> Iterator[str]:
     for obj in objects:
-        for ref in get_jpath_multi(obj, ["particle_effects", Jpath.STR, Jpath.SKIP_LIST, "effect"]):
-            if isinstance(ref.value, str):
-                result = ref.value
+        ref = IDENTIFIER_JPATH.find(obj)
+        if ref is not None:
+            result = ref.key
+            if isinstance(result, str):
+                result = process_identifier(result)
+                if result is not None:
+                    yield result
+
+
+def identifiers(*objects: Optional[Json]) -> Iterator[str]:
+    return iter_identifiers(objects)
 
-                yield result
 
+PARTICLE_EFFECT_JPATH_0 = compile_jpath(["particle_effects", Jpath.STR, Jpath.SKIP_LIST, "effect"])
 
-def sound_effect(*objects: Json) -> Iterator[str]:
+
+def iter_particle_effect(
+        objects: Iterable[Optional[Json]]) -> Iterator[str]:
     for obj in objects:
-        for ref in get_jpath_multi(obj, ["sound_effects", Jpath.STR, Jpath.SKIP_LIST, "effect"]):
-            if isinstance(ref.value, str):
-                result = ref.value
+        for result in PARTICLE_EFFECT_JPATH_0.find_all_values(obj):
+            if isinstance(result, str):
+                yield result
+
+
+def particle_effect(*objects: Optional[Json]) -> Iterator[str]:
+    return iter_particle_effect(objects)
+
+
+SOUND_EFFECT_JPATH_0 = compile_jpath(["sound_effects", Jpath.STR, Jpath.SKIP_LIST, "effect"])
 
+
+def iter_sound_effect(
+        objects: Iterable[Optional[Json]]) -> Iterator[str]:
+    for obj in objects:
+        for result in SOUND_EFFECT_JPATH_0.find_all_values(obj):
+            if isinstance(result, str):
                 yield result
+
+
+def sound_effect(*objects: Optional[Json]) -> Iterator[str]:
+    return iter_sound_effect(objects)
+
+
+EXTRACT_JPATHS = compile_jpath_trie([
+    [],
+    ["particle_effects", Jpath.STR, Jpath.SKIP_LIST, "effect"],
+    ["sound_effects", Jpath.STR, Jpath.SKIP_LIST, "effect"],
+], [
+    JpathMode.KEY,
+    JpathMode.VALUE,
+    JpathMode.VALUE,
+])
+
+
+class ClientAnimation(NamedTuple):
+    identifier: Optional[str]
+    particle_effect: List[str]
+    sound_effect: List[str]
+
+
+def extract(obj: Json, item_path: Optional[Path] = None) -> ClientAnimation:
+    '''
+    Returns the identifier and all of the properties of the object
+    using a single traversal of its JSON paths.
+    '''
+    found = EXTRACT_JPATHS.find_all(obj)
+    identifier: Optional[str] = None
+    for result in found[0]:
+        if isinstance(result, str):
+            result = process_identifier(result)
+            if result is not None:
+                identifier = result
+                break
+    particle_effect: List[str] = []
+    for result in found[1]:
+        if isinstance(result, str):
+            particle_effect.append(result)
+    sound_effect: List[str] = []
+    for result in found[2]:
+        if isinstance(result, str):
+            sound_effect.append(result)
+    return ClientAnimation(
+        identifier,
+        particle_effect,
+        sound_effect)
+
+
+def extract_file(item_path: Path) -> List[Tuple[ObjectPath, ClientAnimation]]:
+    '''
+    Returns the paths and the extracted data of all objects from the
+    file.
+    '''
+    try:
+        data = load_json_file(item_path)
+    except:
+        return []
+    return extract_document(data, item_path)
+
+
+def extract_document(
+        data: Any, item_path: Optional[Path] = None
+        ) -> List[Tuple[ObjectPath, ClientAnimation]]:
+    '''
+    Returns the paths and the extracted data of all objects from the
+    parsed content of a file.
+    '''
+    return [
+        (object_path, extract(obj, item_path))
+        for object_path, obj in OBJECTS_JPATH.find_all_paths(Json(None, data))]
+
+
+async def aiter_extract_files(
+        paths: PathSource, max_in_flight: int = 16
+        ) -> AsyncIterator[Tuple[Path, List[Tuple[ObjectPath, ClientAnimation]]]]:
+    '''
+    The asynchronous equivalent of calling extract_file() for every path.
+    The files are read in worker threads (at most max_in_flight at a time)
+    and parsed as soon as the consumer asks for their results.
+    '''
+    from .aio import read_files
+    async for item_path, content in read_files(paths, max_in_flight):
+        if content is None:
+            yield item_path, []
+            continue
+        try:
+            data = loads_json(content)
+        except:
+            yield item_path, []
+            continue
+        yield item_path, extract_document(data, item_path)
+
+
+def stream_extract_file(
+        item_path: Path) -> Iterator[Tuple[ObjectPath, ClientAnimation]]:
+    '''
+    The equivalent of extract_file() that parses the file
+    incrementally and keeps only one object in memory at a time.
+    '''
+    from .jstream import stream_file
+    try:
+        for object_path, obj in stream_file(item_path, OBJECTS_JPATH):
+            yield object_path, extract(obj, item_path)
+    except (OSError, ValueError):
+        return
+
+
+def enable_profiling(collector: Optional[Collector] = None) -> Collector:
+    '''
+    Replaces the functions of this module with the instrumented ones
+    that record their statistics in the collector (see profiling.py).
+    '''
+    from .profiling import instrument_namespace
+    return instrument_namespace(globals(), collector)
+
+
+def disable_profiling():
+    '''
+    Restores the original (not instrumented) functions of this module.
+    '''
+    from .profiling import restore_namespace
+    restore_namespace(globals())
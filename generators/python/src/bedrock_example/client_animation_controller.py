@@ -1,70 +1,325 @@
 # AUTOGENERATED! DON'T EDIT!
+from __future__ import annotations
+from typing import TYPE_CHECKING
 from .jpath import *
+from .registry import PropertyInfo
+from .scanner import compile_globs
 
+if TYPE_CHECKING:
+    from .aio import AsyncIterator, PathSource
+    from .profiling import Collector
 
-def files(*resource_pack_paths: Path) -> Iterator[Path]:
+
+NAME = "client_animation_controller"
+PACK_TYPE = "resource-pack"
+MODEL_HASH = "f0ef5b2940fc478f9b295943368b02bfaf8a87dc7a3e32bcfb192739060435a9"
+
+
+PROPERTIES: Dict[str, PropertyInfo] = {
+    "state": PropertyInfo("custom_value", None, None),
+    "state__animation": PropertyInfo("alias_reference", "client_entity", "animations"),
+    "state__particle_effect": PropertyInfo("alias_reference", "client_entity", "particle_effects"),
+    "state__sound_effect": PropertyInfo("alias_reference", "client_entity", "sound_effects"),
+}
+
+
+PATHS = ["animation_controllers/**/*.json"]
+FILES_GLOB = compile_globs({NAME: PATHS})
+
+
+def iter_files(resource_pack_paths: Iterable[Path]) -> Iterator[Path]:
     for pack_path in resource_pack_paths:
-        for file in pack_path.glob("animation_controllers/**/*.json"):
+        for file, _ in FILES_GLOB.iter_files(pack_path):
             yield file
 
 
-def objects(*paths: Path) -> Iterator[Json]:
+def files(*resource_pack_paths: Path) -> Iterator[Path]:
+    return iter_files(resource_pack_paths)
+
+
+def aiter_files(resource_pack_paths: Iterable[Path]) -> AsyncIterator[Path]:
+    from .aio import iterate_in_thread
+    return iterate_in_thread(iter_files(resource_pack_paths))
+
+
+OBJECTS_JPATH = compile_jpath(["animation_controllers", Jpath.STR])
+
+
+def iter_objects(paths: Iterable[Path]) -> Iterator[Json]:
     for item_path in paths:
         try:
-            with item_path.open('r') as f:
-                yield from get_jpath_multi(Json(None, json.load(f)), ["animation_controllers", Jpath.STR])
+            data = load_json_file(item_path)
         except:
             continue
+        yield from OBJECTS_JPATH.iterate(data)
 
 
-def identifiers(*objects: Json) -> Iterator[str]:
-    for obj in objects:
-        identifier = get_jpath_single(obj, [])
-        if identifier is not None and isinstance(identifier.key, str):
-            result = identifier.key
-            if not result.startswith("animation.controller."):
-                continue
-            yield result
+def iter_stream_objects(paths: Iterable[Path]) -> Iterator[Json]:
+    '''
+    The equivalent of iter_objects() that parses the files incrementally
+    and builds only the matching objects (one at a time).
+    '''
+    from .jstream import stream_file
+    for item_path in paths:
+        try:
+            for _, obj in stream_file(item_path, OBJECTS_JPATH):
+                yield obj
+        except (OSError, ValueError):
+            continue
 
 
-def state(*objects: Json):
-    for obj in objects:
-        for ref in get_jpath_multi(obj, ["animation_controllers", Jpath.STR, "states"]):
-            if isinstance(ref.key, str):
-                result = ref.key
+def objects(*paths: Path) -> Iterator[Json]:
+    return iter_objects(paths)
 
-                yield result
 
+def stream_objects(*paths: Path) -> Iterator[Json]:
+    return iter_stream_objects(paths)
 
-def state__animation(*objects: Json) -> Iterator[str]:
-    for obj in objects:
-        for ref in get_jpath_multi(obj, ["animations", Jpath.INT]):
-            if isinstance(ref.value, str):
-                result = ref.value
 
-                yield result
+async def aiter_objects(
+        paths: PathSource, max_in_flight: int = 16) -> AsyncIterator[Json]:
+    '''
+    The asynchronous equivalent of iter_objects(). The files are read in
+    worker threads (at most max_in_flight at a time) and parsed as soon
+    as the consumer asks for their objects.
+    '''
+    from .aio import read_files
+    async for item_path, content in read_files(paths, max_in_flight):
+        if content is None:
+            continue
+        try:
+            data = loads_json(content)
+        except:
+            continue
+        for obj in OBJECTS_JPATH.iterate(data):
+            yield obj
+
+
+def process_identifier(value: str) -> Optional[str]:
+    if not value.startswith("animation.controller."):
+        return None
+    return value
 
+
+IDENTIFIER_JPATH = compile_jpath([])
+
+
+def iter_identifiers(
+        objects: Iterable[Optional[Json]]) -> Iterator[str]:
     for obj in objects:
-        for ref in get_jpath_multi(obj, ["animations", Jpath.INT, Jpath.STR]):
-            if isinstance(ref.key, str):
-                result = ref.key
+        ref = IDENTIFIER_JPATH.find(obj)
+        if ref is not None:
+            result = ref.key
+            if isinstance(result, str):
+                result = process_identifier(result)
+                if result is not None:
+                    yield result
 
-                yield result
+
+def identifiers(*objects: Optional[Json]) -> Iterator[str]:
+    return iter_identifiers(objects)
 
 
-def state__particle_effect(*objects: Json) -> Iterator[str]:
+STATE_JPATH_0 = compile_jpath(["animation_controllers", Jpath.STR, "states"])
+
+
+def iter_state(
+        objects: Iterable[Optional[Json]]) -> Iterator[str]:
     for obj in objects:
-        for ref in get_jpath_multi(obj, ["particle_effects", Jpath.INT, "effect"]):
-            if isinstance(ref.value, str):
-                result = ref.value
+        for result in STATE_JPATH_0.find_all_keys(obj):
+            if isinstance(result, str):
+                yield result
+
+
+def state(*objects: Optional[Json]) -> Iterator[str]:
+    return iter_state(objects)
 
+
+STATE__ANIMATION_JPATH_0 = compile_jpath(["animations", Jpath.INT])
+STATE__ANIMATION_JPATH_1 = compile_jpath(["animations", Jpath.INT, Jpath.STR])
+
+
+def iter_state__animation(
+        objects: Iterable[Optional[Json]]) -> Iterator[str]:
+    for obj in objects:
+        for result in STATE__ANIMATION_JPATH_0.find_all_values(obj):
+            if isinstance(result, str):
+                yield result
+        for result in STATE__ANIMATION_JPATH_1.find_all_keys(obj):
+            if isinstance(result, str):
                 yield result
 
 
-def state__sound_effect(*objects: Json) -> Iterator[str]:
+def state__animation(*objects: Optional[Json]) -> Iterator[str]:
+    return iter_state__animation(objects)
+
+
+STATE__PARTICLE_EFFECT_JPATH_0 = compile_jpath(["particle_effects", Jpath.INT, "effect"])
+
+
+def iter_state__particle_effect(
+        objects: Iterable[Optional[Json]]) -> Iterator[str]:
     for obj in objects:
-        for ref in get_jpath_multi(obj, ["sound_effects", Jpath.INT, "effect"]):
-            if isinstance(ref.value, str):
-                result = ref.value
+        for result in STATE__PARTICLE_EFFECT_JPATH_0.find_all_values(obj):
+            if isinstance(result, str):
+                yield result
 
+
+def state__particle_effect(*objects: Optional[Json]) -> Iterator[str]:
+    return iter_state__particle_effect(objects)
+
+
+STATE__SOUND_EFFECT_JPATH_0 = compile_jpath(["sound_effects", Jpath.INT, "effect"])
+
+
+def iter_state__sound_effect(
+        objects: Iterable[Optional[Json]]) -> Iterator[str]:
+    for obj in objects:
+        for result in STATE__SOUND_EFFECT_JPATH_0.find_all_values(obj):
+            if isinstance(result, str):
                 yield result
+
+
+def state__sound_effect(*objects: Optional[Json]) -> Iterator[str]:
+    return iter_state__sound_effect(objects)
+
+
+EXTRACT_JPATHS = compile_jpath_trie([
+    [],
+    ["animation_controllers", Jpath.STR, "states"],
+    ["animation_controllers", Jpath.STR, "states", "animations", Jpath.INT],
+    ["animation_controllers", Jpath.STR, "states", "animations", Jpath.INT, Jpath.STR],
+    ["animation_controllers", Jpath.STR, "states", "particle_effects", Jpath.INT, "effect"],
+    ["animation_controllers", Jpath.STR, "states", "sound_effects", Jpath.INT, "effect"],
+], [
+    JpathMode.KEY,
+    JpathMode.KEY,
+    JpathMode.VALUE,
+    JpathMode.KEY,
+    JpathMode.VALUE,
+    JpathMode.VALUE,
+])
+
+
+class ClientAnimationController(NamedTuple):
+    identifier: Optional[str]
+    state: List[str]
+    state__animation: List[str]
+    state__particle_effect: List[str]
+    state__sound_effect: List[str]
+
+
+def extract(obj: Json, item_path: Optional[Path] = None) -> ClientAnimationController:
+    '''
+    Returns the identifier and all of the properties of the object
+    using a single traversal of its JSON paths.
+    '''
+    found = EXTRACT_JPATHS.find_all(obj)
+    identifier: Optional[str] = None
+    for result in found[0]:
+        if isinstance(result, str):
+            result = process_identifier(result)
+            if result is not None:
+                identifier = result
+                break
+    state: List[str] = []
+    for result in found[1]:
+        if isinstance(result, str):
+            state.append(result)
+    state__animation: List[str] = []
+    for result in found[2]:
+        if isinstance(result, str):
+            state__animation.append(result)
+    for result in found[3]:
+        if isinstance(result, str):
+            state__animation.append(result)
+    state__particle_effect: List[str] = []
+    for result in found[4]:
+        if isinstance(result, str):
+            state__particle_effect.append(result)
+    state__sound_effect: List[str] = []
+    for result in found[5]:
+        if isinstance(result, str):
+            state__sound_effect.append(result)
+    return ClientAnimationController(
+        identifier,
+        state,
+        state__animation,
+        state__particle_effect,
+        state__sound_effect)
+
+
+def extract_file(item_path: Path) -> List[Tuple[ObjectPath, ClientAnimationController]]:
+    '''
+    Returns the paths and the extracted data of all objects from the
+    file.
+    '''
+    try:
+        data = load_json_file(item_path)
+    except:
+        return []
+    return extract_document(data, item_path)
+
+
+def extract_document(
+        data: Any, item_path: Optional[Path] = None
+        ) -> List[Tuple[ObjectPath, ClientAnimationController]]:
+    '''
+    Returns the paths and the extracted data of all objects from the
+    parsed content of a file.
+    '''
+    return [
+        (object_path, extract(obj, item_path))
+        for object_path, obj in OBJECTS_JPATH.find_all_paths(Json(None, data))]
+
+
+async def aiter_extract_files(
+        paths: PathSource, max_in_flight: int = 16
+        ) -> AsyncIterator[Tuple[Path, List[Tuple[ObjectPath, ClientAnimationController]]]]:
+    '''
+    The asynchronous equivalent of calling extract_file() for every path.
+    The files are read in worker threads (at most max_in_flight at a time)
+    and parsed as soon as the consumer asks for their results.
+    '''
+    from .aio import read_files
+    async for item_path, content in read_files(paths, max_in_flight):
+        if content is None:
+            yield item_path, []
+            continue
+        try:
+            data = loads_json(content)
+        except:
+            yield item_path, []
+            continue
+        yield item_path, extract_document(data, item_path)
+
+
+def stream_extract_file(
+        item_path: Path) -> Iterator[Tuple[ObjectPath, ClientAnimationController]]:
+    '''
+    The equivalent of extract_file() that parses the file
+    incrementally and keeps only one object in memory at a time.
+    '''
+    from .jstream import stream_file
+    try:
+        for object_path, obj in stream_file(item_path, OBJECTS_JPATH):
+            yield object_path, extract(obj, item_path)
+    except (OSError, ValueError):
+        return
+
+
+def enable_profiling(collector: Optional[Collector] = None) -> Collector:
+    '''
+    Replaces the functions of this module with the instrumented ones
+    that record their statistics in the collector (see profiling.py).
+    '''
+    from .profiling import instrument_namespace
+    return instrument_namespace(globals(), collector)
+
+
+def disable_profiling():
+    '''
+    Restores the original (not instrumented) functions of this module.
+    '''
+    from .profiling import restore_namespace
+    restore_namespace(globals())
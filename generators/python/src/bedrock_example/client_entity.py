@@ -1,73 +1,321 @@
 # AUTOGENERATED! DON'T EDIT!
+from __future__ import annotations
+from typing import TYPE_CHECKING
 from .jpath import *
+from .registry import PropertyInfo
+from .scanner import compile_globs
 
+if TYPE_CHECKING:
+    from .aio import AsyncIterator, PathSource
+    from .profiling import Collector
 
-def files(*resource_pack_paths: Path) -> Iterator[Path]:
+
+NAME = "client_entity"
+PACK_TYPE = "resource-pack"
+MODEL_HASH = "ef90e2112a7ade7533f07eb7b3d0c8fd630faa1efd7d92d6467112efb63c656b"
+
+
+PROPERTIES: Dict[str, PropertyInfo] = {
+    "particle_effects": PropertyInfo("alias_mapping", "particle", None),
+    "particle_emitters": PropertyInfo("alias_mapping", "particle", None),
+    "sound_effects": PropertyInfo("alias_mapping", "sound_definition", None),
+    "animations": PropertyInfo("alias_mapping", "client_animation", None),
+    "animation_controllers": PropertyInfo("alias_mapping", "client_animation_controller", None),
+}
+
+
+PATHS = ["entity/**/*.json"]
+FILES_GLOB = compile_globs({NAME: PATHS})
+
+
+def iter_files(resource_pack_paths: Iterable[Path]) -> Iterator[Path]:
     for pack_path in resource_pack_paths:
-        for file in pack_path.glob("entity/**/*.json"):
+        for file, _ in FILES_GLOB.iter_files(pack_path):
             yield file
 
 
-def objects(*paths: Path) -> Iterator[Optional[Json]]:
+def files(*resource_pack_paths: Path) -> Iterator[Path]:
+    return iter_files(resource_pack_paths)
+
+
+def aiter_files(resource_pack_paths: Iterable[Path]) -> AsyncIterator[Path]:
+    from .aio import iterate_in_thread
+    return iterate_in_thread(iter_files(resource_pack_paths))
+
+
+OBJECTS_JPATH = compile_jpath([])
+
+
+def iter_objects(paths: Iterable[Path]) -> Iterator[Optional[Json]]:
     for item_path in paths:
         try:
-            with item_path.open('r') as f:
-                yield get_jpath_single(Json(None, json.load(f)), [])
+            data = load_json_file(item_path)
         except:
             yield None
+            continue
+        yield OBJECTS_JPATH.find(Json(None, data))
+
+
+def objects(*paths: Path) -> Iterator[Optional[Json]]:
+    return iter_objects(paths)
+
+
+async def aiter_objects(
+        paths: PathSource, max_in_flight: int = 16
+        ) -> AsyncIterator[Optional[Json]]:
+    '''
+    The asynchronous equivalent of iter_objects(). The files are read in
+    worker threads (at most max_in_flight at a time) and parsed as soon
+    as the consumer asks for their objects.
+    '''
+    from .aio import read_files
+    async for item_path, content in read_files(paths, max_in_flight):
+        if content is None:
+            yield None
+            continue
+        try:
+            data = loads_json(content)
+        except:
+            yield None
+            continue
+        yield OBJECTS_JPATH.find(Json(None, data))
+
+
+def process_animations_0(key: str, value: str) -> Optional[Tuple[str, str]]:
+    if not value.startswith("animation."):
+        return None
+    return key, value
+
+
+def process_animation_controllers_0(key: str, value: str) -> Optional[Tuple[str, str]]:
+    if not value.startswith("controller.animation."):
+        return None
+    return key, value
+
+
+IDENTIFIER_JPATH = compile_jpath(["minecraft:client_entity", "description", "identifier"])
 
 
-def identifiers(*objects: Json) -> Iterator[str]:
+def iter_identifiers(
+        objects: Iterable[Optional[Json]]) -> Iterator[str]:
     for obj in objects:
-        identifier = get_jpath_single(obj, ["minecraft:client_entity", "description", "identifier"])
-        if identifier is not None and isinstance(identifier.value, str):
-            result = identifier.value
+        ref = IDENTIFIER_JPATH.find(obj)
+        if ref is not None:
+            result = ref.value
+            if isinstance(result, str):
+                yield result
 
-            yield result
 
+def identifiers(*objects: Optional[Json]) -> Iterator[str]:
+    return iter_identifiers(objects)
 
-def particle_effects(*objects: Json) -> Iterator[Tuple[str, str]]:
+
+PARTICLE_EFFECTS_JPATH_0 = compile_jpath(["minecraft:client_entity", "description", "particle_effects", Jpath.STR])
+
+
+def iter_particle_effects(
+        objects: Iterable[Optional[Json]]) -> Iterator[Tuple[str, str]]:
     for obj in objects:
-        for ref in get_jpath_multi(obj, ["minecraft:client_entity", "description", "particle_effects", Jpath.STR]):
-            if isinstance(ref.key, str) and isinstance(ref.value, str):
+        for key, value in PARTICLE_EFFECTS_JPATH_0.find_all(obj):
+            if isinstance(key, str) and isinstance(value, str):
+                yield (key, value)
+
 
+def particle_effects(*objects: Optional[Json]) -> Iterator[Tuple[str, str]]:
+    return iter_particle_effects(objects)
 
-                yield ref.key, ref.value
 
+PARTICLE_EMITTERS_JPATH_0 = compile_jpath(["minecraft:client_entity", "description", "particle_emitters", Jpath.STR])
 
-def particle_emitters(*objects: Json) -> Iterator[Tuple[str, str]]:
+
+def iter_particle_emitters(
+        objects: Iterable[Optional[Json]]) -> Iterator[Tuple[str, str]]:
     for obj in objects:
-        for ref in get_jpath_multi(obj, ["minecraft:client_entity", "description", "particle_emitters", Jpath.STR]):
-            if isinstance(ref.key, str) and isinstance(ref.value, str):
+        for key, value in PARTICLE_EMITTERS_JPATH_0.find_all(obj):
+            if isinstance(key, str) and isinstance(value, str):
+                yield (key, value)
+
 
+def particle_emitters(*objects: Optional[Json]) -> Iterator[Tuple[str, str]]:
+    return iter_particle_emitters(objects)
 
-                yield ref.key, ref.value
 
+SOUND_EFFECTS_JPATH_0 = compile_jpath(["minecraft:client_entity", "description", "sound_effect", Jpath.STR])
 
-def sound_effects(*objects: Json) -> Iterator[Tuple[str, str]]:
+
+def iter_sound_effects(
+        objects: Iterable[Optional[Json]]) -> Iterator[Tuple[str, str]]:
     for obj in objects:
-        for ref in get_jpath_multi(obj, ["minecraft:client_entity", "description", "sound_effect", Jpath.STR]):
-            if isinstance(ref.key, str) and isinstance(ref.value, str):
+        for key, value in SOUND_EFFECTS_JPATH_0.find_all(obj):
+            if isinstance(key, str) and isinstance(value, str):
+                yield (key, value)
+
 
+def sound_effects(*objects: Optional[Json]) -> Iterator[Tuple[str, str]]:
+    return iter_sound_effects(objects)
 
-                yield ref.key, ref.value
 
+ANIMATIONS_JPATH_0 = compile_jpath(["minecraft:client_entity", "description", "animations", Jpath.STR])
 
-def animations(*objects: Json) -> Iterator[Tuple[str, str]]:
+
+def iter_animations(
+        objects: Iterable[Optional[Json]]) -> Iterator[Tuple[str, str]]:
     for obj in objects:
-        for ref in get_jpath_multi(obj, ["minecraft:client_entity", "description", "animations", Jpath.STR]):
-            if isinstance(ref.key, str) and isinstance(ref.value, str):
+        for key, value in ANIMATIONS_JPATH_0.find_all(obj):
+            if isinstance(key, str) and isinstance(value, str):
+                pair = process_animations_0(key, value)
+                if pair is not None:
+                    yield pair
+
+
+def animations(*objects: Optional[Json]) -> Iterator[Tuple[str, str]]:
+    return iter_animations(objects)
+
 
-                if not ref.value.startswith("animation."):
-                    continue
-                yield ref.key, ref.value
+ANIMATION_CONTROLLERS_JPATH_0 = compile_jpath(["minecraft:client_entity", "description", "animations"])
 
 
-def animation_controllers(*objects: Json) -> Iterator[Tuple[str, str]]:
+def iter_animation_controllers(
+        objects: Iterable[Optional[Json]]) -> Iterator[Tuple[str, str]]:
     for obj in objects:
-        for ref in get_jpath_multi(obj, ["minecraft:client_entity", "description", "animations"]):
-            if isinstance(ref.key, str) and isinstance(ref.value, str):
+        for key, value in ANIMATION_CONTROLLERS_JPATH_0.find_all(obj):
+            if isinstance(key, str) and isinstance(value, str):
+                pair = process_animation_controllers_0(key, value)
+                if pair is not None:
+                    yield pair
+
+
+def animation_controllers(*objects: Optional[Json]) -> Iterator[Tuple[str, str]]:
+    return iter_animation_controllers(objects)
+
+
+EXTRACT_JPATHS = compile_jpath_trie([
+    ["minecraft:client_entity", "description", "identifier"],
+    ["minecraft:client_entity", "description", "particle_effects", Jpath.STR],
+    ["minecraft:client_entity", "description", "particle_emitters", Jpath.STR],
+    ["minecraft:client_entity", "description", "sound_effect", Jpath.STR],
+    ["minecraft:client_entity", "description", "animations", Jpath.STR],
+    ["minecraft:client_entity", "description", "animations"],
+], [
+    JpathMode.VALUE,
+    JpathMode.JSON,
+    JpathMode.JSON,
+    JpathMode.JSON,
+    JpathMode.JSON,
+    JpathMode.JSON,
+])
+
+
+class ClientEntity(NamedTuple):
+    identifier: Optional[str]
+    particle_effects: List[Tuple[str, str]]
+    particle_emitters: List[Tuple[str, str]]
+    sound_effects: List[Tuple[str, str]]
+    animations: List[Tuple[str, str]]
+    animation_controllers: List[Tuple[str, str]]
+
+
+def extract(obj: Json, item_path: Optional[Path] = None) -> ClientEntity:
+    '''
+    Returns the identifier and all of the properties of the object
+    using a single traversal of its JSON paths.
+    '''
+    found = EXTRACT_JPATHS.find_all(obj)
+    identifier: Optional[str] = None
+    for result in found[0]:
+        if isinstance(result, str):
+            identifier = result
+            break
+    particle_effects: List[Tuple[str, str]] = []
+    for key, value in found[1]:
+        if isinstance(key, str) and isinstance(value, str):
+            particle_effects.append((key, value))
+    particle_emitters: List[Tuple[str, str]] = []
+    for key, value in found[2]:
+        if isinstance(key, str) and isinstance(value, str):
+            particle_emitters.append((key, value))
+    sound_effects: List[Tuple[str, str]] = []
+    for key, value in found[3]:
+        if isinstance(key, str) and isinstance(value, str):
+            sound_effects.append((key, value))
+    animations: List[Tuple[str, str]] = []
+    for key, value in found[4]:
+        if isinstance(key, str) and isinstance(value, str):
+            pair = process_animations_0(key, value)
+            if pair is not None:
+                animations.append(pair)
+    animation_controllers: List[Tuple[str, str]] = []
+    for key, value in found[5]:
+        if isinstance(key, str) and isinstance(value, str):
+            pair = process_animation_controllers_0(key, value)
+            if pair is not None:
+                animation_controllers.append(pair)
+    return ClientEntity(
+        identifier,
+        particle_effects,
+        particle_emitters,
+        sound_effects,
+        animations,
+        animation_controllers)
+
+
+def extract_file(item_path: Path) -> List[Tuple[ObjectPath, ClientEntity]]:
+    '''
+    Returns the paths and the extracted data of all objects from the
+    file.
+    '''
+    try:
+        data = load_json_file(item_path)
+    except:
+        return []
+    return extract_document(data, item_path)
+
+
+def extract_document(
+        data: Any, item_path: Optional[Path] = None
+        ) -> List[Tuple[ObjectPath, ClientEntity]]:
+    '''
+    Returns the paths and the extracted data of all objects from the
+    parsed content of a file.
+    '''
+    return [
+        (object_path, extract(obj, item_path))
+        for object_path, obj in OBJECTS_JPATH.find_all_paths(Json(None, data))]
+
+
+async def aiter_extract_files(
+        paths: PathSource, max_in_flight: int = 16
+        ) -> AsyncIterator[Tuple[Path, List[Tuple[ObjectPath, ClientEntity]]]]:
+    '''
+    The asynchronous equivalent of calling extract_file() for every path.
+    The files are read in worker threads (at most max_in_flight at a time)
+    and parsed as soon as the consumer asks for their results.
+    '''
+    from .aio import read_files
+    async for item_path, content in read_files(paths, max_in_flight):
+        if content is None:
+            yield item_path, []
+            continue
+        try:
+            data = loads_json(content)
+        except:
+            yield item_path, []
+            continue
+        yield item_path, extract_document(data, item_path)
+
+
+def enable_profiling(collector: Optional[Collector] = None) -> Collector:
+    '''
+    Replaces the functions of this module with the instrumented ones
+    that record their statistics in the collector (see profiling.py).
+    '''
+    from .profiling import instrument_namespace
+    return instrument_namespace(globals(), collector)
+
 
-                if not ref.value.startswith("controller.animation."):
-                    continue
-                yield ref.key, ref.value
+def disable_profiling():
+    '''
+    Restores the original (not instrumented) functions of this module.
+    '''
+    from .profiling import restore_namespace
+    restore_namespace(globals())
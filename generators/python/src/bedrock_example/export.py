@@ -0,0 +1,265 @@
+# This file is NOT autogenerated
+'''
+Export of the objects of the packs and their references into a SQLite
+database for ad-hoc queries. Every model has its own table with the
+identifiers of the objects and the "refs" table has the values of all of
+their properties. For example, the most used animations:
+
+    SELECT value, COUNT(*) AS uses FROM refs
+    WHERE target_model = 'client_animation'
+    GROUP BY value ORDER BY uses DESC
+
+The entities without sound effects:
+
+    SELECT identifier FROM client_entity AS e WHERE NOT EXISTS (
+        SELECT 1 FROM refs AS r
+        WHERE r.model = 'client_entity' AND r.object_id = e.id
+            AND r.property = 'sound_effects')
+'''
+from typing import NamedTuple, Tuple, List, Dict, Iterable, Optional, Any
+from pathlib import Path
+import json
+import sqlite3
+from .models import MODELS
+from .cache import extraction_key
+from .scanner import compile_globs
+
+class ExportStats(NamedTuple):
+    files_scanned: int
+    files_exported: int  # New or changed files
+    files_removed: int
+    objects: int  # Exported objects
+    references: int  # Exported rows of the refs table
+
+class SqliteExporter:
+    '''
+    Exports the objects of the models to a SQLite file. Exporting the same
+    packs again updates only the files that were added, removed or changed
+    (with a different size or modification time) since the last export, and
+    all files of the models whose definitions or extraction code changed
+    (see cache.extraction_key()).
+
+    The rows are inserted with executemany() in batches of batch_size rows
+    and every export is a single transaction.
+    '''
+    def __init__(
+            self, path: Path, models: Optional[Iterable[str]] = None,
+            batch_size: int = 10000):
+        self.path = path
+        self.models = list(MODELS if models is None else models)
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        with self.connection:
+            self._create_tables()
+        self._rows: Dict[str, List[Tuple]] = {}
+        self._next_ids: Dict[str, int] = {}
+
+    def _create_tables(self):
+        execute = self.connection.execute
+        execute('''
+            CREATE TABLE IF NOT EXISTS models (
+                model TEXT PRIMARY KEY,
+                model_hash TEXT NOT NULL
+            )''')
+        execute('''
+            CREATE TABLE IF NOT EXISTS files (
+                model TEXT NOT NULL,
+                path TEXT NOT NULL,
+                pack TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                PRIMARY KEY (model, path)
+            )''')
+        execute('''
+            CREATE TABLE IF NOT EXISTS refs (
+                model TEXT NOT NULL,
+                object_id INTEGER NOT NULL,
+                file TEXT NOT NULL,
+                property TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                alias TEXT,
+                value TEXT NOT NULL,
+                target_model TEXT
+            )''')
+        execute(
+            'CREATE INDEX IF NOT EXISTS refs_object '
+            'ON refs (model, object_id)')
+        execute(
+            'CREATE INDEX IF NOT EXISTS refs_target '
+            'ON refs (target_model, value)')
+        execute('CREATE INDEX IF NOT EXISTS refs_file ON refs (model, file)')
+        for name in self.models:
+            execute(f'''
+                CREATE TABLE IF NOT EXISTS {name} (
+                    id INTEGER PRIMARY KEY,
+                    identifier TEXT,
+                    pack TEXT NOT NULL,
+                    file TEXT NOT NULL,
+                    object_path TEXT NOT NULL
+                )''')
+            execute(
+                f'CREATE INDEX IF NOT EXISTS {name}_identifier '
+                f'ON {name} (identifier)')
+            execute(
+                f'CREATE INDEX IF NOT EXISTS {name}_file ON {name} (file)')
+
+    def _insert(self, table: str, row: Tuple):
+        rows = self._rows.setdefault(table, [])
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            self._flush(table)
+
+    def _flush(self, table: str):
+        rows = self._rows.get(table)
+        if not rows:
+            return
+        placeholders = ', '.join('?' * len(rows[0]))
+        self.connection.executemany(
+            f'INSERT INTO {table} VALUES ({placeholders})', rows)
+        rows.clear()
+
+    def _delete_files(self, keys: List[Tuple[str, str]]):
+        '''
+        Deletes the objects and the references of the (model, path) pairs.
+        '''
+        executemany = self.connection.executemany
+        by_model: Dict[str, List[Tuple[str]]] = {}
+        for model, path in keys:
+            by_model.setdefault(model, []).append((path,))
+        for model, paths in by_model.items():
+            executemany(f'DELETE FROM {model} WHERE file = ?', paths)
+        executemany('DELETE FROM refs WHERE model = ? AND file = ?', keys)
+        executemany('DELETE FROM files WHERE model = ? AND path = ?', keys)
+
+    def _export_file(
+            self, model: str, pack: Path, file: Path) -> Tuple[int, int]:
+        '''
+        Inserts the objects of the model from the file and returns the
+        numbers of the objects and the references.
+        '''
+        module = MODELS[model]
+        properties = module.PROPERTIES
+        file_name = file.as_posix()
+        pack_name = pack.as_posix()
+        objects = 0
+        references = 0
+        for object_path, data in module.extract_file(file):
+            object_id = self._next_ids[model]
+            self._next_ids[model] += 1
+            objects += 1
+            self._insert(model, (
+                object_id, data.identifier, pack_name, file_name,
+                json.dumps(list(object_path))))
+            for name, info in properties.items():
+                if info.kind == 'alias_reference':
+                    # The aliases are resolved through the map providers
+                    target_model = MODELS[info.model].PROPERTIES[
+                        info.map_property].model
+                else:
+                    target_model = info.model
+                for value in getattr(data, name):
+                    alias: Any = None
+                    if info.kind == 'alias_mapping':
+                        alias, value = value
+                    references += 1
+                    self._insert('refs', (
+                        model, object_id, file_name, name, info.kind, alias,
+                        value, target_model))
+        return objects, references
+
+    def export(
+            self, resource_packs: Iterable[Path] = (),
+            behavior_packs: Iterable[Path] = ()) -> ExportStats:
+        '''
+        Exports the objects from the packs (replacing the results of the
+        previous exports).
+        '''
+        packs = {
+            'resource-pack': list(resource_packs),
+            'behavior-pack': list(behavior_packs),
+        }
+        connection = self.connection
+        with connection:
+            # The models with changed definitions are exported again
+            hashes = dict(connection.execute(
+                'SELECT model, model_hash FROM models'))
+            for name in self.models:
+                model_hash = extraction_key(MODELS[name])
+                if hashes.get(name) == model_hash:
+                    continue
+                connection.execute(f'DELETE FROM {name}')
+                connection.execute('DELETE FROM refs WHERE model = ?', (name,))
+                connection.execute(
+                    'DELETE FROM files WHERE model = ?', (name,))
+                connection.execute(
+                    'INSERT OR REPLACE INTO models VALUES (?, ?)',
+                    (name, model_hash))
+            known: Dict[Tuple[str, str], Tuple[int, int]] = {
+                (model, path): (size, mtime_ns)
+                for model, path, size, mtime_ns in connection.execute(
+                    'SELECT model, path, size, mtime_ns FROM files')}
+            for name in self.models:
+                self._next_ids[name] = connection.execute(
+                    f'SELECT COALESCE(MAX(id), 0) + 1 FROM {name}'
+                    ).fetchone()[0]
+
+            # Every pack is walked once for all models of its type
+            seen = set()
+            changed: List[Tuple[str, Path, Path, int, int]] = []
+            for pack_type, pack_paths in packs.items():
+                patterns = {
+                    name: MODELS[name].PATHS for name in self.models
+                    if MODELS[name].PACK_TYPE == pack_type}
+                if len(patterns) == 0:
+                    continue
+                matcher = compile_globs(patterns)
+                for pack in pack_paths:
+                    for file, labels in matcher.iter_files(pack):
+                        try:
+                            stat = file.stat()
+                        except OSError:
+                            continue
+                        signature = (stat.st_size, stat.st_mtime_ns)
+                        for name in labels:
+                            key = (name, file.as_posix())
+                            seen.add(key)
+                            if known.get(key) != signature:
+                                changed.append((name, pack, file) + signature)
+            outdated = [key for key in known if key not in seen]
+            self._delete_files(
+                outdated + [
+                    (name, file.as_posix()) for name, _, file, _, _ in changed
+                    if (name, file.as_posix()) in known])
+
+            objects = 0
+            references = 0
+            for name, pack, file, size, mtime_ns in changed:
+                file_objects, file_references = self._export_file(
+                    name, pack, file)
+                objects += file_objects
+                references += file_references
+                self._insert('files', (
+                    name, file.as_posix(), pack.as_posix(), size, mtime_ns))
+            for table in list(self._rows):
+                self._flush(table)
+        return ExportStats(
+            len(seen), len(changed), len(outdated), objects, references)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> 'SqliteExporter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def export_packs(
+        path: Path, resource_packs: Iterable[Path] = (),
+        behavior_packs: Iterable[Path] = ()) -> ExportStats:
+    '''
+    Exports the objects from the packs to the SQLite file.
+    '''
+    with SqliteExporter(path) as exporter:
+        return exporter.export(resource_packs, behavior_packs)
@@ -1,87 +1,914 @@
 # This is the fil is NOT autogenerated
+from __future__ import annotations
 from typing import (
     NamedTuple, Tuple, List, Dict, Any, Iterator, Optional, Union,
-    Iterable)
+    Iterable, Callable, TYPE_CHECKING)
 from pathlib import Path
 import re
+import os
 import json
+import json.scanner
+import time
+import _thread  # Always imported by the interpreter, unlike threading
+from collections import OrderedDict
 from enum import Enum
 
+if TYPE_CHECKING:
+    import mmap
+
 class Jpath(Enum):
     INT = 0
     STR = 1
     ANY = 2
     SKIP_LIST = 3
 
+class JpathMode(Enum):
+    """
+    What is returned for every match of a JSON path.
+    """
+    JSON = 0  # Json(key, value)
+    KEY = 1
+    VALUE = 2
+
 JsonKey = Union[str, int]
 
-class Json(NamedTuple):
-    key: Optional[JsonKey]
-    value: Union[str, float, int, bool, None, List, Dict]
+# The named tuples are created with the functional syntax, because the
+# annotations of the class syntax are strings in this module and evaluating
+# them is slower than importing the rest of the module.
+Json = NamedTuple('Json', [
+    ('key', Optional[JsonKey]),
+    ('value', Union[str, float, int, bool, None, List, Dict])])
+
+ObjectPath = Tuple[JsonKey, ...]
+
+# The result of the extract_file functions of the model modules
+ExtractedObjects = List[Tuple[ObjectPath, Any]]
 
 JPathSingle = List[Union[str, int]]
 JPathMulti = List[Union[str, int, Jpath, re.Pattern]]
 
-def get_jpath_multi(obj: Json, path: JPathMulti) -> Iterator[Json]:
+# Kinds of compiled JSON path steps
+_KEY = 0
+_INT = 1
+_STR = 2
+_ANY = 3
+_SKIP_LIST = 4
+_REGEX = 5
+
+_MISSING = object()
+
+_MODES = {JpathMode.JSON: 0, JpathMode.KEY: 1, JpathMode.VALUE: 2}
+
+# Creates Json from a (key, value) tuple, about twice as fast as calling
+# Json(key, value)
+_new_tuple = tuple.__new__
+
+def _children(kind: int, arg: Any, key: Optional[JsonKey], value: Any):
     """
-    Returns values from given Json path
+    Returns the iterable of (key, value) pairs of the children of the value
+    matched by a step of a JSON path. The containers are iterated directly
+    (the iterators of dict.items() and enumerate reuse their result tuples
+    when they're unpacked right away).
     """
-    if len(path) == 0:
-        yield obj
-        return
-    k, new_path = path[0], path[1:]
-    if isinstance(k, str) or isinstance(k, int):
-        try:
-            new_obj = Json(k, obj.value[k])  # type: ignore
-        except:
+    if kind == _KEY:
+        if isinstance(value, dict):
+            value = value.get(arg, _MISSING)
+            if value is not _MISSING:
+                return ((arg, value),)
+        elif (
+                isinstance(value, list) and isinstance(arg, int) and
+                -len(value) <= arg < len(value)):
+            return ((arg, value[arg]),)
+        return ()
+    if isinstance(value, dict):
+        if kind == _STR or kind == _ANY:
+            return value.items()
+        if kind == _REGEX:
+            fullmatch = arg.fullmatch
+            return [(k, v) for k, v in value.items() if fullmatch(k)]
+        if kind == _SKIP_LIST:
+            return ((key, value),)
+        return ()
+    if isinstance(value, list):
+        if kind == _STR or kind == _REGEX:
+            return ()
+        return enumerate(value)
+    if kind == _SKIP_LIST:
+        return ((key, value),)
+    return ()
+
+class JpathMatcher:
+    """
+    JSON path compiled once and reusable for any number of objects. The
+    matching is done iteratively with an explicit stack, without creating
+    slices of the path or nested generators for every visited node.
+    """
+    __slots__ = ('path', 'steps', 'is_single')
+
+    def __init__(self, path: JPathMulti):
+        self.path: JPathMulti = list(path)
+        steps: List[Tuple[int, Any]] = []
+        for k in self.path:
+            if isinstance(k, Jpath):
+                steps.append((
+                    {
+                        Jpath.INT: _INT, Jpath.STR: _STR, Jpath.ANY: _ANY,
+                        Jpath.SKIP_LIST: _SKIP_LIST
+                    }[k], None))
+            elif isinstance(k, re.Pattern):
+                steps.append((_REGEX, k))
+            elif isinstance(k, (str, int)):
+                steps.append((_KEY, k))
+            else:
+                raise TypeError(f"Invalid JSON path key: {k!r}")
+        self.steps: Tuple[Tuple[int, Any], ...] = tuple(steps)
+        # Paths with literal keys only can be matched with a simple loop
+        self.is_single: bool = all(kind == _KEY for kind, _ in steps)
+
+    def iterate(
+            self, value: Any, key: Optional[JsonKey] = None,
+            mode: JpathMode = JpathMode.JSON) -> Iterator[Any]:
+        """
+        Returns the matches of the JSON path in the value (for example the
+        root of a parsed document, without wrapping it in Json). The
+        traversal keeps a stack of cursors (iterators over the children of
+        the visited containers) and creates the results only for the final
+        matches. The KEY and VALUE modes don't create any objects for the
+        matches.
+        """
+        mode_id = _MODES[mode]
+        if self.is_single:
+            for p in self.path:
+                if isinstance(value, dict):
+                    value = value.get(p, _MISSING)
+                    if value is _MISSING:
+                        return
+                elif isinstance(value, list):
+                    if not isinstance(p, int) or not -len(value) <= p < len(value):
+                        return
+                    value = value[p]
+                else:
+                    return
+                key = p
+            if mode_id == 0:
+                yield Json(key, value)
+            else:
+                yield key if mode_id == 1 else value
             return
-        yield from get_jpath_multi(new_obj, new_path)
-    if isinstance(k, Jpath):
-        if k == Jpath.INT:
-            if not isinstance(obj.value, list):
-                return
-            for new_obj_k, new_obj_v in enumerate(obj.value):
-                yield from get_jpath_multi(Json(new_obj_k, new_obj_v), new_path)
-        if k == Jpath.STR:
-            if not isinstance(obj.value, dict):
-                return
-            for new_obj_k, new_obj_v in obj.value.items():
-                yield from get_jpath_multi(Json(new_obj_k, new_obj_v), new_path)
-        if k == Jpath.ANY:
-            if isinstance(obj.value, list):
-                for new_obj_k, new_obj_v in enumerate(obj.value):
-                    yield from get_jpath_multi(Json(new_obj_k, new_obj_v), new_path)
-            elif isinstance(obj.value, dict):
-                for new_obj_k, new_obj_v in obj.value.items():
-                    yield from get_jpath_multi(Json(new_obj_k, new_obj_v), new_path)
+        steps = self.steps
+        end = len(steps)
+        kind, arg = steps[0]
+        cursors = [iter(_children(kind, arg, key, value))]
+        push = cursors.append
+        pop = cursors.pop
+        while cursors:
+            depth = len(cursors)
+            cursor = cursors[-1]
+            if depth == end:
+                if mode_id == 0:
+                    for item in cursor:
+                        yield _new_tuple(Json, item)
+                elif mode_id == 1:
+                    for k, _ in cursor:
+                        yield k
+                else:
+                    for _, v in cursor:
+                        yield v
+                pop()
+                continue
+            kind, arg = steps[depth]
+            for k, v in cursor:
+                push(iter(_children(kind, arg, k, v)))
+                break
             else:
-                return
-        if k == Jpath.SKIP_LIST:
-            if isinstance(obj.value, list):
-                for new_obj_k, new_obj_v in enumerate(obj.value):
-                    yield from get_jpath_multi(Json(new_obj_k, new_obj_v), new_path)
+                pop()
+
+    def find_all(self, obj: Optional[Json]) -> Iterator[Json]:
+        """
+        Returns values from the JSON path (the equivalent of
+        get_jpath_multi). The None objects (yielded by the objects()
+        functions for the files that can't be loaded) have no values.
+        """
+        if obj is None:
+            return iter(())
+        return self.iterate(obj.value, obj.key)
+
+    def find_all_keys(
+            self, obj: Optional[Json]) -> Iterator[Optional[JsonKey]]:
+        """
+        Returns only the keys of the values from the JSON path.
+        """
+        if obj is None:
+            return iter(())
+        return self.iterate(obj.value, obj.key, JpathMode.KEY)
+
+    def find_all_values(self, obj: Optional[Json]) -> Iterator[Any]:
+        """
+        Returns only the values from the JSON path.
+        """
+        if obj is None:
+            return iter(())
+        return self.iterate(obj.value, obj.key, JpathMode.VALUE)
+
+    def find_all_paths(
+            self, obj: Optional[Json], prefix: ObjectPath = ()
+            ) -> Iterator[Tuple[ObjectPath, Json]]:
+        """
+        Returns values from the JSON path together with their full paths
+        (starting with the prefix).
+        """
+        if obj is None:
+            return
+        steps = self.steps
+        end = len(steps)
+        stack: List[Tuple[int, ObjectPath, Optional[JsonKey], Any]] = [
+            (0, prefix, obj.key, obj.value)]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            depth, path, key, value = pop()
+            if depth == end:
+                yield path, _new_tuple(Json, (key, value))
+                continue
+            kind, arg = steps[depth]
+            depth += 1
+            if kind == _KEY:
+                if isinstance(value, dict):
+                    value = value.get(arg, _MISSING)
+                    if value is not _MISSING:
+                        push((depth, path + (arg,), arg, value))
+                elif (
+                        isinstance(value, list) and isinstance(arg, int) and
+                        -len(value) <= arg < len(value)):
+                    push((depth, path + (arg,), arg, value[arg]))
+            elif isinstance(value, dict):
+                if kind == _STR or kind == _ANY:
+                    for k, v in reversed(value.items()):
+                        push((depth, path + (k,), k, v))
+                elif kind == _REGEX:
+                    fullmatch = arg.fullmatch
+                    for k, v in reversed(value.items()):
+                        if fullmatch(k):
+                            push((depth, path + (k,), k, v))
+                elif kind == _SKIP_LIST:
+                    push((depth, path, key, value))
+            elif isinstance(value, list):
+                if kind != _STR and kind != _REGEX:
+                    for i in range(len(value) - 1, -1, -1):
+                        push((depth, path + (i,), i, value[i]))
+            elif kind == _SKIP_LIST:
+                push((depth, path, key, value))
+
+    def find(self, obj: Optional[Json]) -> Optional[Json]:
+        """
+        Returns value from the JSON path or None if the path doesn't exist
+        or the object is None (the equivalent of get_jpath_single). Paths
+        with wildcards return their first match.
+        """
+        if obj is None:
+            return None
+        if not self.is_single:
+            for result in self.find_all(obj):
+                return result
+            return None
+        key, value = obj
+        for p in self.path:
+            if isinstance(value, dict):
+                value = value.get(p, _MISSING)
+                if value is _MISSING:
+                    return None
+            elif isinstance(value, list):
+                if not isinstance(p, int) or not -len(value) <= p < len(value):
+                    return None
+                value = value[p]
             else:
-                yield from get_jpath_multi(obj, new_path)
-    if isinstance(k, re.Pattern):
-            if not isinstance(obj.value, dict):
+                return None
+            key = p
+        return Json(key, value)
+
+class _TrieNode:
+    __slots__ = ('terminals', 'keys', 'wildcards')
+
+    def __init__(self):
+        # Indices of the paths that end in this node with their modes
+        self.terminals: List[Tuple[int, int]] = []
+        # Children reachable with literal keys
+        self.keys: Dict[JsonKey, _TrieNode] = {}
+        # Children reachable with other steps (kind, argument, node)
+        self.wildcards: List[Tuple[int, Any, _TrieNode]] = []
+
+class JpathTrie:
+    """
+    Multiple JSON paths merged into a prefix tree. Matches all of the
+    paths in a single traversal of the object. The common prefixes of the
+    paths are visited only once.
+
+    The modes decide what is returned for the matches of every path (Json
+    by default).
+    """
+    __slots__ = ('paths', 'modes', 'root')
+
+    def __init__(
+            self, paths: List[JPathMulti],
+            modes: Optional[List[JpathMode]] = None):
+        self.paths: List[JPathMulti] = [list(p) for p in paths]
+        if modes is None:
+            modes = [JpathMode.JSON] * len(self.paths)
+        elif len(modes) != len(self.paths):
+            raise ValueError("The number of modes must match the number of paths")
+        self.modes: List[JpathMode] = list(modes)
+        self.root = _TrieNode()
+        for i, path in enumerate(self.paths):
+            node = self.root
+            for kind, arg in JpathMatcher(path).steps:
+                if kind == _KEY:
+                    child = node.keys.get(arg)
+                    if child is None:
+                        child = node.keys[arg] = _TrieNode()
+                else:
+                    for w_kind, w_arg, w_node in node.wildcards:
+                        if w_kind == kind and w_arg == arg:
+                            child = w_node
+                            break
+                    else:
+                        child = _TrieNode()
+                        node.wildcards.append((kind, arg, child))
+                node = child
+            node.terminals.append((i, _MODES[self.modes[i]]))
+
+    def find_all(self, obj: Optional[Json]) -> List[List[Any]]:
+        """
+        Returns the list of matches for every path (in the same order as
+        the paths used to create the trie). The None objects have no
+        matches.
+        """
+        results: List[List[Any]] = [[] for _ in self.paths]
+        if obj is None:
+            return results
+        stack: List[Tuple[_TrieNode, Optional[JsonKey], Any]] = [
+            (self.root, obj.key, obj.value)]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            node, key, value = pop()
+            if node.terminals:
+                match = None
+                for i, mode_id in node.terminals:
+                    if mode_id == 0:
+                        if match is None:
+                            match = Json(key, value)
+                        results[i].append(match)
+                    else:
+                        results[i].append(key if mode_id == 1 else value)
+            # Every branch leads to different paths so the order of
+            # processing the branches doesn't matter. Only the order of
+            # the matches of a single branch does.
+            if node.keys:
+                if isinstance(value, dict):
+                    for k, child in node.keys.items():
+                        v = value.get(k, _MISSING)
+                        if v is not _MISSING:
+                            push((child, k, v))
+                elif isinstance(value, list):
+                    for k, child in node.keys.items():
+                        if (
+                                isinstance(k, int) and
+                                -len(value) <= k < len(value)):
+                            push((child, k, value[k]))
+            for kind, arg, child in node.wildcards:
+                if kind == _STR or kind == _REGEX:
+                    if not isinstance(value, dict):
+                        continue
+                    if kind == _STR:
+                        for k, v in reversed(value.items()):
+                            push((child, k, v))
+                    else:
+                        fullmatch = arg.fullmatch
+                        for k, v in reversed(value.items()):
+                            if fullmatch(k):
+                                push((child, k, v))
+                elif isinstance(value, list):  # _INT, _ANY, _SKIP_LIST
+                    for i in range(len(value) - 1, -1, -1):
+                        push((child, i, value[i]))
+                elif kind == _ANY:
+                    if isinstance(value, dict):
+                        for k, v in reversed(value.items()):
+                            push((child, k, v))
+                elif kind == _SKIP_LIST:
+                    push((child, key, value))
+        return results
+
+# Bedrock accepts comments and trailing commas in JSON files. The tolerant
+# decoder removes them with regular expressions (from the parts of the text
+# between the string literals) and parses the result with the json module.
+# The decoding errors and the values inside of the documents use a slower
+# version that replaces them with spaces, so the positions in the parsed
+# text are the same as in the original one.
+# The comments (the line comments always end at the end of the line, so the
+# regexes that use them can't backtrack into them)
+_COMMENT = r'//[^\n]*(?![^\n])|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/'
+# The whitespace and comments
+_SKIP_PATTERN = r'[ \t\n\r]*(?:(?:' + _COMMENT + r')[ \t\n\r]*)*'
+
+# The regular expressions and the scanner of the tolerant decoder are
+# created on its first use (see _compile_tolerant), because compiling them
+# takes longer than importing the rest of the module.
+_SKIP: Any = None
+_EXTENSION: Any = None
+# The rest of a string literal after its opening quote
+_STRING_END: Any = None
+# The comments and the trailing commas (the commas after a value) for the
+# text without the string literals
+_COMMENTS: Any = None
+_TRAILING_COMMA: Any = None
+_scan_once: Any = None
+
+def _compile_tolerant():
+    global _SKIP, _EXTENSION, _STRING_END, _COMMENTS, _TRAILING_COMMA
+    global _scan_once
+    _SKIP = re.compile(_SKIP_PATTERN)
+    _EXTENSION = re.compile(
+        _COMMENT + r'|,(?=' + _SKIP_PATTERN + r'[\]}])')
+    _STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+    _COMMENTS = re.compile(r'/(?:/[^\n]*|\*[^*]*\*+(?:[^/*][^*]*\*+)*/)')
+    _TRAILING_COMMA = re.compile(r',(?<=[^\[{,:\s],)(?=[ \t\n\r]*[\]}])')
+    # Set last, because it's checked by the functions that call this one
+    _scan_once = json.scanner.make_scanner(json.JSONDecoder())
+
+# The size of the first part of the text parsed by decode_tolerant()
+# (multiplied by 8 until the value fits)
+_WINDOW = 2048
+
+def _string_end(text: str, scan: int, pos: int) -> int:
+    """
+    Returns the end of the string literal that contains the position or -1
+    if the position isn't inside of a string. The scan position must be
+    outside of the strings.
+    """
+    find = text.find
+    if find('\\', scan, pos) == -1:
+        # Without the escape sequences the quotes are the string boundaries
+        if text.count('"', scan, pos) % 2 == 0:
+            return -1
+        start = text.rfind('"', scan, pos) + 1
+    else:
+        while True:
+            start = find('"', scan, pos) + 1
+            if start == 0:
+                return -1
+            match = _STRING_END.match(text, start)
+            if match is None:
+                return len(text)
+            scan = match.end()
+            if scan > pos:
+                return scan
+    match = _STRING_END.match(text, start)
+    return len(text) if match is None else match.end()
+
+def _strip_extensions(text: str) -> str:
+    """
+    Replaces the comments and trailing commas outside of the strings with
+    spaces. Only the comments and the commas followed by a closing bracket
+    are checked for the strings around them, so the text is scanned by the
+    regular expressions and the methods of str.
+    """
+    search = _EXTENSION.search
+    parts: List[str] = []
+    last = 0  # The end of the copied part of the text
+    scan = 0  # A position outside of the strings
+    pos = 0
+    # The last character before the copied part that isn't whitespace
+    previous = ''
+    while True:
+        match = search(text, pos)
+        if match is None:
+            break
+        start = match.start()
+        end = _string_end(text, scan, start)
+        if end != -1:  # Inside of a string
+            pos = scan = end
+            continue
+        end = match.end()
+        part = text[last:start]
+        significant = part.rstrip(' \t\n\r')
+        if significant:
+            previous = significant[-1]
+        if text[start] == ',' and previous in '[{,:':
+            # Not a trailing comma (there's no value before it)
+            pos = scan = end
+            continue
+        parts.append(part)
+        parts.append(' ' * (end - start))
+        last = pos = scan = end
+    if last == 0:
+        return text
+    parts.append(text[last:])
+    return ''.join(parts)
+
+def _strip_outside_strings(text: str) -> Optional[str]:
+    """
+    A faster version of _strip_extensions for the common documents. Splits
+    the text at the quotes and strips the parts outside of the strings with
+    the regular expressions. Returns None if the quotes can't be used to
+    find the strings (the text has escaped quotes or comments with quotes).
+    The result is shorter than the text.
+    """
+    if '\\' in text and '\\"' in text:
+        return None
+    parts = text.split('"')
+    outside = '"'.join(parts[0::2])
+    stripped = _COMMENTS.sub(' ', outside)
+    if stripped.count('"') != len(parts) // 2:
+        return None  # A comment with a quote
+    parts[0::2] = _TRAILING_COMMA.sub('', stripped).split('"')
+    return '"'.join(parts)
+
+def decode_tolerant(text: str, start: int = 0) -> Tuple[Any, int]:
+    """
+    Parses the JSON value with the comments and trailing commas that starts
+    at the position (after the whitespace and comments) and returns it with
+    the position of its end. Only the parts of the text that can contain
+    the value are stripped (see _strip_extensions) and the value is parsed
+    if it ends in them.
+    """
+    if _scan_once is None:
+        _compile_tolerant()
+    size = _WINDOW
+    while True:
+        stop = start + size
+        part = _strip_extensions(text[start:stop])
+        i = len(part) - len(part.lstrip(' \t\n\r'))
+        try:
+            value, end = _scan_once(part, i)
+            return value, start + end
+        except json.JSONDecodeError as e:
+            error = json.JSONDecodeError(e.msg, text, start + e.pos)
+        except StopIteration:  # Raised for the missing values
+            error = json.JSONDecodeError('Expecting value', text, start + i)
+        # The end of the part might cut the value or its comments
+        if stop >= len(text):
+            raise error
+        size *= 8
+
+def loads_tolerant(text: str) -> Any:
+    """
+    Parses the JSON document with the comments, trailing commas and the
+    byte order mark.
+    """
+    if text[:1] == '\ufeff':
+        text = text[1:]
+    if _scan_once is None:
+        _compile_tolerant()
+    start = _SKIP.match(text).end()
+    if text.find('/', 0, start) != -1:
+        # The documents with comments only before the value (like the
+        # headers with the license) are parsed without stripping them
+        try:
+            value, end = _scan_once(text, start)
+            if _SKIP.match(text, end).end() == len(text):
+                return value
+        except (json.JSONDecodeError, StopIteration):
+            pass
+    stripped = _strip_outside_strings(text)
+    if stripped is not None:
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass  # Parsed again for the positions in the original text
+    try:
+        return json.loads(_strip_extensions(text))
+    except json.JSONDecodeError as e:
+        raise json.JSONDecodeError(e.msg, text, e.pos) from None
+
+# The decoders of JSON documents by name. A decoder gets bytes or a
+# memoryview with UTF-8 encoded JSON (without the BOM) and raises ValueError
+# if the document is invalid.
+JsonDecoder = Callable[[Any], Any]
+_DECODERS: Dict[str, JsonDecoder] = {}
+
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+# The files of this size (in bytes) or larger are memory-mapped instead of
+# being read
+MMAP_THRESHOLD = 1 << 20
+
+def _json_decoder(data: Any) -> Any:
+    if isinstance(data, bytes):
+        return json.loads(data)
+    # Decode directly from the buffer without copying it into bytes first
+    return json.loads(str(data, 'utf-8'))
+
+def register_decoder(name: str, decoder: JsonDecoder):
+    """
+    Adds a JSON decoder to the registry (replaces the decoder with the same
+    name).
+    """
+    _DECODERS[name] = decoder
+
+def set_decoder(name: str):
+    """
+    Sets the decoder used by loads_json and load_json_file.
+    """
+    global _decoder_name, _decoder
+    _find_optional_decoders()
+    if name not in _DECODERS:
+        raise ValueError(
+            f"Unknown JSON decoder {name!r}. "
+            f"Available decoders: {', '.join(_DECODERS)}")
+    _decoder_name, _decoder = name, _DECODERS[name]
+
+def get_decoder() -> str:
+    """
+    Returns the name of the decoder used by loads_json and load_json_file.
+    """
+    return _decoder_name
+
+def available_decoders() -> List[str]:
+    """
+    Returns the names of the registered decoders.
+    """
+    _find_optional_decoders()
+    return list(_DECODERS)
+
+def _orjson_decoder(data: Any) -> Any:
+    """
+    Imports orjson on the first use (importing it takes longer than
+    importing the rest of the package) and replaces itself with
+    orjson.loads.
+    """
+    global _decoder_name, _decoder
+    try:
+        import orjson
+    except ImportError:
+        del _DECODERS['orjson']
+        if _decoder is _orjson_decoder:
+            _decoder_name, _decoder = 'json', _json_decoder
+        return _json_decoder(data)
+    _DECODERS['orjson'] = orjson.loads
+    if _decoder is _orjson_decoder:
+        _decoder = orjson.loads
+    return orjson.loads(data)
+
+register_decoder('json', _json_decoder)
+_optional_decoders_found = False
+
+def _find_optional_decoders():
+    """
+    Registers orjson if it's installed (it's imported when it's used). The
+    module is searched for when the registry is used for the first time,
+    because it takes longer than importing the rest of the package.
+    """
+    global _optional_decoders_found
+    if _optional_decoders_found:
+        return
+    _optional_decoders_found = True
+    import importlib.machinery
+    if ('orjson' not in _DECODERS and
+            importlib.machinery.PathFinder.find_spec('orjson') is not None):
+        register_decoder('orjson', _orjson_decoder)
+
+# The standard json module is used by default, so the results don't depend
+# on the installed packages. The faster decoders are enabled with
+# set_decoder() (for example set_decoder('orjson')).
+_decoder_name = 'json'
+_decoder = _json_decoder
+
+def loads_json(data: Union[str, bytes, memoryview, mmap.mmap]) -> Any:
+    """
+    Parses JSON document. Accepts the comments, trailing commas and UTF-8
+    BOM. The documents are parsed by the selected decoder first, so the
+    strictly valid documents are parsed at its speed. The other documents
+    are parsed by the tolerant decoder (loads_tolerant).
+    """
+    if isinstance(data, str):
+        try:
+            return json.loads(data)
+        except ValueError:
+            pass
+        return loads_tolerant(data)
+    if data[:3] == _UTF8_BOM:
+        data = memoryview(data)[3:]  # Doesn't copy the data
+    elif not isinstance(data, (bytes, memoryview)):
+        data = memoryview(data)
+    try:
+        return _decoder(data)
+    except ValueError:
+        pass
+    return loads_tolerant(str(data, 'utf-8'))
+
+# The size is the total size of the sources of the cached documents
+DocumentCacheStats = NamedTuple('DocumentCacheStats', [
+    ('hits', int), ('misses', int), ('evictions', int), ('entries', int),
+    ('size', int), ('max_size', int)])
+
+class DocumentCache:
+    """
+    LRU cache of the parsed JSON files shared by all of the models. The
+    documents are stored by the path and the signature (size, modification
+    time and inode) of the file, so the changed files are parsed again. The
+    least recently used documents are evicted when the total size of their
+    sources exceeds max_size bytes. The documents larger than max_size
+    aren't cached.
+
+    The cached documents are shared, so they must not be modified. The cache
+    of load_json_file is disabled by default (see set_document_cache_size).
+    """
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # path -> (signature, size, document)
+        self._documents: OrderedDict[str, Tuple[Tuple[int, int, int], int, Any]] = (
+            OrderedDict())
+        self._lock = _thread.allocate_lock()
+
+    def get(self, path: str, signature: Tuple[int, int, int]) -> Any:
+        """
+        Returns the cached document of the file with the signature or
+        _MISSING.
+        """
+        with self._lock:
+            cached = self._documents.get(path)
+            if cached is None or cached[0] != signature:
+                self.misses += 1
+                return _MISSING
+            self._documents.move_to_end(path)
+            self.hits += 1
+            return cached[2]
+
+    def put(
+            self, path: str, signature: Tuple[int, int, int], size: int,
+            document: Any):
+        with self._lock:
+            old = self._documents.pop(path, None)
+            if old is not None:
+                self.size -= old[1]
+            if size > self.max_size:
                 return
-            for new_obj_k, new_obj_v in obj.value.items():
-                if not k.fullmatch(new_obj_k):
-                    continue
-                yield from get_jpath_multi(Json(new_obj_k, new_obj_v), new_path)
+            self._documents[path] = (signature, size, document)
+            self.size += size
+            self._evict()
+
+    def _evict(self):
+        while self.size > self.max_size:
+            _, (_, size, _) = self._documents.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def resize(self, max_size: int):
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self.size = 0
+
+    def stats(self) -> DocumentCacheStats:
+        with self._lock:
+            return DocumentCacheStats(
+                self.hits, self.misses, self.evictions, len(self._documents),
+                self.size, self.max_size)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+# The suggested limit of the total size of the sources of the cached
+# documents (set_document_cache_size(DOCUMENT_CACHE_SIZE) enables the cache)
+DOCUMENT_CACHE_SIZE = 32 << 20
+_document_cache = DocumentCache(0)
+
+def get_document_cache() -> DocumentCache:
+    """
+    Returns the cache of the documents used by load_json_file.
+    """
+    return _document_cache
+
+def set_document_cache_size(max_size: int):
+    """
+    Sets the limit of the total size (in bytes of the sources) of the
+    documents cached by load_json_file. 0 (the default) disables the cache.
+    Enable the cache only if the loaded documents are never modified.
+    """
+    _document_cache.resize(max_size)
+
+def _file_signature(stat: Any) -> Tuple[int, int, int]:
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+def load_json_file(path: Path) -> Any:
+    """
+    Reads and parses JSON file with loads_json. The file is read in binary
+    mode. The files larger than MMAP_THRESHOLD are memory-mapped. The path
+    can also be a file of an archive (archive.ArchivePath).
+
+    If the cache of the documents is enabled (see set_document_cache_size),
+    loading the same unchanged file again doesn't parse it and returns the
+    same document, which must not be modified.
+    """
+    cache = _document_cache
+    in_archive = not isinstance(path, Path)
+    if cache.max_size > 0:
+        if in_archive:
+            key = path.as_posix()
+            signature = _file_signature(path.stat())
+        else:
+            key = os.fspath(path)
+            signature = _file_signature(os.stat(key))
+        document = cache.get(key, signature)
+        if document is not _MISSING:
+            return document
+    if in_archive:
+        # The file is decompressed straight into the memory
+        with path.open('rb') as f:
+            document = loads_json(f.read())
+        size = path.stat().st_size
+    else:
+        with path.open('rb') as f:
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+            if size < MMAP_THRESHOLD:
+                document = loads_json(f.read())
+            else:
+                import mmap
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    document = loads_json(mapped)
+                finally:
+                    try:
+                        mapped.close()
+                    except BufferError:
+                        # A view of the map is still referenced (by the
+                        # traceback of an exception). The map is closed when
+                        # it's collected.
+                        pass
+        signature = _file_signature(stat)
+    if cache.max_size > 0:
+        cache.put(key, signature, size, document)
+    return document
+
+def benchmark_decoders(
+        paths: Iterable[Path], repeat: int = 3) -> List[Tuple[str, float]]:
+    """
+    Measures how long it takes to parse the files (already loaded into the
+    memory) with every registered decoder. Returns the names of the decoders
+    with the best times (in seconds) sorted from the fastest. The decoders
+    that can't parse some of the files are skipped.
+    """
+    contents: List[bytes] = []
+    for path in paths:
+        try:
+            content = path.read_bytes()
+        except OSError:
+            continue
+        if content[:3] == _UTF8_BOM:
+            content = content[3:]
+        try:
+            _json_decoder(content)
+        except ValueError:
+            continue  # Skip the documents with comments etc.
+        contents.append(content)
+    results: List[Tuple[str, float]] = []
+    _find_optional_decoders()
+    for name, decoder in _DECODERS.items():
+        best = float('inf')
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for content in contents:
+                    decoder(content)
+                best = min(best, time.perf_counter() - start)
+        except ValueError:
+            continue
+        results.append((name, best))
+    results.sort(key=lambda result: result[1])
+    return results
+
+def compile_jpath(path: JPathMulti) -> JpathMatcher:
+    """
+    Compiles JSON path into a reusable matcher.
+    """
+    return JpathMatcher(path)
+
+def compile_jpath_trie(
+        paths: List[JPathMulti],
+        modes: Optional[List[JpathMode]] = None) -> JpathTrie:
+    """
+    Compiles multiple JSON paths into a trie that matches all of them in a
+    single traversal.
+    """
+    return JpathTrie(paths, modes)
+
+def get_jpath_multi(obj: Json, path: JPathMulti) -> Iterator[Json]:
+    """
+    Returns values from given Json path
+    """
+    return JpathMatcher(path).find_all(obj)
 
 def get_jpath_single(obj: Json, path: JPathSingle) -> Optional[Json]:
     """
     Returns value from given Json path
     """
-    for p in path:
-        try:
-            if isinstance(obj.value, dict):
-                obj = Json(p, obj.value[p])
-            elif isinstance(obj.value, list):
-                obj = Json(p, obj.value[p])
-            else:
-                return None
-        except:
-            return None
-    return obj
+    return JpathMatcher(path).find(obj)
@@ -0,0 +1,259 @@
+# This file is NOT autogenerated
+from typing import Tuple, Iterator, Optional, Any, TextIO
+from pathlib import Path
+import re
+import json
+from .jpath import (
+    Json, JsonKey, ObjectPath, JpathMatcher, _KEY, _INT, _STR, _ANY,
+    _SKIP_LIST, _REGEX, _SKIP_PATTERN, decode_tolerant, load_json_file)
+
+_SKIP = re.compile(_SKIP_PATTERN)
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_STRUCTURE = re.compile(r'["\[\]{}/]')
+_DELIMITER = re.compile(r'[ \t\n\r,\]}/]')
+
+class JsonStream:
+    '''
+    Incremental reader of a JSON file that builds only the subtrees matching
+    a JSON path (one at a time). The rest of the file is only scanned to
+    find the boundaries of the values and discarded. The memory usage
+    depends on the size of the largest matching subtree and not on the size
+    of the file. Accepts the comments and trailing commas like loads_json.
+    '''
+    def __init__(self, fp: TextIO, chunk_size: int = 1 << 16):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        # The start of the value that is being read (the part of the buffer
+        # after the mark can't be discarded)
+        self.mark: Optional[int] = None
+        self.eof = False
+
+    def _fill(self) -> bool:
+        '''
+        Discards the consumed part of the buffer and reads the next chunk of
+        the file. Returns False at the end of the file.
+        '''
+        if self.eof:
+            return False
+        start = self.pos if self.mark is None else self.mark
+        if start > 0:
+            self.buffer = self.buffer[start:]
+            self.pos -= start
+            if self.mark is not None:
+                self.mark -= start
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def _peek(self) -> str:
+        '''
+        Skips the whitespace and comments and returns the next character.
+        '''
+        while True:
+            end = _SKIP.match(self.buffer, self.pos).end()
+            # The comments at the end of the buffer might be cut
+            if end < len(self.buffer) and self.buffer[end] != '/':
+                self.pos = end
+                return self.buffer[end]
+            if not self._fill():
+                self.pos = end
+                if end < len(self.buffer):
+                    return self.buffer[end]
+                raise ValueError("Unexpected end of JSON data")
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise ValueError(
+                f"Expected {char!r} in JSON data, got {self._peek()!r}")
+        self.pos += 1
+
+    def _string(self) -> str:
+        '''
+        Reads a string starting at the current position.
+        '''
+        while True:
+            match = _STRING.match(self.buffer, self.pos)
+            if match is not None:
+                self.pos = match.end()
+                token = match.group()
+                if '\\' in token:
+                    return json.loads(token)
+                return token[1:-1]
+            if not self._fill():
+                raise ValueError("Unterminated string in JSON data")
+
+    def _skip_value(self):
+        '''
+        Moves the position to the end of the current value without building
+        it.
+        '''
+        char = self._peek()
+        if char == '"':
+            self._string()
+        elif char == '{' or char == '[':
+            depth = 0
+            while True:
+                match = _STRUCTURE.search(self.buffer, self.pos)
+                if match is None:
+                    self.pos = len(self.buffer)
+                    if not self._fill():
+                        raise ValueError("Unexpected end of JSON data")
+                    continue
+                self.pos = match.start()
+                char = self.buffer[self.pos]
+                if char == '"':
+                    self._string()
+                    continue
+                if char == '/':
+                    if self._peek() == '/':
+                        raise ValueError("Invalid comment in JSON data")
+                    continue
+                self.pos += 1
+                if char == '{' or char == '[':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return
+        else:
+            while True:
+                match = _DELIMITER.search(self.buffer, self.pos)
+                if match is not None:
+                    self.pos = match.start()
+                    return
+                self.pos = len(self.buffer)
+                if not self._fill():
+                    return
+
+    def _value(self) -> Any:
+        '''
+        Reads and builds the current value.
+        '''
+        self._peek()
+        self.mark = self.pos
+        try:
+            while True:
+                # The value is complete if it's followed by a delimiter
+                # (the numbers at the end of the buffer might be cut)
+                try:
+                    value, end = decode_tolerant(self.buffer, self.mark)
+                    if self.eof or _DELIMITER.match(self.buffer, end):
+                        self.pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if self.eof:
+                        raise
+                # Read at least the size of the already buffered part of the
+                # value to avoid quadratic parsing of large values
+                self.chunk_size = max(
+                    self.chunk_size, len(self.buffer) - self.mark)
+                self._fill()
+        finally:
+            self.mark = None
+
+    def _walk(
+            self, steps: Tuple[Tuple[int, Any], ...], depth: int,
+            path: ObjectPath, key: Optional[JsonKey]
+            ) -> Iterator[Tuple[ObjectPath, Json]]:
+        if depth == len(steps):
+            yield path, Json(key, self._value())
+            return
+        kind, arg = steps[depth]
+        char = self._peek()
+        if kind == _SKIP_LIST and char != '[':
+            yield from self._walk(steps, depth + 1, path, key)
+        elif char == '{' and kind in (_KEY, _STR, _ANY, _REGEX):
+            self.pos += 1
+            if self._peek() == '}':
+                self.pos += 1
+                return
+            while True:
+                if self._peek() != '"':
+                    raise ValueError("Expected a key in JSON data")
+                k = self._string()
+                self._expect(':')
+                if (
+                        (kind == _KEY and k == arg) or
+                        kind == _STR or kind == _ANY or
+                        (kind == _REGEX and arg.fullmatch(k))):
+                    yield from self._walk(steps, depth + 1, path + (k,), k)
+                else:
+                    self._skip_value()
+                char = self._peek()
+                self.pos += 1
+                if char == ',' and self._peek() == '}':  # A trailing comma
+                    char = '}'
+                    self.pos += 1
+                if char == '}':
+                    return
+                if char != ',':
+                    raise ValueError("Expected ',' or '}' in JSON data")
+        elif char == '[' and kind in (_KEY, _INT, _ANY, _SKIP_LIST):
+            self.pos += 1
+            if self._peek() == ']':
+                self.pos += 1
+                return
+            i = 0
+            while True:
+                if kind != _KEY or (arg == i and isinstance(arg, int)):
+                    yield from self._walk(steps, depth + 1, path + (i,), i)
+                else:
+                    self._skip_value()
+                char = self._peek()
+                self.pos += 1
+                if char == ',' and self._peek() == ']':  # A trailing comma
+                    char = ']'
+                    self.pos += 1
+                if char == ']':
+                    return
+                if char != ',':
+                    raise ValueError("Expected ',' or ']' in JSON data")
+                i += 1
+        else:
+            self._skip_value()
+
+def stream_jpath(
+        fp: TextIO, matcher: JpathMatcher, chunk_size: int = 1 << 16
+        ) -> Iterator[Tuple[ObjectPath, Json]]:
+    '''
+    Parses the JSON file incrementally and yields the values from the JSON
+    path with their full paths (the equivalent of
+    matcher.find_all_paths(Json(None, json.load(fp)))).
+    '''
+    for kind, arg in matcher.steps:
+        if kind == _KEY and isinstance(arg, int) and arg < 0:
+            raise ValueError(
+                "Negative list indices are not supported in streaming mode")
+    stream = JsonStream(fp, chunk_size)
+    yield from stream._walk(matcher.steps, 0, (), None)
+
+def stream_file(
+        path: Path, matcher: JpathMatcher, chunk_size: int = 1 << 16
+        ) -> Iterator[Tuple[ObjectPath, Json]]:
+    '''
+    Streams the values from the JSON path in the file (see stream_jpath).
+    The file is decoded as UTF-8 with an optional BOM, like in
+    load_json_file. If the file can't be parsed incrementally (e.g. the JSON
+    path uses negative indices), it's loaded with load_json_file and the
+    values that weren't yielded yet are taken from the whole document.
+    Raises OSError or ValueError if the file can't be read or parsed (the
+    values yielded before the error in an invalid file are not withdrawn).
+    '''
+    yielded = 0
+    try:
+        with path.open('r', encoding='utf-8-sig') as f:
+            for item in stream_jpath(f, matcher, chunk_size):
+                yield item
+                yielded += 1
+        return
+    except ValueError:
+        pass
+    document = Json(None, load_json_file(path))
+    for i, item in enumerate(matcher.find_all_paths(document)):
+        if i >= yielded:
+            yield item
@@ -0,0 +1,12 @@
+# AUTOGENERATED! DON'T EDIT!
+
+from .registry import ModelRegistry
+
+
+MODELS = ModelRegistry(__package__, [
+    "client_animation",
+    "client_animation_controller",
+    "client_entity",
+    "particle",
+    "sound_definition",
+])
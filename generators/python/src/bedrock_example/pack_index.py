@@ -0,0 +1,291 @@
+# This file is NOT autogenerated
+from typing import (
+    NamedTuple, Tuple, List, Dict, Iterator, Optional, Iterable, KeysView, Any)
+from types import ModuleType
+from pathlib import Path
+from .jpath import ObjectPath
+from .models import MODELS
+from .cache import ExtractionCache
+from .scanner import GlobMatcher, compile_globs
+from .symbols import SymbolTable
+
+def _data_type(module: ModuleType) -> Any:
+    '''
+    Returns the NamedTuple of the extracted data of the model module.
+    '''
+    data_type = module.extract.__annotations__['return']
+    if isinstance(data_type, str):
+        # The annotations of the generated modules aren't evaluated
+        data_type = getattr(module, data_type)
+    return data_type
+
+class IndexEntry(NamedTuple):
+    '''
+    The location of the definition of an object.
+    '''
+    model: str
+    identifier: str
+    pack: Path
+    file: Path
+    object_path: ObjectPath
+
+class PackIndex:
+    '''
+    The index of the identifiers of the objects of all models from a set of
+    packs. The packs are scanned only once, when the index is created. The
+    optional cache lets the index skip parsing of the files that didn't
+    change since the last scan.
+
+    With keep_objects, the index also keeps the extracted data of all
+    objects (required by the ReferenceGraph). With a symbol table, the
+    strings and paths of the entries and the kept data are interned, so the
+    repeated values are stored only once. With compact_objects, the kept
+    data is stored as the arrays of the IDs of the symbols (see
+    SymbolTable.compact()) and expanded when it's used.
+
+    The index can be updated after changes of the files with
+    update_files().
+    '''
+    def __init__(
+            self, resource_packs: Iterable[Path] = (),
+            behavior_packs: Iterable[Path] = (),
+            models: Optional[Iterable[str]] = None,
+            cache: Optional[ExtractionCache] = None,
+            keep_objects: bool = False,
+            symbols: Optional[SymbolTable] = None,
+            compact_objects: bool = False):
+        self.packs: Dict[str, List[Path]] = {
+            'resource-pack': list(resource_packs),
+            'behavior-pack': list(behavior_packs),
+        }
+        # model -> identifier -> the first definition
+        self._models: Dict[str, Dict[str, IndexEntry]] = {}
+        # identifier -> definitions from all models
+        self._identifiers: Dict[str, List[IndexEntry]] = {}
+        # (the first definition, the duplicate) pairs
+        self.duplicates: List[Tuple[IndexEntry, IndexEntry]] = []
+        # file -> the definitions from the file
+        self._files: Dict[Path, List[IndexEntry]] = {}
+        # The entries and the extracted data of all objects (compact or not)
+        self.objects: Optional[List[Tuple[IndexEntry, Any]]] = (
+            [] if keep_objects else None)
+        self.cache = cache
+        if compact_objects and symbols is None:
+            symbols = SymbolTable()
+        self.symbols = symbols
+        self.compact_objects = compact_objects
+        names = list(MODELS if models is None else models)
+        for name in names:
+            self._models[name] = {}
+        self._matchers: Dict[str, GlobMatcher] = {}
+        # Every pack is walked once for all models of its type
+        for pack_type, packs in self.packs.items():
+            patterns = {
+                name: MODELS[name].PATHS for name in names
+                if MODELS[name].PACK_TYPE == pack_type}
+            if len(patterns) == 0:
+                continue
+            matcher = self._matchers[pack_type] = compile_globs(patterns)
+            for pack in packs:
+                for file, labels in matcher.iter_files(pack):
+                    for name in labels:
+                        self._index_file(MODELS[name], pack, file)
+        if cache is not None:
+            cache.commit()
+
+    def _index_file(self, module: ModuleType, pack: Path, file: Path):
+        if self.cache is None:
+            extracted = module.extract_file(file)
+        else:
+            extracted = self.cache.extract_file(module, file)
+        symbols = self.symbols
+        if symbols is not None:
+            pack = symbols.intern_path(pack)
+            file = symbols.intern_path(file)
+        for object_path, data in extracted:
+            identifier = data.identifier
+            if identifier is None:
+                continue
+            if symbols is not None:
+                # The identifiers are the keys of the tables of the index
+                # (also if the objects aren't kept or are compact)
+                identifier = symbols.intern(identifier)
+                object_path = symbols.intern_object_path(object_path)
+                if self.objects is not None and not self.compact_objects:
+                    data = symbols.intern_extracted(data, module.PROPERTIES)
+            entry = IndexEntry(
+                module.NAME, identifier, pack, file, object_path)
+            self.add(entry)
+            if self.objects is None:
+                continue
+            if self.compact_objects:
+                self.objects.append(
+                    (entry, symbols.compact(data, module.PROPERTIES)))
+            else:
+                self.objects.append((entry, data))
+
+    def add(self, entry: IndexEntry):
+        '''
+        Adds an entry to the index. If the identifier is already defined in
+        the same model, the entry is recorded as a duplicate.
+        '''
+        model_index = self._models.setdefault(entry.model, {})
+        first = model_index.get(entry.identifier)
+        if first is not None:
+            self.duplicates.append((first, entry))
+        else:
+            model_index[entry.identifier] = entry
+        self._identifiers.setdefault(entry.identifier, []).append(entry)
+        self._files.setdefault(entry.file, []).append(entry)
+
+    def update_files(
+            self, files: Iterable[Path]
+            ) -> Tuple[List[IndexEntry], List[IndexEntry]]:
+        '''
+        Updates the index after the files were created, modified or deleted
+        and returns the removed and the added entries. Only the given files
+        are extracted again. The definitions from the updated files are
+        treated as the last ones (for choosing the first definition of a
+        duplicated identifier).
+        '''
+        files = list(dict.fromkeys(files))
+        removed: List[IndexEntry] = []
+        for file in files:
+            removed.extend(self._files.pop(file, ()))
+        # The first definitions and the duplicates of the identifiers of the
+        # removed entries
+        keys = set()
+        for entry in removed:
+            entries = self._identifiers[entry.identifier]
+            entries.remove(entry)
+            if len(entries) == 0:
+                del self._identifiers[entry.identifier]
+            keys.add((entry.model, entry.identifier))
+        if len(keys) > 0:
+            self.duplicates = [
+                d for d in self.duplicates
+                if (d[0].model, d[0].identifier) not in keys]
+            for model, identifier in keys:
+                definitions = [
+                    e for e in self._identifiers.get(identifier, ())
+                    if e.model == model]
+                model_index = self._models[model]
+                if len(definitions) == 0:
+                    del model_index[identifier]
+                    continue
+                model_index[identifier] = definitions[0]
+                self.duplicates.extend(
+                    (definitions[0], e) for e in definitions[1:])
+        if self.objects is not None and len(removed) > 0:
+            removed_files = set(files)
+            self.objects = [
+                o for o in self.objects if o[0].file not in removed_files]
+
+        added: List[IndexEntry] = []
+        for file in files:
+            for pack, name in self._file_models(file):
+                self._index_file(MODELS[name], pack, file)
+            added.extend(self._files.get(file, ()))
+        if self.cache is not None:
+            self.cache.commit()
+        return removed, added
+
+    def _file_models(self, file: Path) -> Iterator[Tuple[Path, str]]:
+        '''
+        Yields the packs that contain the file and the names of the models
+        that match it.
+        '''
+        if not file.is_file():
+            return
+        for pack_type, packs in self.packs.items():
+            matcher = self._matchers.get(pack_type)
+            if matcher is None:
+                continue
+            for pack in packs:
+                try:
+                    relative_path = file.relative_to(pack)
+                except ValueError:
+                    continue
+                for name in matcher.match(relative_path.as_posix()):
+                    yield pack, name
+
+    def iter_objects(
+            self, files: Optional[Iterable[Path]] = None
+            ) -> Iterator[Tuple[IndexEntry, Any]]:
+        '''
+        Yields the entries and the extracted data of all objects or only the
+        objects from the files (requires keep_objects).
+        '''
+        if self.objects is None:
+            raise ValueError("The index doesn't keep the objects")
+        objects: Iterable[Tuple[IndexEntry, Any]] = self.objects
+        if files is not None:
+            selected = set(files)
+            objects = [o for o in objects if o[0].file in selected]
+        if not self.compact_objects:
+            yield from objects
+            return
+        expand = self.symbols.expand
+        data_types: Dict[str, Any] = {}
+        for entry, compact in objects:
+            module = MODELS[entry.model]
+            data_type = data_types.get(entry.model)
+            if data_type is None:
+                data_type = data_types[entry.model] = _data_type(module)
+            yield entry, expand(compact, data_type, module.PROPERTIES)
+
+    def files(self) -> KeysView[Path]:
+        '''
+        Returns the paths of the files with the indexed objects.
+        '''
+        return self._files.keys()
+
+    def get(
+            self, identifier: str,
+            model: Optional[str] = None) -> Optional[IndexEntry]:
+        '''
+        Returns the first definition of the identifier (from any model if
+        the model isn't specified) or None.
+        '''
+        if model is not None:
+            model_index = self._models.get(model)
+            if model_index is None:
+                return None
+            return model_index.get(identifier)
+        entries = self._identifiers.get(identifier)
+        if entries is None:
+            return None
+        return entries[0]
+
+    def find(self, identifier: str) -> List[IndexEntry]:
+        '''
+        Returns all definitions of the identifier from all models (including
+        the duplicates).
+        '''
+        return list(self._identifiers.get(identifier, ()))
+
+    def contains(self, identifier: str, model: Optional[str] = None) -> bool:
+        if model is None:
+            return identifier in self._identifiers
+        return identifier in self._models.get(model, {})
+
+    def __contains__(self, identifier: str) -> bool:
+        return identifier in self._identifiers
+
+    def identifiers(self, model: str) -> KeysView[str]:
+        '''
+        Returns the identifiers of all objects of the model.
+        '''
+        return self._models.get(model, {}).keys()
+
+    def entries(self, model: str) -> Iterator[IndexEntry]:
+        '''
+        Yields the first definitions of all objects of the model.
+        '''
+        yield from self._models.get(model, {}).values()
+
+    def models(self) -> KeysView[str]:
+        return self._models.keys()
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._models.values())
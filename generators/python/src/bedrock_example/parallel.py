@@ -0,0 +1,79 @@
+# This file is NOT autogenerated
+from typing import List, Tuple, Iterator, Optional, Iterable
+from types import ModuleType
+from pathlib import Path
+from concurrent.futures import Executor, ProcessPoolExecutor
+import importlib
+import os
+from .jpath import ExtractedObjects
+
+def _extract_chunk(
+        module_name: str, paths: List[Path]) -> List[ExtractedObjects]:
+    '''
+    Runs in the worker process. Only the extracted results are sent back to
+    the main process.
+    '''
+    module = importlib.import_module(module_name)
+    return [module.extract_file(p) for p in paths]
+
+def make_chunks(
+        paths: List[Path], chunk_size: Optional[int],
+        n_workers: int) -> List[List[Path]]:
+    '''
+    Splits the list of paths into consecutive chunks with similar total size
+    of the files (in bytes). If the chunk_size is None, the size is chosen
+    so that every worker gets about 4 chunks.
+    '''
+    sizes: List[int] = []
+    for p in paths:
+        try:
+            sizes.append(p.stat().st_size)
+        except OSError:
+            sizes.append(0)
+    if chunk_size is None:
+        chunk_size = max(1, sum(sizes) // (n_workers * 4))
+    chunks: List[List[Path]] = []
+    chunk: List[Path] = []
+    chunk_total = 0
+    for p, size in zip(paths, sizes):
+        chunk.append(p)
+        chunk_total += size
+        if chunk_total >= chunk_size:
+            chunks.append(chunk)
+            chunk = []
+            chunk_total = 0
+    if len(chunk) > 0:
+        chunks.append(chunk)
+    return chunks
+
+def extract_files_parallel(
+        module: ModuleType, paths: Iterable[Path],
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        executor: Optional[Executor] = None
+        ) -> Iterator[Tuple[Path, ExtractedObjects]]:
+    '''
+    The parallel equivalent of calling module.extract_file() for every path.
+    The files are parsed in a process pool in chunks of similar size (in
+    bytes). The results are yielded in the same order as the input paths.
+
+    The executor can be passed to reuse the same process pool for multiple
+    calls (the max_workers is ignored in that case).
+    '''
+    paths = list(paths)
+    if len(paths) == 0:
+        return
+    n_workers = max_workers or os.cpu_count() or 1
+    chunks = make_chunks(paths, chunk_size, n_workers)
+    own_executor = executor is None
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=n_workers)
+    try:
+        futures = [
+            executor.submit(_extract_chunk, module.__name__, chunk)
+            for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            yield from zip(chunk, future.result())
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
@@ -1,26 +1,181 @@
 # AUTOGENERATED! DON'T EDIT!
+from __future__ import annotations
+from typing import TYPE_CHECKING
 from .jpath import *
+from .registry import PropertyInfo
+from .scanner import compile_globs
 
+if TYPE_CHECKING:
+    from .aio import AsyncIterator, PathSource
+    from .profiling import Collector
 
-def files(*resource_pack_paths: Path) -> Iterator[Path]:
+
+NAME = "particle"
+PACK_TYPE = "resource-pack"
+MODEL_HASH = "43561231b73f2b9b2d2186620e9a70c844aa218607ae7517c92c310fa2e4e601"
+
+
+PROPERTIES: Dict[str, PropertyInfo] = {
+}
+
+
+PATHS = ["particles/**/*.json"]
+FILES_GLOB = compile_globs({NAME: PATHS})
+
+
+def iter_files(resource_pack_paths: Iterable[Path]) -> Iterator[Path]:
     for pack_path in resource_pack_paths:
-        for file in pack_path.glob("particles/**/*.json"):
+        for file, _ in FILES_GLOB.iter_files(pack_path):
             yield file
 
 
-def objects(*paths: Path) -> Iterator[Optional[Json]]:
+def files(*resource_pack_paths: Path) -> Iterator[Path]:
+    return iter_files(resource_pack_paths)
+
+
+def aiter_files(resource_pack_paths: Iterable[Path]) -> AsyncIterator[Path]:
+    from .aio import iterate_in_thread
+    return iterate_in_thread(iter_files(resource_pack_paths))
+
+
+OBJECTS_JPATH = compile_jpath([])
+
+
+def iter_objects(paths: Iterable[Path]) -> Iterator[Optional[Json]]:
     for item_path in paths:
         try:
-            with item_path.open('r') as f:
-                yield get_jpath_single(Json(None, json.load(f)), [])
+            data = load_json_file(item_path)
+        except:
+            yield None
+            continue
+        yield OBJECTS_JPATH.find(Json(None, data))
+
+
+def objects(*paths: Path) -> Iterator[Optional[Json]]:
+    return iter_objects(paths)
+
+
+async def aiter_objects(
+        paths: PathSource, max_in_flight: int = 16
+        ) -> AsyncIterator[Optional[Json]]:
+    '''
+    The asynchronous equivalent of iter_objects(). The files are read in
+    worker threads (at most max_in_flight at a time) and parsed as soon
+    as the consumer asks for their objects.
+    '''
+    from .aio import read_files
+    async for item_path, content in read_files(paths, max_in_flight):
+        if content is None:
+            yield None
+            continue
+        try:
+            data = loads_json(content)
         except:
             yield None
+            continue
+        yield OBJECTS_JPATH.find(Json(None, data))
+
 
+IDENTIFIER_JPATH = compile_jpath(["particle_effect", "description", "identifier"])
 
-def identifiers(*objects: Json) -> Iterator[str]:
+
+def iter_identifiers(
+        objects: Iterable[Optional[Json]]) -> Iterator[str]:
     for obj in objects:
-        identifier = get_jpath_single(obj, ["particle_effect", "description", "identifier"])
-        if identifier is not None and isinstance(identifier.value, str):
-            result = identifier.value
+        ref = IDENTIFIER_JPATH.find(obj)
+        if ref is not None:
+            result = ref.value
+            if isinstance(result, str):
+                yield result
+
+
+def identifiers(*objects: Optional[Json]) -> Iterator[str]:
+    return iter_identifiers(objects)
+
+
+EXTRACT_JPATHS = compile_jpath_trie([
+    ["particle_effect", "description", "identifier"],
+], [
+    JpathMode.VALUE,
+])
+
+
+class Particle(NamedTuple):
+    identifier: Optional[str]
+
+
+def extract(obj: Json, item_path: Optional[Path] = None) -> Particle:
+    '''
+    Returns the identifier and all of the properties of the object
+    using a single traversal of its JSON paths.
+    '''
+    found = EXTRACT_JPATHS.find_all(obj)
+    identifier: Optional[str] = None
+    for result in found[0]:
+        if isinstance(result, str):
+            identifier = result
+            break
+    return Particle(
+        identifier)
+
+
+def extract_file(item_path: Path) -> List[Tuple[ObjectPath, Particle]]:
+    '''
+    Returns the paths and the extracted data of all objects from the
+    file.
+    '''
+    try:
+        data = load_json_file(item_path)
+    except:
+        return []
+    return extract_document(data, item_path)
+
+
+def extract_document(
+        data: Any, item_path: Optional[Path] = None
+        ) -> List[Tuple[ObjectPath, Particle]]:
+    '''
+    Returns the paths and the extracted data of all objects from the
+    parsed content of a file.
+    '''
+    return [
+        (object_path, extract(obj, item_path))
+        for object_path, obj in OBJECTS_JPATH.find_all_paths(Json(None, data))]
+
+
+async def aiter_extract_files(
+        paths: PathSource, max_in_flight: int = 16
+        ) -> AsyncIterator[Tuple[Path, List[Tuple[ObjectPath, Particle]]]]:
+    '''
+    The asynchronous equivalent of calling extract_file() for every path.
+    The files are read in worker threads (at most max_in_flight at a time)
+    and parsed as soon as the consumer asks for their results.
+    '''
+    from .aio import read_files
+    async for item_path, content in read_files(paths, max_in_flight):
+        if content is None:
+            yield item_path, []
+            continue
+        try:
+            data = loads_json(content)
+        except:
+            yield item_path, []
+            continue
+        yield item_path, extract_document(data, item_path)
+
+
+def enable_profiling(collector: Optional[Collector] = None) -> Collector:
+    '''
+    Replaces the functions of this module with the instrumented ones
+    that record their statistics in the collector (see profiling.py).
+    '''
+    from .profiling import instrument_namespace
+    return instrument_namespace(globals(), collector)
+
 
-            yield result
+def disable_profiling():
+    '''
+    Restores the original (not instrumented) functions of this module.
+    '''
+    from .profiling import restore_namespace
+    restore_namespace(globals())
@@ -0,0 +1,490 @@
+# This file is NOT autogenerated
+'''
+Opt-in profiling of the generated modules. Enabling the profiling replaces
+the functions, JSON paths and the file loading functions in the namespace
+of a module with instrumented ones, and disabling it restores the
+original objects, so the profiling doesn't cost anything when it's
+disabled.
+
+The statistics are recorded per model and per function (calls, total time
+and self time) together with the number of files opened, bytes read, JSON
+path nodes visited, matches produced by the JSON paths and values dropped
+by the filters. Reading and parsing the files are recorded as the "read"
+and "parse" functions of the model.
+
+The asynchronous functions aren't timed (only the synchronous functions
+that they call are).
+'''
+from typing import (
+    Any, Dict, Iterator, List, Optional, Tuple, Union, Callable, TYPE_CHECKING)
+from pathlib import Path
+from contextlib import contextmanager
+import functools
+import json
+import threading
+import time
+# inspect is imported by the functions that use it (importing it takes
+# longer than importing the rest of the package)
+
+from .jpath import (
+    JpathMatcher, JpathMode, JpathTrie, Json, JsonKey, loads_json, _children,
+    _KEY)
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+Namespace = Dict[str, Any]
+
+# Instrumenting the functions that enable the profiling would make it
+# impossible to disable it
+_NOT_INSTRUMENTED = {'enable_profiling', 'disable_profiling'}
+
+class FunctionStats:
+    __slots__ = ('calls', 'time', 'self_time')
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0  # Including the time of the instrumented callees
+        self.self_time = 0.0
+
+class ModelStats:
+    __slots__ = (
+        'files_opened', 'bytes_read', 'nodes_visited', 'matches', 'dropped',
+        'functions')
+
+    def __init__(self):
+        self.files_opened = 0
+        self.bytes_read = 0
+        self.nodes_visited = 0
+        self.matches = 0
+        self.dropped = 0
+        self.functions: Dict[str, FunctionStats] = {}
+
+    def function(self, name: str) -> FunctionStats:
+        stats = self.functions.get(name)
+        if stats is None:
+            stats = self.functions[name] = FunctionStats()
+        return stats
+
+class _ThreadState(threading.local):
+    def __init__(self):
+        # The frames: [stack, start, overhead at start, time of the callees]
+        self.frames: List[list] = []
+        # The time spent on counting the visited nodes (subtracted from the
+        # times of the functions)
+        self.overhead = 0.0
+
+class Collector:
+    '''
+    Collects the statistics of the instrumented modules. Counting the
+    visited nodes of the JSON paths needs an additional traversal of the
+    objects. Its time isn't included in the results but it makes the
+    profiled code slower, so it can be disabled with count_nodes.
+    '''
+    def __init__(self, count_nodes: bool = True):
+        self.count_nodes = count_nodes
+        self.models: Dict[str, ModelStats] = {}
+        # The self times of the stacks of the called functions
+        self.stacks: Dict[Tuple[str, ...], float] = {}
+        self._state = _ThreadState()
+
+    def reset(self):
+        self.models.clear()
+        self.stacks.clear()
+
+    def model(self, name: str) -> ModelStats:
+        stats = self.models.get(name)
+        if stats is None:
+            stats = self.models[name] = ModelStats()
+        return stats
+
+    def _enter(self, model: str, name: str) -> list:
+        state = self._state
+        frames = state.frames
+        label = f'{model}.{name}'
+        stack = frames[-1][0] + (label,) if frames else (label,)
+        frame = [stack, time.perf_counter(), state.overhead, 0.0]
+        frames.append(frame)
+        return frame
+
+    def _exit(self, frame: list, model: str, name: str):
+        end = time.perf_counter()
+        state = self._state
+        state.frames.pop()
+        stack, start, overhead, callees = frame
+        elapsed = end - start - (state.overhead - overhead)
+        stats = self.model(model).function(name)
+        stats.time += elapsed
+        stats.self_time += elapsed - callees
+        self.stacks[stack] = self.stacks.get(stack, 0.0) + elapsed - callees
+        if state.frames:
+            state.frames[-1][3] += elapsed
+
+    def _timed(
+            self, model: str, name: str, iterator: Iterator[Any],
+            count_matches: bool = False) -> Iterator[Any]:
+        '''
+        Times every step of the iterator (the time between the steps belongs
+        to the consumer).
+        '''
+        stats = self.model(model)
+        while True:
+            frame = self._enter(model, name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._exit(frame, model, name)
+            if count_matches:
+                stats.matches += 1
+            yield item
+
+    def _count_nodes(self, model: str, jpath: Any, key: Any, value: Any):
+        if not self.count_nodes:
+            return
+        start = time.perf_counter()
+        if isinstance(jpath, JpathTrie):
+            count = _count_trie_nodes(jpath, key, value)
+        else:
+            count = _count_matcher_nodes(jpath, key, value)
+        self.model(model).nodes_visited += count
+        self._state.overhead += time.perf_counter() - start
+
+    def wrap_function(self, model: str, name: str, f: Callable) -> Callable:
+        '''
+        Returns the instrumented version of the function. The functions
+        that return iterators are timed when the iterators are consumed.
+        The processing functions (process_*) count the rejected values.
+        '''
+        import inspect
+        if inspect.isgeneratorfunction(f):
+            @functools.wraps(f)
+            def generator_wrapper(*args, **kwargs):
+                self.model(model).function(name).calls += 1
+                return self._timed(model, name, f(*args, **kwargs))
+            return generator_wrapper
+        filters = name.startswith('process_')
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            stats = self.model(model)
+            stats.function(name).calls += 1
+            frame = self._enter(model, name)
+            try:
+                result = f(*args, **kwargs)
+            finally:
+                self._exit(frame, model, name)
+            if filters and result is None:
+                stats.dropped += 1
+            return result
+        return wrapper
+
+    def wrap_loads_json(self, model: str) -> Callable:
+        @functools.wraps(loads_json)
+        def wrapper(data: Any) -> Any:
+            stats = self.model(model)
+            stats.function('parse').calls += 1
+            stats.files_opened += 1
+            stats.bytes_read += len(data)
+            frame = self._enter(model, 'parse')
+            try:
+                return loads_json(data)
+            finally:
+                self._exit(frame, model, 'parse')
+        return wrapper
+
+    def wrap_load_json_file(self, model: str) -> Callable:
+        '''
+        The instrumented load_json_file. It reads the files without
+        memory mapping to separate the time of reading and parsing.
+        '''
+        parse = self.wrap_loads_json(model)
+
+        def load_json_file(path: Path) -> Any:
+            stats = self.model(model)
+            stats.function('read').calls += 1
+            frame = self._enter(model, 'read')
+            try:
+                data = path.read_bytes()
+            finally:
+                self._exit(frame, model, 'read')
+            return parse(data)
+        return load_json_file
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'models': {
+                model: {
+                    'files_opened': stats.files_opened,
+                    'bytes_read': stats.bytes_read,
+                    'nodes_visited': stats.nodes_visited,
+                    'matches': stats.matches,
+                    'dropped': stats.dropped,
+                    'functions': {
+                        name: {
+                            'calls': f.calls,
+                            'time': f.time,
+                            'self_time': f.self_time,
+                        }
+                        for name, f in sorted(stats.functions.items())},
+                }
+                for model, stats in sorted(self.models.items())},
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_folded(self) -> str:
+        '''
+        Returns the self times of the call stacks in the folded stack format
+        (one "frame;frame;frame microseconds" line per stack) used by the
+        flame graph tools.
+        '''
+        return ''.join(
+            f'{";".join(stack)} {round(t * 1_000_000)}\n'
+            for stack, t in sorted(self.stacks.items()))
+
+class _ProfiledMatcher:
+    '''
+    JpathMatcher that records the time of its methods and the number of the
+    visited nodes and the matches.
+    '''
+    __slots__ = ('_collector', '_model', '_name', '_jpath')
+
+    def __init__(
+            self, collector: Collector, model: str, name: str,
+            jpath: JpathMatcher):
+        self._collector = collector
+        self._model = model
+        self._name = name
+        self._jpath = jpath
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._jpath, name)
+
+    def iterate(
+            self, value: Any, key: Optional[JsonKey] = None,
+            mode: JpathMode = JpathMode.JSON) -> Iterator[Any]:
+        c = self._collector
+        c.model(self._model).function(self._name).calls += 1
+        c._count_nodes(self._model, self._jpath, key, value)
+        return c._timed(
+            self._model, self._name, self._jpath.iterate(value, key, mode),
+            True)
+
+    # The None objects (the files that can't be loaded) have no matches and
+    # aren't recorded, like in JpathMatcher
+    def find_all(self, obj: Optional[Json]) -> Iterator[Json]:
+        if obj is None:
+            return iter(())
+        return self.iterate(obj.value, obj.key)
+
+    def find_all_keys(
+            self, obj: Optional[Json]) -> Iterator[Optional[JsonKey]]:
+        if obj is None:
+            return iter(())
+        return self.iterate(obj.value, obj.key, JpathMode.KEY)
+
+    def find_all_values(self, obj: Optional[Json]) -> Iterator[Any]:
+        if obj is None:
+            return iter(())
+        return self.iterate(obj.value, obj.key, JpathMode.VALUE)
+
+    def find_all_paths(
+            self, obj: Optional[Json], prefix: Tuple = ()) -> Iterator[Any]:
+        if obj is None:
+            return iter(())
+        c = self._collector
+        c.model(self._model).function(self._name).calls += 1
+        c._count_nodes(self._model, self._jpath, obj.key, obj.value)
+        return c._timed(
+            self._model, self._name, self._jpath.find_all_paths(obj, prefix),
+            True)
+
+    def find(self, obj: Optional[Json]) -> Optional[Json]:
+        if obj is None:
+            return None
+        c = self._collector
+        stats = c.model(self._model)
+        stats.function(self._name).calls += 1
+        c._count_nodes(self._model, self._jpath, obj.key, obj.value)
+        frame = c._enter(self._model, self._name)
+        try:
+            result = self._jpath.find(obj)
+        finally:
+            c._exit(frame, self._model, self._name)
+        if result is not None:
+            stats.matches += 1
+        return result
+
+class _ProfiledTrie:
+    '''
+    JpathTrie that records the time of find_all() and the number of the
+    visited nodes and the matches.
+    '''
+    __slots__ = ('_collector', '_model', '_name', '_jpath')
+
+    def __init__(
+            self, collector: Collector, model: str, name: str,
+            jpath: JpathTrie):
+        self._collector = collector
+        self._model = model
+        self._name = name
+        self._jpath = jpath
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._jpath, name)
+
+    def find_all(self, obj: Optional[Json]) -> List[List[Any]]:
+        if obj is None:
+            return self._jpath.find_all(None)
+        c = self._collector
+        stats = c.model(self._model)
+        stats.function(self._name).calls += 1
+        c._count_nodes(self._model, self._jpath, obj.key, obj.value)
+        frame = c._enter(self._model, self._name)
+        try:
+            result = self._jpath.find_all(obj)
+        finally:
+            c._exit(frame, self._model, self._name)
+        stats.matches += sum(len(r) for r in result)
+        return result
+
+def _count_matcher_nodes(matcher: JpathMatcher, key: Any, value: Any) -> int:
+    steps = matcher.steps
+    end = len(steps)
+    count = 0
+    stack = [(0, key, value)]
+    while stack:
+        depth, key, value = stack.pop()
+        count += 1
+        if depth < end:
+            kind, arg = steps[depth]
+            for k, v in _children(kind, arg, key, value):
+                stack.append((depth + 1, k, v))
+    return count
+
+def _count_trie_nodes(trie: JpathTrie, key: Any, value: Any) -> int:
+    count = 0
+    stack = [(trie.root, key, value)]
+    while stack:
+        node, key, value = stack.pop()
+        count += 1
+        for k, child in node.keys.items():
+            for child_key, child_value in _children(_KEY, k, key, value):
+                stack.append((child, child_key, child_value))
+        for kind, arg, child in node.wildcards:
+            for child_key, child_value in _children(kind, arg, key, value):
+                stack.append((child, child_key, child_value))
+    return count
+
+# The original objects of the instrumented namespaces by the module names
+_ORIGINALS: Dict[str, Namespace] = {}
+_lock = threading.Lock()
+
+_collector: Optional[Collector] = None
+
+def get_collector() -> Collector:
+    '''
+    Returns the collector used by default when the profiling is enabled.
+    '''
+    global _collector
+    if _collector is None:
+        _collector = Collector()
+    return _collector
+
+def instrument_namespace(
+        namespace: Namespace, collector: Optional[Collector] = None
+        ) -> Collector:
+    '''
+    Replaces the objects in the namespace of a generated module with the
+    instrumented ones and returns the collector of their statistics. Calling
+    it again replaces the collector.
+    '''
+    import inspect
+    if collector is None:
+        collector = get_collector()
+    restore_namespace(namespace)
+    model = namespace['NAME']
+    module_name = namespace['__name__']
+    originals: Namespace = {}
+    for name, value in list(namespace.items()):
+        if name.startswith('_') or name in _NOT_INSTRUMENTED:
+            continue
+        if isinstance(value, JpathMatcher):
+            replacement: Any = _ProfiledMatcher(collector, model, name, value)
+        elif isinstance(value, JpathTrie):
+            replacement = _ProfiledTrie(collector, model, name, value)
+        elif value is loads_json:
+            replacement = collector.wrap_loads_json(model)
+        elif name == 'load_json_file':
+            replacement = collector.wrap_load_json_file(model)
+        elif (
+                inspect.isfunction(value) and
+                not inspect.iscoroutinefunction(value) and
+                not inspect.isasyncgenfunction(value) and
+                value.__module__ == module_name):
+            replacement = collector.wrap_function(model, name, value)
+        else:
+            continue
+        originals[name] = value
+        namespace[name] = replacement
+    with _lock:
+        _ORIGINALS[module_name] = originals
+    return collector
+
+def restore_namespace(namespace: Namespace):
+    '''
+    Restores the original objects in the namespace instrumented with
+    instrument_namespace().
+    '''
+    with _lock:
+        originals = _ORIGINALS.pop(namespace['__name__'], None)
+    if originals is not None:
+        namespace.update(originals)
+
+def enable(
+        collector: Optional[Collector] = None,
+        models: Optional[List[Union[str, 'ModuleType']]] = None
+        ) -> Collector:
+    '''
+    Enables the profiling of the models (all of them by default).
+    '''
+    if collector is None:
+        collector = get_collector()
+    for module in _modules(models):
+        module.enable_profiling(collector)
+    return collector
+
+def disable(models: Optional[List[Union[str, 'ModuleType']]] = None):
+    '''
+    Disables the profiling of the models (all of them by default).
+    '''
+    for module in _modules(models):
+        module.disable_profiling()
+
+@contextmanager
+def profile(
+        collector: Optional[Collector] = None,
+        models: Optional[List[Union[str, 'ModuleType']]] = None
+        ) -> Iterator[Collector]:
+    '''
+    Enables the profiling of the models for the duration of the with
+    statement.
+    '''
+    if collector is None:
+        collector = Collector()
+    enable(collector, models)
+    try:
+        yield collector
+    finally:
+        disable(models)
+
+def _modules(
+        models: Optional[List[Union[str, 'ModuleType']]]
+        ) -> List['ModuleType']:
+    from .models import MODELS
+    if models is None:
+        return list(MODELS.values())
+    return [MODELS[m] if isinstance(m, str) else m for m in models]
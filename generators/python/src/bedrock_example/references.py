@@ -0,0 +1,533 @@
+# This file is NOT autogenerated
+from typing import (
+    NamedTuple, Tuple, List, Dict, Set, Iterator, Iterable, Optional, Any,
+    TYPE_CHECKING)
+from bisect import bisect_left, insort
+# Defined with the registry so the generated modules don't import this one
+from .registry import PropertyInfo
+
+if TYPE_CHECKING:
+    from .pack_index import IndexEntry, PackIndex
+
+class Reference(NamedTuple):
+    '''
+    An edge of the reference graph.
+
+    - source - the object with the property
+    - property - the name of the property
+    - value - the value of the property (the alias for the alias references)
+    - target_model - the model of the referenced object
+    - target - the identifier of the referenced object (None if the alias
+      can't be resolved)
+    - provider - the object that mapped the alias to the target (None for
+      the direct references)
+    - missing - whether the target isn't defined in the indexed packs
+    '''
+    source: 'IndexEntry'
+    property: str
+    value: str
+    target_model: str
+    target: Optional[str]
+    provider: Optional['IndexEntry']
+    missing: bool
+
+ObjectKey = Tuple[str, str]  # (model, identifier)
+
+class ReferenceGraph:
+    '''
+    The graph of the references between the objects of a PackIndex created
+    with keep_objects=True.
+
+    The alias references (for example the short names of the particle
+    effects used by the animations) are resolved through the alias mappings
+    of the objects that use the referencing object (the map providers, for
+    example the client entities that use the animation). The aliases are
+    resolved with dictionary lookups in the maps built once per provider
+    object, so building the graph takes linear time in the number of the
+    references.
+
+    The graph can be updated after the update of the index (see update()).
+    '''
+    def __init__(self, index: 'PackIndex'):
+        if index.objects is None:
+            raise ValueError(
+                "The reference graph needs a PackIndex with keep_objects=True")
+        from .models import MODELS
+        self.index = index
+        self._properties: Dict[str, Dict[str, PropertyInfo]] = {
+            name: module.PROPERTIES for name, module in MODELS.items()}
+        # The references from every object (in the order of the objects)
+        self._sources: Dict['IndexEntry', List[Reference]] = {}
+        self._outgoing: Dict[ObjectKey, List[Reference]] = {}
+        self._incoming: Dict[ObjectKey, List[Reference]] = {}
+        self._size = 0
+        # The map providers of the objects with the alias references
+        self._users: Dict[ObjectKey, List[Tuple['IndexEntry', Any]]] = {}
+        # The objects with the alias references
+        self._aliased: Dict[ObjectKey, Dict['IndexEntry', Any]] = {}
+        # The alias maps of the providers (built only once per provider)
+        self._maps: Dict['IndexEntry', Dict[str, Dict[str, str]]] = {}
+
+        aliased: List[Tuple['IndexEntry', Any]] = []
+        for entry, data in index.iter_objects():
+            if self._add_direct(entry, data, []):
+                aliased.append((entry, data))
+        for entry, data in aliased:
+            self._add_aliases(entry, data, [])
+
+    def _add_direct(
+            self, entry: 'IndexEntry', data: Any,
+            added: List[Reference]) -> bool:
+        '''
+        Adds the direct references and the alias mappings of the object and
+        registers it as a map provider. Returns whether the object has the
+        alias references.
+        '''
+        self._sources.setdefault(entry, [])
+        has_aliases = False
+        for name, info in self._properties[entry.model].items():
+            if info.kind == 'reference':
+                for value in getattr(data, name):
+                    self._add(
+                        entry, name, value, info.model, value, None, added)
+            elif info.kind == 'alias_mapping':
+                for _, value in getattr(data, name):
+                    self._add(
+                        entry, name, value, info.model, value, None, added)
+                    self._users.setdefault((info.model, value), []).append(
+                        (entry, data))
+            elif info.kind == 'alias_reference':
+                has_aliases = True
+        if has_aliases:
+            self._aliased.setdefault(
+                (entry.model, entry.identifier), {})[entry] = data
+        return has_aliases
+
+    def _add_aliases(
+            self, entry: 'IndexEntry', data: Any, added: List[Reference]):
+        '''
+        Adds the alias references of the object resolved by its current
+        map providers.
+        '''
+        properties = self._properties
+        providers = self._users.get((entry.model, entry.identifier), [])
+        for name, info in properties[entry.model].items():
+            if info.kind != 'alias_reference':
+                continue
+            target_model = properties[info.model][info.map_property].model
+            for alias in getattr(data, name):
+                if len(providers) == 0:
+                    self._add(
+                        entry, name, alias, target_model, None, None, added)
+                for provider, provider_data in providers:
+                    if provider.model != info.model:
+                        continue
+                    maps = self._maps.setdefault(provider, {})
+                    alias_map = maps.get(info.map_property)
+                    if alias_map is None:
+                        alias_map = maps[info.map_property] = dict(
+                            getattr(provider_data, info.map_property))
+                    self._add(
+                        entry, name, alias, target_model,
+                        alias_map.get(alias), provider, added)
+
+    def _add(
+            self, source: 'IndexEntry', property: str, value: str,
+            target_model: str, target: Optional[str],
+            provider: Optional['IndexEntry'], added: List[Reference]):
+        missing = (
+            target is None or
+            not self.index.contains(target, target_model))
+        reference = Reference(
+            source, property, value, target_model, target, provider, missing)
+        added.append(reference)
+        self._sources[source].append(reference)
+        self._outgoing.setdefault(
+            (source.model, source.identifier), []).append(reference)
+        if target is not None:
+            self._incoming.setdefault(
+                (target_model, target), []).append(reference)
+        self._size += 1
+
+    def _remove(self, references: List[Reference]):
+        '''
+        Removes the references from the graph.
+        '''
+        removed = {id(r) for r in references}
+        for source in {r.source for r in references}:
+            if source in self._sources:
+                self._sources[source] = [
+                    r for r in self._sources[source] if id(r) not in removed]
+        for key in {(r.source.model, r.source.identifier) for r in references}:
+            self._filter(self._outgoing, key, removed)
+        for key in {
+                (r.target_model, r.target) for r in references
+                if r.target is not None}:
+            self._filter(self._incoming, key, removed)
+        self._size -= len(references)
+
+    @staticmethod
+    def _filter(
+            references: Dict[ObjectKey, List[Reference]], key: ObjectKey,
+            removed: Set[int]):
+        remaining = [r for r in references[key] if id(r) not in removed]
+        if len(remaining) == 0:
+            del references[key]
+        else:
+            references[key] = remaining
+
+    def update(
+            self, removed: Iterable['IndexEntry'],
+            added: Iterable[Tuple['IndexEntry', Any]]
+            ) -> Tuple[List[Reference], List[Reference]]:
+        '''
+        Updates the graph after the update of the index (see
+        PackIndex.update_files()) with the removed entries and the added
+        entries with their extracted data. Only the references of the
+        changed objects, the alias references resolved by the changed map
+        providers and the references to the changed identifiers are created
+        again. Returns the removed and the added references.
+        '''
+        properties = self._properties
+        removed_references: List[Reference] = []
+        added_references: List[Reference] = []
+        # The objects with the alias references to resolve again
+        relink: Dict['IndexEntry', Any] = {}
+        # The objects that could become defined or undefined
+        changed: Set[ObjectKey] = set()
+
+        removed_entries = set(removed)
+        for entry in removed_entries:
+            key = (entry.model, entry.identifier)
+            changed.add(key)
+            references = self._sources.pop(entry, [])
+            removed_references.extend(references)
+            self._maps.pop(entry, None)
+            aliased = self._aliased.get(key)
+            if aliased is not None:
+                aliased.pop(entry, None)
+                if len(aliased) == 0:
+                    del self._aliased[key]
+            for reference in references:
+                if properties[entry.model][reference.property].kind != (
+                        'alias_mapping'):
+                    continue
+                user_key = (reference.target_model, reference.value)
+                users = [
+                    u for u in self._users.get(user_key, ())
+                    if u[0] not in removed_entries]
+                if len(users) == 0:
+                    self._users.pop(user_key, None)
+                else:
+                    self._users[user_key] = users
+                relink.update(self._aliased.get(user_key, {}))
+        for entry in removed_entries:
+            relink.pop(entry, None)
+
+        new_aliased: List[Tuple['IndexEntry', Any]] = []
+        for entry, data in added:
+            changed.add((entry.model, entry.identifier))
+            start = len(added_references)
+            if self._add_direct(entry, data, added_references):
+                new_aliased.append((entry, data))
+            for reference in added_references[start:]:
+                if properties[entry.model][reference.property].kind == (
+                        'alias_mapping'):
+                    relink.update(self._aliased.get(
+                        (reference.target_model, reference.value), {}))
+        for entry, _ in new_aliased:
+            relink.pop(entry, None)
+
+        # The alias references of the other objects resolved by the removed
+        # or added map providers
+        for entry in relink:
+            kinds = properties[entry.model]
+            removed_references.extend(
+                r for r in self._sources[entry]
+                if kinds[r.property].kind == 'alias_reference')
+        self._remove(removed_references)
+        for entry, data in relink.items():
+            self._add_aliases(entry, data, added_references)
+        for entry, data in new_aliased:
+            self._add_aliases(entry, data, added_references)
+
+        # The references to the objects that became defined or undefined
+        stale: List[Reference] = []
+        for model, identifier in changed:
+            missing = not self.index.contains(identifier, model)
+            stale.extend(
+                r for r in self._incoming.get((model, identifier), ())
+                if r.missing != missing)
+        self._remove(stale)
+        removed_references.extend(stale)
+        for r in stale:
+            self._add(
+                r.source, r.property, r.value, r.target_model, r.target,
+                r.provider, added_references)
+        return removed_references, added_references
+
+    @property
+    def edges(self) -> List[Reference]:
+        '''
+        All references of the graph.
+        '''
+        return [r for references in self._sources.values() for r in references]
+
+    def references(self, model: str, identifier: str) -> List[Reference]:
+        '''
+        Returns the references from the object.
+        '''
+        return list(self._outgoing.get((model, identifier), ()))
+
+    def referenced_by(self, model: str, identifier: str) -> List[Reference]:
+        '''
+        Returns the references to the object (also if it isn't defined).
+        '''
+        return list(self._incoming.get((model, identifier), ()))
+
+    def missing(self) -> Iterator[Reference]:
+        '''
+        Yields the references to the objects that aren't defined and the
+        aliases that can't be resolved.
+        '''
+        for reference in self:
+            if reference.missing:
+                yield reference
+
+    def __iter__(self) -> Iterator[Reference]:
+        for references in self._sources.values():
+            yield from references
+
+    def __len__(self) -> int:
+        return self._size
+
+class ReferenceUse(NamedTuple):
+    '''
+    A use of an object found in the ReverseIndex: the object (model and
+    identifier) that references the target with the property.
+    '''
+    target_model: str
+    target: str
+    model: str
+    identifier: str
+    property: str
+
+class ReverseIndex:
+    '''
+    The index of the uses of the objects ("who uses X"). Maps the
+    identifiers of the referenced objects to the objects that reference
+    them with the references, the alias mappings and the resolved alias
+    references of the ReferenceGraph. Every (model, identifier, property)
+    of the user is listed only once for every target.
+
+    The queries can be limited to the model of the targets (target_model),
+    the model of the users (model) and their property. The identifiers are
+    kept sorted, so the queries by the prefix of the identifier use binary
+    search. The index can be updated with the changes of the graph (see
+    update()).
+    '''
+    def __init__(self, graph: ReferenceGraph):
+        self.index = graph.index
+        self._uses: Dict[str, List[ReferenceUse]] = {}
+        # The numbers of the references behind every use
+        self._counts: Dict[ReferenceUse, int] = {}
+        # The numbers of the uses of the (target model, target) pairs
+        self._used: Dict[ObjectKey, int] = {}
+        for reference in graph:
+            self._add(reference)
+        self._targets: List[str] = sorted(self._uses)
+        self._cumulative: Dict[
+            Tuple[Optional[str], Optional[str], Optional[str]], List[int]] = {}
+
+    @staticmethod
+    def _use(reference: Reference) -> ReferenceUse:
+        source = reference.source
+        return ReferenceUse(
+            reference.target_model, reference.target, source.model,
+            source.identifier, reference.property)
+
+    def _add(self, reference: Reference) -> bool:
+        '''
+        Adds the use of the reference. Returns True if the target wasn't
+        used before.
+        '''
+        if reference.target is None:
+            return False
+        use = self._use(reference)
+        count = self._counts.get(use, 0)
+        self._counts[use] = count + 1
+        if count > 0:
+            return False
+        pair = (use.target_model, use.target)
+        self._used[pair] = self._used.get(pair, 0) + 1
+        uses = self._uses.get(use.target)
+        if uses is None:
+            self._uses[use.target] = [use]
+            return True
+        uses.append(use)
+        return False
+
+    def update(
+            self, removed: Iterable[Reference], added: Iterable[Reference]):
+        '''
+        Updates the index after the update of the graph with the removed
+        and the added references (see ReferenceGraph.update()).
+        '''
+        for reference in removed:
+            if reference.target is None:
+                continue
+            use = self._use(reference)
+            count = self._counts[use] - 1
+            if count > 0:
+                self._counts[use] = count
+                continue
+            del self._counts[use]
+            pair = (use.target_model, use.target)
+            if self._used[pair] == 1:
+                del self._used[pair]
+            else:
+                self._used[pair] -= 1
+            uses = self._uses[use.target]
+            uses.remove(use)
+            if len(uses) == 0:
+                del self._uses[use.target]
+                del self._targets[bisect_left(self._targets, use.target)]
+        for reference in added:
+            if self._add(reference):
+                insort(self._targets, reference.target)
+        self._cumulative.clear()
+
+    def _select(
+            self, uses: List[ReferenceUse], target_model: Optional[str],
+            model: Optional[str], property: Optional[str]
+            ) -> List[ReferenceUse]:
+        if target_model is None and model is None and property is None:
+            return uses
+        return [
+            u for u in uses
+            if (target_model is None or u.target_model == target_model) and
+            (model is None or u.model == model) and
+            (property is None or u.property == property)]
+
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        '''
+        Returns the range of the indices of the sorted identifiers that
+        start with the prefix.
+        '''
+        targets = self._targets
+        start = bisect_left(targets, prefix)
+        # The identifiers with the prefix are right after the start
+        low, high = start, len(targets)
+        while low < high:
+            middle = (low + high) // 2
+            if targets[middle].startswith(prefix):
+                low = middle + 1
+            else:
+                high = middle
+        return start, low
+
+    def _prefix_targets(self, prefix: str) -> List[str]:
+        start, end = self._prefix_range(prefix)
+        return self._targets[start:end]
+
+    def _cumulative_counts(
+            self, target_model: Optional[str], model: Optional[str],
+            property: Optional[str]) -> List[int]:
+        '''
+        Returns the cumulative numbers of the uses of the sorted identifiers
+        (matching the filters), computed once for every combination of the
+        filters.
+        '''
+        key = (target_model, model, property)
+        cumulative = self._cumulative.get(key)
+        if cumulative is None:
+            cumulative = [0]
+            total = 0
+            for target in self._targets:
+                total += len(self._select(
+                    self._uses[target], target_model, model, property))
+                cumulative.append(total)
+            self._cumulative[key] = cumulative
+        return cumulative
+
+    def uses(
+            self, target: str, target_model: Optional[str] = None,
+            model: Optional[str] = None,
+            property: Optional[str] = None) -> List[ReferenceUse]:
+        '''
+        Returns the uses of the object with the identifier.
+        '''
+        return list(self._select(
+            self._uses.get(target, []), target_model, model, property))
+
+    def uses_prefix(
+            self, prefix: str, target_model: Optional[str] = None,
+            model: Optional[str] = None,
+            property: Optional[str] = None) -> List[ReferenceUse]:
+        '''
+        Returns the uses of the objects with the identifiers that start with
+        the prefix (sorted by the identifiers).
+        '''
+        result: List[ReferenceUse] = []
+        for target in self._prefix_targets(prefix):
+            result.extend(self._select(
+                self._uses[target], target_model, model, property))
+        return result
+
+    def count(
+            self, target: str, target_model: Optional[str] = None,
+            model: Optional[str] = None,
+            property: Optional[str] = None) -> int:
+        return len(self._select(
+            self._uses.get(target, []), target_model, model, property))
+
+    def counts(
+            self, prefix: str = '', target_model: Optional[str] = None,
+            model: Optional[str] = None,
+            property: Optional[str] = None) -> Dict[str, int]:
+        '''
+        Returns the numbers of the uses of the used objects with the
+        identifiers that start with the prefix.
+        '''
+        result: Dict[str, int] = {}
+        for target in self._prefix_targets(prefix):
+            n = len(self._select(
+                self._uses[target], target_model, model, property))
+            if n > 0:
+                result[target] = n
+        return result
+
+    def count_prefix(
+            self, prefix: str, target_model: Optional[str] = None,
+            model: Optional[str] = None,
+            property: Optional[str] = None) -> int:
+        '''
+        Returns the total number of the uses of the objects with the
+        identifiers that start with the prefix.
+        '''
+        start, end = self._prefix_range(prefix)
+        cumulative = self._cumulative_counts(target_model, model, property)
+        return cumulative[end] - cumulative[start]
+
+    def unused(self, model: str) -> List[str]:
+        '''
+        Returns the identifiers of the objects of the model (defined in the
+        indexed packs) that aren't used by any object.
+        '''
+        used = self._used
+        return sorted(
+            identifier for identifier in self.index.identifiers(model)
+            if (model, identifier) not in used)
+
+    def targets(self, prefix: str = '') -> List[str]:
+        '''
+        Returns the identifiers of the used objects that start with the
+        prefix.
+        '''
+        return self._prefix_targets(prefix)
+
+    def __contains__(self, target: str) -> bool:
+        return target in self._uses
+
+    def __len__(self) -> int:
+        return len(self._targets)
@@ -0,0 +1,52 @@
+# This file is NOT autogenerated
+from typing import Dict, Iterable, Iterator, Mapping, NamedTuple, Optional
+from types import ModuleType
+import importlib
+
+class PropertyInfo(NamedTuple):
+    '''
+    The description of a property of a model (the PROPERTIES of the
+    generated modules).
+
+    - kind - "reference", "alias_reference", "alias_mapping" or
+      "custom_value"
+    - model - the referenced model (the map provider of the alias
+      references)
+    - map_property - the property of the map provider that maps the aliases
+      to the identifiers (only for the alias references)
+    '''
+    kind: str
+    model: Optional[str]
+    map_property: Optional[str]
+
+class ModelRegistry(Mapping[str, ModuleType]):
+    '''
+    The modules of the models by their names. The modules are imported
+    when they're used for the first time, so the programs that use only
+    some of the models don't import the others.
+    '''
+    def __init__(self, package: str, names: Iterable[str]):
+        self.package = package
+        self._names = list(names)
+        self._modules: Dict[str, ModuleType] = {}
+
+    def __getitem__(self, name: str) -> ModuleType:
+        module = self._modules.get(name)
+        if module is None:
+            if name not in self._names:
+                raise KeyError(name)
+            module = self._modules[name] = importlib.import_module(
+                f'{self.package}.{name}')
+        return module
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f'ModelRegistry({self._names!r})'
@@ -0,0 +1,232 @@
+# This file is NOT autogenerated
+from typing import (
+    Tuple, List, Dict, Iterator, Iterable, FrozenSet, Union, Pattern,
+    TYPE_CHECKING)
+from types import ModuleType
+from pathlib import Path
+import fnmatch
+import os
+import re
+
+if TYPE_CHECKING:
+    from .archive import Archive, ArchivePath
+
+ARCHIVE_SUFFIXES = ('.mcpack', '.mcaddon', '.zip')
+
+# Segments of the compiled glob patterns
+_RECURSIVE = None  # "**"
+Segment = Union[None, str, Pattern]
+
+# (index of the pattern, index of the segment)
+GlobState = Tuple[int, int]
+GlobStates = FrozenSet[GlobState]
+
+def is_archive(path: Union[Path, str]) -> bool:
+    '''
+    Checks if the path is a file with the extension of an archive.
+    '''
+    return (
+        os.path.splitext(path)[1].lower() in ARCHIVE_SUFFIXES and
+        os.path.isfile(path))
+
+def _compile_segment(segment: str) -> Segment:
+    if segment == '**':
+        return _RECURSIVE
+    if any(c in segment for c in '*?['):
+        return re.compile(fnmatch.translate(segment))
+    return segment
+
+def _match_segment(segment: Segment, name: str) -> bool:
+    if isinstance(segment, str):
+        return segment == name
+    return segment.match(name) is not None  # type: ignore
+
+class GlobMatcher:
+    '''
+    A set of labeled glob patterns (with the same syntax as pathlib.glob)
+    compiled into a single matcher. The matcher walks the directory tree
+    once for all of the patterns, doesn't enter the directories that can't
+    contain matching files and yields every matching file only once.
+    '''
+    def __init__(self, patterns: Dict[str, List[str]]):
+        self.patterns = patterns
+        self.labels: List[str] = []
+        self.segments: List[List[Segment]] = []
+        for label, label_patterns in patterns.items():
+            for pattern in label_patterns:
+                self.labels.append(label)
+                self.segments.append([
+                    _compile_segment(s) for s in pattern.split('/')
+                    if s not in ('', '.')])
+        self.start = self._closure(
+            (i, 0) for i in range(len(self.segments)))
+
+    def _closure(self, states: Iterable[GlobState]) -> GlobStates:
+        '''
+        Adds the states that can be reached by matching "**" with zero
+        directories.
+        '''
+        result = set()
+        for i, j in states:
+            result.add((i, j))
+            segments = self.segments[i]
+            while j < len(segments) - 1 and segments[j] is _RECURSIVE:
+                j += 1
+                result.add((i, j))
+        return frozenset(result)
+
+    def step_directory(
+            self, states: GlobStates, name: str,
+            recursive: bool = True) -> GlobStates:
+        '''
+        Returns the states after entering the directory with given name.
+        The recursive=False disables matching of the directory with "**"
+        (used for symlinks to avoid infinite loops).
+        '''
+        result: List[GlobState] = []
+        for i, j in states:
+            segments = self.segments[i]
+            if j >= len(segments) - 1:  # The last segment matches files
+                continue
+            segment = segments[j]
+            if segment is _RECURSIVE:
+                if recursive:
+                    result.append((i, j))
+            elif _match_segment(segment, name):
+                result.append((i, j + 1))
+        return self._closure(result)
+
+    def match_file(self, states: GlobStates, name: str) -> List[str]:
+        '''
+        Returns the labels of the patterns that match the file with given
+        name in the directory with given states.
+        '''
+        result: List[str] = []
+        for i, j in states:
+            segments = self.segments[i]
+            if j != len(segments) - 1:
+                continue
+            segment = segments[j]
+            # Like in pathlib, "**" at the end matches only directories
+            if segment is not _RECURSIVE and _match_segment(segment, name):
+                label = self.labels[i]
+                if label not in result:
+                    result.append(label)
+        return result
+
+    def match(self, relative_path: str) -> List[str]:
+        '''
+        Returns the labels of the patterns that match the path relative to
+        the root of the pack (with "/" as a separator).
+        '''
+        *directories, name = relative_path.split('/')
+        states = self.start
+        for directory in directories:
+            states = self.step_directory(states, directory)
+            if not states:
+                return []
+        return self.match_file(states, name)
+
+    def iter_files(self, root: Path) -> Iterator[Tuple[Path, List[str]]]:
+        '''
+        Walks the directory tree of the root once and yields the matching
+        files with the labels of the patterns they match. The entries of
+        every directory are visited in sorted order.
+
+        If the root is an archive (.mcpack, .mcaddon or .zip), yields the
+        matching files of the packs inside of it (see iter_archive()).
+        '''
+        if is_archive(root):
+            # The archive module (and zipfile) is imported only if it's used
+            from .archive import open_archive
+            archive = open_archive(Path(root))
+            if archive is None:
+                return
+            for pack_archive, prefix in archive.pack_roots():
+                yield from self.iter_archive(pack_archive, prefix)
+            return
+        stack: List[Tuple[str, GlobStates]] = [(os.fspath(root), self.start)]
+        while stack:
+            directory, states = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            subdirectories: List[Tuple[str, GlobStates]] = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    new_states = self.step_directory(
+                        states, entry.name, not entry.is_symlink())
+                    if new_states:
+                        subdirectories.append((entry.path, new_states))
+                else:
+                    labels = self.match_file(states, entry.name)
+                    if labels:
+                        yield Path(entry.path), labels
+            stack.extend(reversed(subdirectories))
+
+    def iter_archive(
+            self, archive: 'Archive', prefix: str = ''
+            ) -> Iterator[Tuple['ArchivePath', List[str]]]:
+        '''
+        Yields the matching files of the pack with the names starting with
+        the prefix in the archive and the labels of the patterns they match.
+        Only the names from the central directory of the archive are
+        matched (the files aren't read). The files are yielded in sorted
+        order.
+        '''
+        from .archive import ArchivePath
+        # The states of the directories (relative to the prefix)
+        directory_states: Dict[str, GlobStates] = {'': self.start}
+
+        def get_states(directory: str) -> GlobStates:
+            states = directory_states.get(directory)
+            if states is None:
+                parent, _, name = directory.rpartition('/')
+                states = get_states(parent)
+                if states:
+                    states = self.step_directory(states, name)
+                directory_states[directory] = states
+            return states
+
+        for name in sorted(archive.names()):
+            if not name.startswith(prefix):
+                continue
+            directory, _, file_name = name[len(prefix):].rpartition('/')
+            states = get_states(directory)
+            if not states:
+                continue
+            labels = self.match_file(states, file_name)
+            if labels:
+                yield ArchivePath(archive, name), labels
+
+    def scan(self, *roots: Path) -> Dict[str, List[Path]]:
+        '''
+        Returns the lists of matching files for every label.
+        '''
+        result: Dict[str, List[Path]] = {label: [] for label in self.patterns}
+        for root in roots:
+            for path, labels in self.iter_files(root):
+                for label in labels:
+                    result[label].append(path)
+        return result
+
+def compile_globs(patterns: Dict[str, List[str]]) -> GlobMatcher:
+    '''
+    Compiles the labeled glob patterns into a single matcher.
+    '''
+    return GlobMatcher(patterns)
+
+def scan_models(
+        models: Iterable[ModuleType], *pack_paths: Path
+        ) -> Dict[str, List[Path]]:
+    '''
+    Walks every pack once and returns the lists of the files of every model
+    (by the NAME of the model module).
+    '''
+    return compile_globs({m.NAME: m.PATHS for m in models}).scan(*pack_paths)
@@ -0,0 +1,141 @@
+# This file is NOT autogenerated
+from typing import List, Dict, Iterable, Optional, Any, Type
+from pathlib import Path
+from array import array
+from .jpath import ObjectPath
+from .references import PropertyInfo
+
+# The ID of None in the compact objects
+NO_SYMBOL = 0xFFFFFFFF
+
+class SymbolTable:
+    '''
+    The table of the strings that repeat in the extracted data (the
+    identifiers, alias keys, values of the properties, path segments and
+    file paths). Every string is stored only once and has an integer ID,
+    so the equal strings from the table can be compared with "is" and the
+    objects can be stored compactly as arrays of the IDs (compact()).
+    '''
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+        self._paths: Dict[Path, Path] = {}
+
+    def intern(self, value: str) -> str:
+        '''
+        Returns the instance of the string stored in the table (adds the
+        string if it isn't there).
+        '''
+        index = self._ids.get(value)
+        if index is None:
+            index = self.id(value)
+        return self._strings[index]
+
+    def id(self, value: str) -> int:
+        '''
+        Returns the ID of the string (adds the string if it isn't in the
+        table).
+        '''
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def get_id(self, value: str) -> Optional[int]:
+        '''
+        Returns the ID of the string or None if it isn't in the table.
+        '''
+        return self._ids.get(value)
+
+    def symbol(self, index: int) -> str:
+        return self._strings[index]
+
+    def intern_path(self, path: Path) -> Path:
+        '''
+        Returns the shared instance of an equal path.
+        '''
+        return self._paths.setdefault(path, path)
+
+    def intern_object_path(self, object_path: ObjectPath) -> ObjectPath:
+        return tuple(
+            self.intern(k) if isinstance(k, str) else k for k in object_path)
+
+    def intern_extracted(
+            self, data: Any, properties: Dict[str, PropertyInfo]) -> Any:
+        '''
+        Returns the copy of the extracted data (a NamedTuple returned by the
+        extract() function of a model) with the interned strings.
+        '''
+        intern = self.intern
+        values: List[Any] = [
+            None if data.identifier is None else intern(data.identifier)]
+        for name, info in properties.items():
+            if info.kind == 'alias_mapping':
+                values.append([
+                    (intern(k), intern(v)) for k, v in getattr(data, name)])
+            else:
+                values.append([intern(v) for v in getattr(data, name)])
+        return data._make(values)
+
+    def encode(self, values: Iterable[str]) -> 'array[int]':
+        '''
+        Returns the array of the IDs of the strings.
+        '''
+        id = self.id
+        return array('I', [id(v) for v in values])
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        strings = self._strings
+        return [strings[i] for i in ids]
+
+    def compact(
+            self, data: Any,
+            properties: Dict[str, PropertyInfo]) -> 'array[int]':
+        '''
+        Returns the extracted data stored as a single array of the IDs of the
+        symbols: the identifier, the end offsets of the values of every
+        property and the values (the alias mappings store the keys and the
+        values one after another).
+        '''
+        id = self.id
+        values: List[int] = []
+        ends: List[int] = []
+        for name, info in properties.items():
+            if info.kind == 'alias_mapping':
+                for key, value in getattr(data, name):
+                    values.append(id(key))
+                    values.append(id(value))
+            else:
+                values.extend(id(v) for v in getattr(data, name))
+            ends.append(len(values))
+        identifier = NO_SYMBOL if data.identifier is None else id(data.identifier)
+        return array('I', [identifier] + ends + values)
+
+    def expand(
+            self, compact: 'array[int]', data_type: Type,
+            properties: Dict[str, PropertyInfo]) -> Any:
+        '''
+        Returns the extracted data (an instance of the data_type NamedTuple)
+        from its compact version.
+        '''
+        strings = self._strings
+        result: List[Any] = [
+            None if compact[0] == NO_SYMBOL else strings[compact[0]]]
+        start = offset = len(properties) + 1
+        for i, info in enumerate(properties.values(), 1):
+            end = offset + compact[i]
+            if info.kind == 'alias_mapping':
+                result.append([
+                    (strings[compact[j]], strings[compact[j + 1]])
+                    for j in range(start, end, 2)])
+            else:
+                result.append([strings[j] for j in compact[start:end]])
+            start = end
+        return data_type._make(result)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._ids
+
+    def __len__(self) -> int:
+        return len(self._strings)
@@ -0,0 +1,308 @@
+# This file is NOT autogenerated
+from typing import (
+    NamedTuple, Tuple, List, Dict, Set, Iterable, Optional, Callable, Union)
+from pathlib import Path
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from .pack_index import IndexEntry, PackIndex
+from .references import ReferenceGraph, ReverseIndex
+
+# inotify(7) constants
+_IN_MODIFY = 0x2
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO |
+    _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF)
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        libc.inotify_init1  # Not available in old versions of libc
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+class InotifyBackend:
+    '''
+    Source of the changed paths that uses inotify (Linux only). Every
+    directory of the packs is watched separately (inotify isn't
+    recursive) and the new directories are added as they appear.
+    '''
+    def __init__(self, roots: Iterable[Path]):
+        libc = _load_libc()
+        if libc is None:
+            raise OSError("inotify isn't available")
+        self._libc = libc
+        self.roots = list(roots)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._paths: Dict[int, Path] = {}  # watch descriptor -> directory
+        for root in self.roots:
+            self._watch_tree(root)
+
+    def _watch_tree(self, root: Path):
+        for directory, _, _ in os.walk(root):
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd >= 0:
+                self._paths[wd] = Path(directory)
+
+    def _unwatch_tree(self, root: Path):
+        for wd, path in list(self._paths.items()):
+            if path == root or root in path.parents:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._paths[wd]
+
+    def read(self, timeout: Optional[float]) -> Tuple[Set[Path], Set[Path]]:
+        '''
+        Waits for the events (at most timeout seconds) and returns the
+        changed paths and the paths from them that are (or were)
+        directories.
+        '''
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set(), set()
+        try:
+            buffer = os.read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return set(), set()
+        changed: Set[Path] = set()
+        directories: Set[Path] = set()
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = _EVENT.unpack_from(buffer, offset)
+            offset += _EVENT.size
+            name = buffer[offset:offset + length].split(b'\0', 1)[0]
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                # Some of the events are lost
+                changed.update(self.roots)
+                continue
+            if mask & _IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+            directory = self._paths.get(wd)
+            if directory is None or len(name) == 0:
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & _IN_ISDIR:
+                directories.add(path)
+                if mask & _IN_MOVED_FROM:
+                    self._unwatch_tree(path)
+                elif mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._watch_tree(path)
+            changed.add(path)
+        return changed, directories
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+class PollingBackend:
+    '''
+    Source of the changed paths that compares the sizes and modification
+    times of the files of the packs every interval seconds.
+    '''
+    def __init__(self, roots: Iterable[Path], interval: float = 1.0):
+        self.roots = list(roots)
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        result: Dict[Path, Tuple[int, int]] = {}
+        for root in self.roots:
+            for directory, _, names in os.walk(root):
+                for name in names:
+                    path = Path(directory, name)
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    result[path] = (stat.st_mtime_ns, stat.st_size)
+        return result
+
+    def read(self, timeout: Optional[float]) -> Tuple[Set[Path], Set[Path]]:
+        '''
+        Waits for the next scan (at most timeout seconds) and returns the
+        changed files (and an empty set of directories, the files of the
+        changed directories are reported separately).
+        '''
+        delay = max(0.0, self._next_scan - time.monotonic())
+        if timeout is not None and timeout < delay:
+            time.sleep(timeout)
+            return set(), set()
+        time.sleep(delay)
+        self._next_scan = time.monotonic() + self.interval
+        snapshot = self._scan()
+        old = self._snapshot
+        self._snapshot = snapshot
+        changed = {p for p in old if p not in snapshot}
+        changed.update(p for p, s in snapshot.items() if old.get(p) != s)
+        return changed, set()
+
+    def close(self):
+        pass
+
+class WatchUpdate(NamedTuple):
+    '''
+    The result of applying a batch of changes to the index.
+    '''
+    files: List[Path]
+    removed: List[IndexEntry]
+    added: List[IndexEntry]
+
+class PackWatcher:
+    '''
+    Keeps a PackIndex up to date with the files of its packs. The changes
+    are collected until there are no new ones for debounce seconds (but
+    not longer than max_delay seconds) and applied in one batch, so
+    multiple quick saves extract the files only once. Only the changed
+    files are extracted again.
+
+    Uses inotify on Linux and polling of the packs every poll_interval
+    seconds on the other systems (or if use_inotify is False).
+
+    The reference graph and the reverse index are created when they're
+    used for the first time and updated with the changes of the index
+    after that.
+    '''
+    def __init__(
+            self, index: PackIndex, debounce: float = 0.2,
+            max_delay: float = 2.0, use_inotify: Optional[bool] = None,
+            poll_interval: float = 1.0):
+        self.index = index
+        self.debounce = debounce
+        self.max_delay = max_delay
+        roots = [p for packs in index.packs.values() for p in packs]
+        if use_inotify is None:
+            use_inotify = _load_libc() is not None
+        if use_inotify:
+            self.backend: Union[InotifyBackend, PollingBackend] = (
+                InotifyBackend(roots))
+        else:
+            self.backend = PollingBackend(roots, poll_interval)
+        self._graph: Optional[ReferenceGraph] = None
+        self._reverse_index: Optional[ReverseIndex] = None
+
+    @property
+    def graph(self) -> ReferenceGraph:
+        '''
+        The reference graph of the index (requires an index created with
+        keep_objects=True).
+        '''
+        if self._graph is None:
+            self._graph = ReferenceGraph(self.index)
+        return self._graph
+
+    @property
+    def reverse_index(self) -> ReverseIndex:
+        '''
+        The index of the uses of the objects.
+        '''
+        if self._reverse_index is None:
+            self._reverse_index = ReverseIndex(self.graph)
+        return self._reverse_index
+
+    def _affected_files(
+            self, changed: Set[Path], directories: Set[Path]) -> List[Path]:
+        '''
+        Returns the files affected by the changes of the paths. The
+        directories (reported by the backend or found on the disk) affect
+        the files inside of them. The other paths are single files.
+        '''
+        indexed = self.index.files()
+        files: List[Path] = []
+        # The directories and the removed paths that aren't indexed (a
+        # removed directory if it contained indexed files)
+        parents: Set[Path] = set()
+        for path in changed:
+            if path.is_dir():
+                parents.add(path)
+                for directory, _, names in os.walk(path):
+                    files.extend(Path(directory, name) for name in names)
+            elif path in directories:
+                parents.add(path)
+            else:
+                files.append(path)
+                if path not in indexed and not path.exists():
+                    parents.add(path)
+        if len(parents) > 0:
+            for file in indexed:
+                if not parents.isdisjoint(file.parents):
+                    files.append(file)
+        # The files of the existing directories are walked and indexed
+        return list(dict.fromkeys(files))
+
+    def poll(self, timeout: Optional[float] = None) -> Optional[WatchUpdate]:
+        '''
+        Waits for the changes (at most timeout seconds), applies them to the
+        index and returns the update or None if there were no changes.
+        '''
+        changed, directories = self.backend.read(timeout)
+        if len(changed) == 0:
+            return None
+        deadline = time.monotonic() + self.max_delay
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            more, more_directories = self.backend.read(
+                min(self.debounce, remaining))
+            if len(more) == 0:
+                break
+            changed.update(more)
+            directories.update(more_directories)
+        files = self._affected_files(changed, directories)
+        removed, added = self.index.update_files(files)
+        if self._graph is not None and (len(removed) > 0 or len(added) > 0):
+            removed_references, added_references = self._graph.update(
+                removed, self.index.iter_objects(files))
+            if self._reverse_index is not None:
+                self._reverse_index.update(
+                    removed_references, added_references)
+        return WatchUpdate(files, removed, added)
+
+    def run(
+            self, callback: Callable[[WatchUpdate], None],
+            stop: Optional[threading.Event] = None,
+            interval: float = 0.5):
+        '''
+        Applies the changes and calls the callback after every update until
+        the stop event is set (checked at least every interval seconds).
+        '''
+        while stop is None or not stop.is_set():
+            update = self.poll(interval)
+            if update is not None:
+                callback(update)
+
+    def close(self):
+        self.backend.close()
+
+    def __enter__(self) -> 'PackWatcher':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,60 @@
+from typing import Dict
+from pathlib import Path
+import json
+import pytest
+
+# The files of a small resource pack with the objects of all models
+RESOURCE_PACK: Dict[str, object] = {
+    'entity/pig.json': {
+        'format_version': '1.10.0',
+        'minecraft:client_entity': {'description': {
+            'identifier': 'minecraft:pig',
+            'animations': {
+                'walk': 'animation.pig.walk',
+                'move': 'animation.quadruped.move',
+                'ctrl': 'controller.animation.pig.move'},
+            'particle_effects': {'smoke': 'minecraft:smoke_particle'},
+            'sound_effect': {'oink': 'mob.pig.say'}}}},
+    'entity/sub/cow.json': {
+        'format_version': '1.10.0',
+        'minecraft:client_entity': {'description': {
+            'identifier': 'minecraft:cow',
+            'animations': {'move': 'animation.quadruped.move'}}}},
+    'animations/pig.animation.json': {
+        'animations': {
+            'animation.pig.walk': {
+                'particle_effects': {'0.0': {'effect': 'smoke'}},
+                'sound_effects': {'0.5': [{'effect': 'oink'}]}},
+            'animation.quadruped.move': {}}},
+    'animation_controllers/pig.animation_controllers.json': {
+        'animation_controllers': {
+            'controller.animation.pig.move': {'states': {'default': {
+                'animations': ['walk', {'move': 'q.is_moving'}],
+                'particle_effects': [{'effect': 'smoke'}],
+                'sound_effects': [{'effect': 'oink'}]}}}}},
+    'particles/smoke.json': {
+        'particle_effect': {'description': {
+            'identifier': 'minecraft:smoke_particle'}}},
+    'sounds/sound_definitions.json': {
+        'format_version': '1.14.0',
+        'sound_definitions': {
+            'mob.pig.say': {'sounds': ['a']},
+            'mob.cow.say': {'sounds': []}}},
+}
+
+def write_pack(path: Path, files: Dict[str, object]) -> Path:
+    '''
+    Writes the files of a pack (the values that aren't strings are saved
+    as JSON).
+    '''
+    for name, content in files.items():
+        file = path / name
+        file.parent.mkdir(parents=True, exist_ok=True)
+        if not isinstance(content, str):
+            content = json.dumps(content, indent=4)
+        file.write_text(content, encoding='utf-8')
+    return path
+
+@pytest.fixture
+def resource_pack(tmp_path: Path) -> Path:
+    return write_pack(tmp_path / 'RP', RESOURCE_PACK)
@@ -0,0 +1,114 @@
+from typing import Dict, List
+from pathlib import Path
+import io
+import re
+import zipfile
+import pytest
+from bedrock_example.archive import ArchivePath, open_archive
+from bedrock_example.models import MODELS
+from bedrock_example.pack_index import PackIndex
+
+MANIFEST = '{"format_version": 2, "header": {"name": "RP"}}'
+# A file that can't be parsed with the standard JSON decoder
+ANIMATIONS = '''\ufeff// Animations of the sheep
+{
+    "animations": {
+        "animation.sheep.walk": {
+            "sound_effects": {"0.5": [{"effect": "baa",},],}, /* sounds */
+        },
+    },
+}
+'''
+
+def _zip_pack(pack: Path, prefix: str = '') -> bytes:
+    '''
+    Returns the content of a zip archive with the files of the pack.
+    '''
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as z:
+        for file in sorted(pack.rglob('*')):
+            if file.is_file():
+                z.write(file, prefix + file.relative_to(pack).as_posix())
+    return buffer.getvalue()
+
+@pytest.fixture
+def pack(resource_pack: Path) -> Path:
+    (resource_pack / 'manifest.json').write_text(MANIFEST)
+    (resource_pack / 'animations/sheep.animation.json').write_text(
+        ANIMATIONS, encoding='utf-8')
+    return resource_pack
+
+@pytest.fixture(params=['mcpack', 'mcaddon', 'zip'])
+def archive(request, tmp_path: Path, pack: Path) -> Path:
+    if request.param == 'mcpack':
+        path = tmp_path / 'RP.mcpack'
+        path.write_bytes(_zip_pack(pack))
+    elif request.param == 'mcaddon':
+        # The pack is an archive inside of the archive
+        path = tmp_path / 'addon.mcaddon'
+        with zipfile.ZipFile(path, 'w') as z:
+            z.writestr('RP.mcpack', _zip_pack(pack))
+    else:
+        # The pack is a directory with a manifest inside of the archive
+        path = tmp_path / 'packs.zip'
+        path.write_bytes(_zip_pack(pack, 'packs/RP/'))
+    return path
+
+def _member(path: Path) -> str:
+    '''
+    Returns the path of the file relative to the pack.
+    '''
+    return re.sub(r'^.*RP(\.mcpack)?/', '', path.as_posix())
+
+def test_archive_files(pack: Path, archive: Path):
+    for name, module in MODELS.items():
+        expected = list(module.files(pack))
+        files = list(module.files(archive))
+        assert all(isinstance(f, ArchivePath) for f in files)
+        assert [_member(f) for f in files] == [_member(f) for f in expected]
+        assert list(module.objects(*files)) == list(module.objects(*expected))
+        for file, expected_file in zip(files, expected):
+            assert module.extract_file(file) == module.extract_file(
+                expected_file), name
+            if hasattr(module, 'stream_extract_file'):
+                assert list(module.stream_extract_file(file)) == (
+                    module.extract_file(expected_file)), name
+
+def test_archive_member_paths(archive: Path):
+    opened = open_archive(archive)
+    assert opened is not None
+    (pack_archive, prefix), = opened.pack_roots()
+    file = ArchivePath(pack_archive, prefix + 'entity/pig.json')
+    assert file.name == 'pig.json'
+    assert file.stem == 'pig'
+    assert file.suffix == '.json'
+    assert file.as_posix().startswith(archive.as_posix() + '/')
+    assert _member(file) == 'entity/pig.json'
+    assert file.stat().st_size == len(file.read_bytes())
+    with file.open() as f:
+        assert 'minecraft:pig' in f.read()
+    with pytest.raises(ValueError):
+        file.open('w')
+
+def test_invalid_archive(tmp_path: Path):
+    path = tmp_path / 'broken.mcpack'
+    path.write_bytes(b'not a zip file')
+    assert open_archive(path) is None
+    assert list(MODELS['particle'].files(path)) == []
+
+def _index_entries(index: PackIndex) -> Dict[str, List]:
+    return {
+        model: sorted(
+            (entry.identifier, _member(entry.file))
+            for entry in index.entries(model))
+        for model in index.models()}
+
+def test_pack_index_over_archive(pack: Path, archive: Path):
+    expected = PackIndex([pack], keep_objects=True)
+    index = PackIndex([archive], keep_objects=True)
+    assert _index_entries(index) == _index_entries(expected)
+    assert 'animation.sheep.walk' in index
+    entry = index.get('minecraft:pig', 'client_entity')
+    assert isinstance(entry.file, ArchivePath)
+    assert sorted(data.identifier for _, data in index.iter_objects()) == (
+        sorted(data.identifier for _, data in expected.iter_objects()))
@@ -0,0 +1,61 @@
+from pathlib import Path
+from types import SimpleNamespace
+import os
+from bedrock_example import client_entity
+from bedrock_example.cache import ExtractionCache, extraction_key
+
+def test_cache_hits_and_changes(resource_pack: Path, tmp_path: Path):
+    file = resource_pack / 'entity/pig.json'
+    with ExtractionCache(tmp_path / 'cache.db') as cache:
+        first = cache.extract_file(client_entity, file)
+        assert first == client_entity.extract_file(file)
+        assert cache.extract_file(client_entity, file) == first
+        assert (cache.hits, cache.rehashed, cache.misses) == (1, 0, 1)
+
+        # The same content with a different modification time
+        stat = file.stat()
+        os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert cache.extract_file(client_entity, file) == first
+        assert cache.rehashed == 1
+
+        file.write_text(file.read_text().replace(
+            'minecraft:pig', 'minecraft:big_pig'))
+        changed = cache.extract_file(client_entity, file)
+        assert changed[0][1].identifier == 'minecraft:big_pig'
+        assert cache.misses == 2
+
+def test_cache_survives_reopening(resource_pack: Path, tmp_path: Path):
+    file = resource_pack / 'entity/pig.json'
+    with ExtractionCache(tmp_path / 'cache.db') as cache:
+        expected = cache.extract_file(client_entity, file)
+    with ExtractionCache(tmp_path / 'cache.db') as cache:
+        assert cache.extract_file(client_entity, file) == expected
+        assert cache.hits == 1
+
+def test_cache_invalidated_by_model_changes(
+        resource_pack: Path, tmp_path: Path, monkeypatch):
+    file = resource_pack / 'entity/pig.json'
+    with ExtractionCache(tmp_path / 'cache.db') as cache:
+        cache.extract_file(client_entity, file)
+        monkeypatch.setattr(client_entity, 'MODEL_HASH', 'changed')
+        cache.extract_file(client_entity, file)
+        assert (cache.hits, cache.misses) == (0, 2)
+
+def test_extraction_key_depends_on_module_source(tmp_path: Path):
+    keys = set()
+    for i, source in enumerate(['A = 1', 'A = 2', 'A = 2']):
+        module_file = tmp_path / f'model_{i}.py'
+        module_file.write_text(source)
+        keys.add(extraction_key(SimpleNamespace(
+            NAME='model', MODEL_HASH='hash', __file__=str(module_file))))
+    assert len(keys) == 2
+    assert extraction_key(client_entity) != extraction_key(SimpleNamespace(
+        NAME=client_entity.NAME, MODEL_HASH=client_entity.MODEL_HASH))
+
+def test_cache_with_unreadable_results(resource_pack: Path, tmp_path: Path):
+    file = resource_pack / 'entity/pig.json'
+    with ExtractionCache(tmp_path / 'cache.db') as cache:
+        expected = cache.extract_file(client_entity, file)
+        cache.connection.execute("UPDATE extracted SET data = x'00'")
+        assert cache.extract_file(client_entity, file) == expected
+        assert cache.misses == 2
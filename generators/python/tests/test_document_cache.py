@@ -0,0 +1,55 @@
+from pathlib import Path
+import json
+import pytest
+from bedrock_example.jpath import (
+    DOCUMENT_CACHE_SIZE, get_document_cache, load_json_file,
+    set_document_cache_size)
+
+@pytest.fixture
+def document_cache():
+    cache = get_document_cache()
+    cache.clear()
+    cache.hits = cache.misses = cache.evictions = 0
+    set_document_cache_size(DOCUMENT_CACHE_SIZE)
+    yield cache
+    set_document_cache_size(0)
+    cache.clear()
+
+def test_cache_disabled_by_default(resource_pack: Path):
+    file = resource_pack / 'entity/pig.json'
+    assert get_document_cache().max_size == 0
+    first = load_json_file(file)
+    first['format_version'] = 'modified'
+    second = load_json_file(file)
+    assert second is not first
+    assert second['format_version'] == '1.10.0'
+    assert len(get_document_cache()) == 0
+
+def test_cache_hits_and_changes(resource_pack: Path, document_cache):
+    file = resource_pack / 'entity/pig.json'
+    first = load_json_file(file)
+    assert load_json_file(file) is first
+    stats = document_cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.size == file.stat().st_size
+
+    data = json.loads(file.read_text())
+    data['format_version'] = '1.12.0'
+    file.write_text(json.dumps(data))
+    changed = load_json_file(file)
+    assert changed is not first
+    assert changed['format_version'] == '1.12.0'
+    assert document_cache.stats().entries == 1
+
+def test_cache_eviction(resource_pack: Path, document_cache):
+    pig = resource_pack / 'entity/pig.json'
+    cow = resource_pack / 'entity/sub/cow.json'
+    set_document_cache_size(pig.stat().st_size)
+    load_json_file(pig)
+    load_json_file(cow)
+    stats = document_cache.stats()
+    assert (stats.entries, stats.evictions) == (1, 1)
+    assert load_json_file(cow) is load_json_file(cow)
+    # Disabling the cache evicts all of the documents
+    set_document_cache_size(0)
+    assert len(document_cache) == 0
@@ -0,0 +1,68 @@
+from typing import Dict, List
+from pathlib import Path
+import json
+import sqlite3
+from bedrock_example import particle
+from bedrock_example.export import SqliteExporter, export_packs
+from bedrock_example.models import MODELS
+
+def _rows(path: Path) -> Dict[str, List]:
+    '''
+    Returns the exported rows without the IDs of the objects.
+    '''
+    connection = sqlite3.connect(str(path))
+    try:
+        result = {
+            name: sorted(connection.execute(
+                f'SELECT identifier, pack, file, object_path FROM {name}'))
+            for name in MODELS}
+        result['refs'] = sorted(connection.execute(
+            'SELECT r.model, r.file, r.property, r.kind, r.alias, r.value, '
+            'r.target_model, o.identifier FROM refs AS r JOIN ('
+            + ' UNION ALL '.join(
+                f"SELECT '{name}' AS model, id, identifier FROM {name}"
+                for name in MODELS)
+            + ') AS o ON o.model = r.model AND o.id = r.object_id'),
+            key=repr)
+        result['files'] = sorted(connection.execute(
+            'SELECT model, path, pack FROM files'))
+    finally:
+        connection.close()
+    return result
+
+def test_incremental_export(resource_pack: Path, tmp_path: Path):
+    database = tmp_path / 'export.db'
+    stats = export_packs(database, [resource_pack])
+    assert (stats.files_scanned, stats.files_exported) == (6, 6)
+    assert stats.objects == 8
+    stats = export_packs(database, [resource_pack])
+    assert (stats.files_exported, stats.files_removed, stats.objects) == (
+        0, 0, 0)
+
+    (resource_pack / 'entity/sub/cow.json').unlink()
+    smoke = resource_pack / 'particles/smoke.json'
+    smoke.write_text(smoke.read_text().replace('smoke', 'big_smoke'))
+    (resource_pack / 'particles/fire.json').write_text(json.dumps(
+        {'particle_effect': {'description': {'identifier': 'minecraft:fire'}}}
+    ))
+    stats = export_packs(database, [resource_pack])
+    assert (stats.files_exported, stats.files_removed, stats.objects) == (
+        2, 1, 2)
+
+    fresh = tmp_path / 'fresh.db'
+    export_packs(fresh, [resource_pack])
+    assert _rows(database) == _rows(fresh)
+    assert [r[0] for r in _rows(database)['particle']] == [
+        'minecraft:big_smoke_particle', 'minecraft:fire']
+
+def test_export_after_model_changes(
+        resource_pack: Path, tmp_path: Path, monkeypatch):
+    database = tmp_path / 'export.db'
+    export_packs(database, [resource_pack])
+    expected = _rows(database)
+    monkeypatch.setattr(particle, 'MODEL_HASH', 'changed')
+    with SqliteExporter(database) as exporter:
+        stats = exporter.export([resource_pack])
+    # Only the files of the changed model are exported again
+    assert (stats.files_exported, stats.objects) == (1, 1)
+    assert _rows(database) == expected
@@ -0,0 +1,29 @@
+from pathlib import Path
+from bedrock_example import client_entity, client_animation, particle
+
+def test_objects_of_unreadable_files(resource_pack: Path):
+    (resource_pack / 'entity/broken.json').write_text(
+        '{"minecraft:client_entity": {', encoding='utf-8')
+    files = sorted(client_entity.files(resource_pack))
+    objects = list(client_entity.objects(*files))
+    assert len(objects) == 3
+    assert objects.count(None) == 1
+    assert sorted(client_entity.identifiers(*objects)) == [
+        'minecraft:cow', 'minecraft:pig']
+    assert sorted(client_entity.animations(*objects)) == [
+        ('move', 'animation.quadruped.move'),
+        ('move', 'animation.quadruped.move'),
+        ('walk', 'animation.pig.walk')]
+    assert client_entity.extract(None).identifier is None
+
+def test_objects_of_missing_files(resource_pack: Path):
+    objects = list(particle.objects(resource_pack / 'particles/missing.json'))
+    assert objects == [None]
+    assert list(particle.identifiers(*objects)) == []
+
+def test_multi_object_models_skip_unreadable_files(resource_pack: Path):
+    (resource_pack / 'animations/broken.json').write_bytes(b'\xff{')
+    files = sorted(client_animation.files(resource_pack))
+    assert sorted(client_animation.identifiers(
+        *client_animation.objects(*files))) == [
+            'animation.pig.walk', 'animation.quadruped.move']
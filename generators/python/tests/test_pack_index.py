@@ -0,0 +1,32 @@
+from pathlib import Path
+import shutil
+import pytest
+from bedrock_example.pack_index import PackIndex
+from bedrock_example.symbols import SymbolTable
+
+@pytest.mark.parametrize('keep_objects, compact_objects', [
+    (False, False), (True, False), (True, True)])
+def test_symbols_intern_identifiers(
+        resource_pack: Path, keep_objects: bool, compact_objects: bool):
+    # The same entity defined in two files
+    shutil.copy(
+        resource_pack / 'entity/pig.json', resource_pack / 'entity/pig2.json')
+    symbols = SymbolTable()
+    index = PackIndex(
+        [resource_pack], keep_objects=keep_objects, symbols=symbols,
+        compact_objects=compact_objects)
+    first, duplicate = index.find('minecraft:pig')
+    assert first.identifier is duplicate.identifier
+    assert first.identifier is symbols.intern('minecraft:pig')
+    for model in index.models():
+        for identifier in index.identifiers(model):
+            assert identifier is symbols.intern(identifier)
+    if keep_objects:
+        for entry, data in index.iter_objects():
+            assert data.identifier is entry.identifier
+        animations = {
+            entry.identifier: data.animations
+            for entry, data in index.iter_objects()
+            if entry.model == 'client_entity'}
+        walk = index.get('animation.pig.walk', 'client_animation')
+        assert dict(animations['minecraft:pig'])['walk'] is walk.identifier
@@ -0,0 +1,50 @@
+from pathlib import Path
+import sys
+import pytest
+
+# The processing code of the generator (generators/processing.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from generator_tools import (
+    FilterItemEndsWith, FilterItemRegex, FilterItemStartsWith, FiltersDef,
+    PostprocessingRegexReplace, ProcessingDef)
+from processing import compile_processing
+
+def _filter(exclude: bool, *items):
+    process = compile_processing(ProcessingDef(
+        postprocessing=[], filters=FiltersDef(exclude, list(items)),
+        postprocessing_filters=None))
+    assert process is not None
+    return process
+
+@pytest.mark.parametrize('value, passes', [
+    ('animation.walk', True),
+    ('controller.json', True),
+    ('moving', True),
+    ('idle', True),
+    ('controller.animation', False),
+    ('idle2', False),
+])
+def test_filters_match_any_item(value: str, passes: bool):
+    items = [
+        FilterItemStartsWith('animation.'), FilterItemEndsWith('.json'),
+        FilterItemRegex('mov.*'), 'idle']
+    # A whitelist accepts the values that match any of the items and a
+    # blacklist rejects them
+    assert _filter(False, *items)(value) == (value if passes else None)
+    assert _filter(True, *items)(value) == (None if passes else value)
+
+def test_filter_ends_with():
+    process = _filter(False, FilterItemEndsWith('.walk'))
+    assert process('animation.walk') == 'animation.walk'
+    assert process('walk.animation') is None
+
+@pytest.mark.parametrize('case_sensitive, expected', [
+    (True, 'Animxtion.x.A'), (False, 'x.x.x')])
+def test_regex_replace(case_sensitive: bool, expected: str):
+    process = compile_processing(ProcessingDef(
+        postprocessing=[
+            PostprocessingRegexReplace(case_sensitive, 'animation|a', 'x')],
+        filters=None, postprocessing_filters=None))
+    assert process is not None
+    # All of the matches are replaced (the flags aren't the count)
+    assert process('Animation.a.A') == expected
@@ -0,0 +1,39 @@
+from pathlib import Path
+from bedrock_example import client_animation, client_entity, profiling
+from bedrock_example.models import MODELS
+
+def _results(resource_pack: Path, name: str):
+    '''
+    Returns the results of the functions of the model for the files of the
+    pack and a file that doesn't exist.
+    '''
+    module = MODELS[name]
+    files = list(module.files(resource_pack)) + [
+        resource_pack / 'missing.json']
+    objects = list(module.objects(*files))
+    results = [list(module.identifiers(*objects))]
+    for property in module.PROPERTIES:
+        results.append(list(getattr(module, property)(*objects)))
+    results.append([module.extract_file(f) for f in files])
+    return results
+
+def test_profiling_keeps_results(resource_pack: Path):
+    expected = {name: _results(resource_pack, name) for name in MODELS}
+    with profiling.profile() as collector:
+        for name in MODELS:
+            assert _results(resource_pack, name) == expected[name], name
+    assert set(collector.to_dict()['models']) == set(MODELS)
+
+def test_profiling_none_objects(resource_pack: Path):
+    # objects() yields None for the files that can't be loaded
+    missing = resource_pack / 'missing.json'
+    expected = client_entity.extract(None)
+    with profiling.profile(models=['client_entity', 'client_animation']):
+        objects = list(client_entity.objects(missing))
+        assert objects == [None]
+        assert list(client_entity.identifiers(*objects)) == []
+        for property in client_entity.PROPERTIES:
+            assert list(getattr(client_entity, property)(*objects)) == []
+        assert client_entity.extract(None) == expected
+        assert list(client_animation.identifiers(None)) == []
+        assert list(client_animation.OBJECTS_JPATH.find_all_paths(None)) == []
@@ -0,0 +1,141 @@
+from typing import Dict, List
+from collections import Counter
+from pathlib import Path
+import json
+import pytest
+from bedrock_example.pack_index import PackIndex
+from bedrock_example.references import ReferenceGraph, ReverseIndex
+from bedrock_example.watch import PackWatcher
+
+def _uses(reverse_index: ReverseIndex) -> Dict[str, List]:
+    return {
+        target: sorted(reverse_index.uses(target))
+        for target in reverse_index.targets()}
+
+def _assert_rebuilt(
+        index: PackIndex, graph: ReferenceGraph,
+        reverse_index: ReverseIndex):
+    '''
+    Checks that the updated graph and reverse index are the same as the
+    ones built from scratch.
+    '''
+    rebuilt = ReferenceGraph(index)
+    assert Counter(graph) == Counter(rebuilt)
+    assert len(graph) == len(rebuilt)
+    assert Counter(graph.missing()) == Counter(rebuilt.missing())
+    for model in index.models():
+        for identifier in index.identifiers(model):
+            assert Counter(graph.references(model, identifier)) == Counter(
+                rebuilt.references(model, identifier))
+            assert Counter(graph.referenced_by(model, identifier)) == (
+                Counter(rebuilt.referenced_by(model, identifier)))
+    rebuilt_reverse = ReverseIndex(rebuilt)
+    assert reverse_index.targets() == rebuilt_reverse.targets()
+    assert _uses(reverse_index) == _uses(rebuilt_reverse)
+    for model in index.models():
+        assert reverse_index.unused(model) == rebuilt_reverse.unused(model)
+    assert reverse_index.count_prefix('animation.') == (
+        rebuilt_reverse.count_prefix('animation.'))
+
+def _update(
+        index: PackIndex, graph: ReferenceGraph,
+        reverse_index: ReverseIndex, files: List[Path]):
+    removed, added = index.update_files(files)
+    reverse_index.update(*graph.update(removed, index.iter_objects(files)))
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_incremental_updates(resource_pack: Path, compact: bool):
+    index = PackIndex(
+        [resource_pack], keep_objects=True, compact_objects=compact)
+    graph = ReferenceGraph(index)
+    reverse_index = ReverseIndex(graph)
+    assert sorted(u.identifier for u in reverse_index.uses(
+        'minecraft:smoke_particle')) == [
+            'animation.pig.walk', 'minecraft:pig']
+    _assert_rebuilt(index, graph, reverse_index)
+
+    # The map provider of the aliases changes
+    pig = resource_pack / 'entity/pig.json'
+    pig_data = json.loads(pig.read_text())
+    description = pig_data['minecraft:client_entity']['description']
+    description['particle_effects'] = {'smoke': 'minecraft:fire'}
+    pig.write_text(json.dumps(pig_data))
+    _update(index, graph, reverse_index, [pig])
+    _assert_rebuilt(index, graph, reverse_index)
+    assert 'minecraft:fire' in [
+        r.target for r in graph.references(
+            'client_animation', 'animation.pig.walk')]
+
+    # The referenced object is removed and defined again in another file
+    particle = resource_pack / 'particles/smoke.json'
+    particle.unlink()
+    _update(index, graph, reverse_index, [particle])
+    _assert_rebuilt(index, graph, reverse_index)
+    fire = resource_pack / 'particles/fire.json'
+    fire.write_text(json.dumps({'particle_effect': {'description': {
+        'identifier': 'minecraft:fire'}}}))
+    _update(index, graph, reverse_index, [fire])
+    _assert_rebuilt(index, graph, reverse_index)
+    assert not any(
+        r.missing for r in graph.referenced_by('particle', 'minecraft:fire'))
+
+    # The users of the aliases are removed and added again
+    cow = resource_pack / 'entity/sub/cow.json'
+    cow_text = cow.read_text()
+    pig.unlink()
+    cow.unlink()
+    _update(index, graph, reverse_index, [pig, cow])
+    _assert_rebuilt(index, graph, reverse_index)
+    assert reverse_index.uses('animation.quadruped.move') == []
+    cow.write_text(cow_text)
+    _update(index, graph, reverse_index, [cow])
+    _assert_rebuilt(index, graph, reverse_index)
+
+def test_watcher_updates_graph(resource_pack: Path):
+    index = PackIndex([resource_pack], keep_objects=True)
+    with PackWatcher(
+            index, debounce=0.0, use_inotify=False,
+            poll_interval=0.01) as watcher:
+        graph = watcher.graph
+        reverse_index = watcher.reverse_index
+        # The file without one of the animations
+        (resource_pack / 'animations/pig.animation.json').write_text(
+            json.dumps({'animations': {'animation.pig.walk': {
+                'particle_effects': {'0.0': {'effect': 'smoke'}},
+                'sound_effects': {'0.5': [{'effect': 'missing'}]}}}}))
+        update = None
+        for _ in range(100):
+            update = watcher.poll(0.05)
+            if update is not None:
+                break
+        assert update is not None
+        assert watcher.graph is graph
+        assert watcher.reverse_index is reverse_index
+        _assert_rebuilt(index, graph, reverse_index)
+        assert all(
+            r.missing for r in graph.referenced_by(
+                'client_animation', 'animation.quadruped.move'))
+
+def test_watcher_affected_files(resource_pack: Path):
+    index = PackIndex([resource_pack])
+    pig = resource_pack / 'entity/pig.json'
+    cow = resource_pack / 'entity/sub/cow.json'
+    new = resource_pack / 'entity/new.json'
+    new.write_text('{}')
+    with PackWatcher(index, use_inotify=False) as watcher:
+        # The files that don't exist and aren't indexed are single files
+        temporary = resource_pack / 'entity/.new.json.swp'
+        assert sorted(watcher._affected_files(
+            {pig, new, temporary}, set())) == sorted([pig, new, temporary])
+        # The existing directories and the ones reported by the backend
+        assert sorted(watcher._affected_files(
+            {resource_pack / 'entity/sub'}, set())) == [cow]
+        cow.unlink()
+        cow.parent.rmdir()
+        assert watcher._affected_files(
+            {resource_pack / 'entity/sub'},
+            {resource_pack / 'entity/sub'}) == [cow]
+        # The removed path that was a parent of the indexed files
+        assert watcher._affected_files(
+            {resource_pack / 'entity/sub'}, set()) == [
+                resource_pack / 'entity/sub', cow]
@@ -0,0 +1,67 @@
+from pathlib import Path
+import io
+import pytest
+from bedrock_example import client_animation
+from bedrock_example.jpath import Json, Jpath, compile_jpath, loads_json
+from bedrock_example.jstream import stream_file, stream_jpath
+
+# An animation file with comments, trailing commas and strings that look
+# like comments
+ANIMATIONS = '''// Animations of the pig
+{
+    "format_version": "1.8.0", /* the version */
+    "animations": {
+        "animation.pig.walk": {
+            "loop": true, // looped
+            "sound_effects": {"0.5": [{"effect": "oink",},],},
+            "bones": {"leg": {"rotation": ["math.cos(q.anim_time)", 0, 0]}},
+        },
+        // "animation.pig.commented": {},
+        "animation.pig.url": {"comment": "http://example.com /* x */"},
+        "animation.pig.empty": { /* nothing */ },
+    },
+}
+'''
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'utf-8-sig'])
+def test_stream_objects_match_objects(tmp_path: Path, encoding: str):
+    file = tmp_path / 'pig.animation.json'
+    file.write_text(ANIMATIONS, encoding=encoding)
+    objects = list(client_animation.objects(file))
+    assert [o.key for o in objects] == [
+        'animation.pig.walk', 'animation.pig.url', 'animation.pig.empty']
+    assert list(client_animation.stream_objects(file)) == objects
+    assert list(client_animation.stream_extract_file(file)) == (
+        client_animation.extract_file(file))
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1 << 16])
+@pytest.mark.parametrize('path', [
+    ['animations', Jpath.STR],
+    ['animations', Jpath.ANY, 'sound_effects', Jpath.STR, Jpath.SKIP_LIST],
+    ['animations', 'animation.pig.walk', 'bones', 'leg', 'rotation', 0],
+    ['format_version'],
+])
+def test_stream_chunks(chunk_size: int, path):
+    # Small chunks cut the comments and values at the end of the buffer
+    matcher = compile_jpath(path)
+    expected = list(matcher.find_all_paths(
+        Json(None, loads_json(ANIMATIONS))))
+    assert expected
+    assert list(stream_jpath(
+        io.StringIO(ANIMATIONS), matcher, chunk_size)) == expected
+
+def test_stream_file_falls_back_to_loading(tmp_path: Path):
+    # Negative indices can't be streamed
+    file = tmp_path / 'list.json'
+    file.write_text('{"a": [1, 2, 3, /* end */]}', encoding='utf-8')
+    assert list(stream_file(file, compile_jpath(['a', -1]))) == [
+        (('a', -1), Json(-1, 3))]
+
+def test_stream_invalid_files(tmp_path: Path):
+    file = tmp_path / 'invalid.json'
+    file.write_text('{"animations": {"a": {}, "b": /}}', encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(stream_file(file, compile_jpath(['animations', Jpath.STR])))
+    assert list(client_animation.stream_objects(file)) == [
+        Json('a', {})]
+    assert list(client_animation.objects(file)) == []
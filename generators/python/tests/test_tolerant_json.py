@@ -0,0 +1,116 @@
+import json
+import random
+import pytest
+from bedrock_example import jpath
+from bedrock_example.jpath import decode_tolerant, loads_json, loads_tolerant
+
+@pytest.mark.parametrize('text, expected', [
+    ('{"a": 1, // comment\n "b": [1, 2,],}', {'a': 1, 'b': [1, 2]}),
+    ('/* header */ {"a": /* value */ "b" /* end */}', {'a': 'b'}),
+    ('[1, 2, // comment at the end without a newline', None),
+    ('[1, // first\n // second\n 2, /* third */ ]', [1, 2]),
+    ('{"url": "http://example.com", "c": "/* x */"}',
+        {'url': 'http://example.com', 'c': '/* x */'}),
+    ('{"a,": ",]", "b": [",}",]}', {'a,': ',]', 'b': [',}']}),
+    ('{"e\\"s\\\\": "\\u0041\\n", // c\n}', {'e"s\\': 'A\n'}),
+    ('{//a\n"\\"": 1,}', {'"': 1}),
+    ('{"a": "x/*", "b": "*/y",}', {'a': 'x/*', 'b': '*/y'}),
+    ('["a // b", "c",] // "d"', ['a // b', 'c']),
+    ('{"a": 1 /* "x" */, "b": [2 , ]}', {'a': 1, 'b': [2]}),
+    ('[1.5e3, -0, true, false, null, {}, [], ] // end',
+        [1500.0, 0, True, False, None, {}, []]),
+    ('\ufeff{"a": 1,}', {'a': 1}),
+])
+def test_extensions(text: str, expected):
+    if expected is None:
+        with pytest.raises(ValueError):
+            loads_json(text)
+        return
+    assert loads_json(text) == expected
+    assert loads_json(text.encode('utf-8')) == expected
+    assert loads_json(text.encode('utf-8-sig')) == expected
+
+@pytest.mark.parametrize('text', [
+    '{"a": 1,,}', '[1 2]', '{"a" 1}', '[1,]x', '{"a": /* x */}', '[,]',
+    '{,}', '/* */', '"a', '[1}', '{"a": 1]', '{"a": 1 /* x */ "b": 2}',
+])
+def test_invalid_documents(text: str):
+    with pytest.raises(json.JSONDecodeError):
+        loads_tolerant(text)
+    with pytest.raises(ValueError):
+        loads_json(text.encode('utf-8'))
+
+def test_decode_returns_end():
+    text = '/* x */ {"a": [1, 2,]} // rest'
+    value, end = decode_tolerant(text)
+    assert value == {'a': [1, 2]}
+    assert text[end:] == ' // rest'
+    assert decode_tolerant('[0, [1,]]', 4) == ([1], 8)
+
+def _random_document(rng: random.Random, depth: int = 0) -> str:
+    def gap() -> str:
+        return rng.choice([
+            '', ' ', '\n', ' // x, ] } "\n', '/* "/ ,} */', '/**/'])
+    if depth > 3 or rng.random() < 0.3:
+        return rng.choice([
+            '"a"', '"/* \\" // ,]"', '1', '-2.5e1', 'true', 'null'])
+    items = [
+        gap() + ('"k\\"%d"' % n + gap() + ':' + gap() if depth % 2 else '')
+        + _random_document(rng, depth + 1) + gap()
+        for n in range(rng.randint(0, 4))]
+    trailing = ',' + gap() if items and rng.random() < 0.5 else ''
+    if depth % 2:
+        return '{' + gap() + ','.join(items) + trailing + '}'
+    return '[' + gap() + ','.join(items) + trailing + ']'
+
+def _strip(text: str) -> str:
+    '''
+    A slow reference implementation that removes the comments and then the
+    trailing commas before the document is parsed with json.loads.
+    '''
+    def tokens(text: str):
+        i = 0
+        while i < len(text):
+            if text[i] == '"':
+                end = i + 1
+                while text[end] != '"':
+                    end += 2 if text[end] == '\\' else 1
+                yield text[i:end + 1]
+                i = end + 1
+            elif text.startswith('//', i):
+                end = text.find('\n', i)
+                i = len(text) if end == -1 else end
+            elif text.startswith('/*', i):
+                i = text.index('*/', i + 2) + 2
+            else:
+                yield text[i]
+                i += 1
+    result = [t for t in tokens(text) if t not in (' ', '\n')]
+    return ''.join(
+        t for t, next_t in zip(result, result[1:] + [''])
+        if t != ',' or next_t not in (']', '}'))
+
+@pytest.mark.parametrize('window', [1, 16, jpath._WINDOW])
+def test_random_documents(window: int, monkeypatch):
+    # Small windows make the scanner fail on the parts of the containers
+    monkeypatch.setattr(jpath, '_WINDOW', window)
+    rng = random.Random(window)
+    for _ in range(500):
+        text = _random_document(rng)
+        expected = json.loads(_strip(text))
+        assert loads_tolerant(text) == expected, text
+        assert loads_json(text.encode('utf-8')) == expected, text
+
+def test_decoders(monkeypatch):
+    # The standard decoder is the default even if orjson is installed
+    assert jpath.get_decoder() == 'json'
+    if 'orjson' not in jpath.available_decoders():
+        pytest.skip('orjson is not installed')
+    documents = [b'{"a": [1, 2.5, null]}', b'\xef\xbb\xbf{"a": 1, // c\n}']
+    expected = [loads_json(d) for d in documents]
+    # Restores the default decoder after the test
+    monkeypatch.setattr(jpath, '_decoder_name', jpath._decoder_name)
+    monkeypatch.setattr(jpath, '_decoder', jpath._decoder)
+    jpath.set_decoder('orjson')
+    assert jpath.get_decoder() == 'orjson'
+    assert [loads_json(d) for d in documents] == expected